@@ -34,7 +34,8 @@ block_types : Final[tuple[str]] = ("meshes", "materials", "textures", "images")
 # Preference tabs
 e_pref_tab : Final[tuple[tuple]] = (('PANELS', "Panel Visibility", ""),
                                    ('KEYS', "Keybindings", ""),
-                                   ('QUICK_EXPORT', "Quick Export", ""))
+                                   ('QUICK_EXPORT', "Quick Export", ""),
+                                   ('NAMING_LINT', "Naming Lint", ""))
 
 # String find action
 e_string_find_action : Final[tuple[tuple]] = (('CONTAINS', "Contains", ""),
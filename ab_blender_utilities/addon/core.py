@@ -22,6 +22,7 @@ from types import ModuleType
 from typing import Final
 from . import keymaps, op_menus, op_panels, prefs
 from .. import operators
+from ..lib import export_watch, naming_lint
 from .persistent import get_preferences
 
 
@@ -31,6 +32,7 @@ __exporters = []
 __importers = []
 __preferences = None
 __properties = []
+__scene_properties = {}  # Attribute name -> property, added to `bpy.types.Scene`
 
 __pref_classes : Final[tuple[AddonPreferences | PropertyGroup | UIList]] = (prefs.ABBU_PT_PrefTabs,
                                                                             prefs.ABUTIL_UL_name_slots,
@@ -45,12 +47,15 @@ def __clear_vars() -> None:
     __exporters.clear()
     __importers.clear()
     __properties.clear()
+    __scene_properties.clear()
 
 def init_props_and_classes(modules : tuple[ModuleType]):
     for module in modules:
         if hasattr(module, "PROPERTIES"):
             for prop in module.PROPERTIES:
                     __properties.append(prop)
+        if hasattr(module, "SCENE_PROPERTIES"):
+            __scene_properties.update(module.SCENE_PROPERTIES)
         if hasattr(module, "OPERATORS"):
             for cl in module.OPERATORS:
                     __operators.append(cl)
@@ -81,6 +86,9 @@ def register():
     for prop in __properties:
         bpy.utils.register_class(prop)
 
+    for name, prop in __scene_properties.items():
+        setattr(bpy.types.Scene, name, prop)
+
     # Load menus and panels
     op_menus.load(__classes_categorized)
     op_panels.load(__classes_categorized)
@@ -99,6 +107,10 @@ def register():
         keymaps.register()
 
 def unregister():
+    # Stop handlers and timers started by operators
+    export_watch.stop()
+    naming_lint.stop()
+
     # Unregister keymaps
     keymaps.unregister()
 
@@ -115,7 +127,10 @@ def unregister():
     op_menus.unload()
 
     # Property de-registration
-    for prop in __properties:
+    for name in __scene_properties.keys():
+        delattr(bpy.types.Scene, name)
+
+    for prop in reversed(__properties):
         bpy.utils.unregister_class(prop)
 
     # Addon preference class
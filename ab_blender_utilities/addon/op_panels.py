@@ -19,6 +19,7 @@ from bpy.types import Panel
 
 from . import constants
 from .persistent import get_preferences
+from ..lib import naming_lint
 
 _preferences = None
 
@@ -77,6 +78,32 @@ class ABBU_PT_Naming(ABBU_PT_Panel):
     panel_show_var = "show_naming_panel"
     operators = []
 
+class ABBU_PT_NamingLint(Panel):
+    bl_idname = "ABBU_PT_NamingLint"
+    bl_label = "Naming Lint"
+    bl_parent_id = ABBU_PT_Naming.bl_idname
+    bl_category = constants.plugin_name_short
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cl, context) -> bool:
+        return getattr(_preferences, ABBU_PT_Naming.panel_show_var)
+
+    def draw(self, context) -> None:
+        layout = self.layout
+        is_running : bool = naming_lint.is_running()
+        layout.operator("wm.abbu_toggle_naming_lint", text = "Stop" if is_running else "Start",
+                        icon = 'PAUSE' if is_running else 'PLAY')
+        if not is_running:
+            return
+        violation_count : int = naming_lint.get_violation_count()
+        layout.label(text = str(violation_count) + " object(s) break a rule.", icon = 'ERROR' if violation_count > 0 else 'CHECKMARK')
+        row = layout.row(align = True)
+        row.operator("object.abbu_select_naming_lint_offenders")
+        row.operator("object.abbu_fix_naming_lint")
+
 class ABBU_PT_Objects(ABBU_PT_Panel):
     bl_idname = "ABBU_PT_Objects"
     bl_label = "Objects"
@@ -104,6 +131,8 @@ __panels : tuple = {ABBU_PT_Cleanup.bl_label : ABBU_PT_Cleanup,
                     ABBU_PT_Selection.bl_label : ABBU_PT_Selection,
                     ABBU_PT_UVs.bl_label : ABBU_PT_UVs}
 
+__sub_panels : tuple = (ABBU_PT_NamingLint,)  # Registered after their parent panels
+
 __panel_registration_order = []
 
 def __assign_classes(classes : tuple) -> None:
@@ -121,10 +150,14 @@ def load(classes : list) -> None:
     for key, panel in __panels.items():
         bpy.utils.register_class(panel)
         __panel_registration_order.append(panel)
+    for panel in __sub_panels:
+        bpy.utils.register_class(panel)
 
     __assign_classes(classes)
 
 def unload() -> None:
+    for panel in reversed(__sub_panels):
+        bpy.utils.unregister_class(panel)
     for panel in reversed(__panel_registration_order):
         bpy.utils.unregister_class(panel)
         panel.operators.clear()
@@ -15,7 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import bpy
-from bpy.props import BoolProperty, CollectionProperty, EnumProperty, IntProperty, PointerProperty, StringProperty
+from bpy.props import BoolProperty, CollectionProperty, EnumProperty, FloatProperty, IntProperty, PointerProperty, StringProperty
 from bpy.types import AddonPreferences, PropertyGroup, UIList
 
 import rna_keymap_ui
@@ -126,6 +126,71 @@ class ABBU_AddonPreferences(AddonPreferences):
         subtype = 'DIR_PATH'
     )
 
+    quick_export_record_timings : BoolProperty(
+        name = "Record export timings",
+        default = False,
+        description = "Records the duration of each quick export stage per exported object.\n\
+        The timings are written to a JSON file in the export directory"
+    )
+
+    quick_export_watch_delay : FloatProperty(
+        name = "Watch Delay",
+        default = 1.0,
+        min = 0.1,
+        subtype = 'TIME_ABSOLUTE',
+        description = "Seconds without changes to a watched object before it is quick exported again"
+    )
+
+    quick_export_lod_mode : EnumProperty(
+        name = "LODs",
+        items = (('NONE', "None", "Does not export LODs"),
+                 ('FILES', "Separate Files", "Exports each LOD as a separate file with an _LOD<n> suffix"),
+                 ('GROUP', "LOD Group", "Exports all LODs in one file under an FBX LOD group")),
+        default = 'NONE',
+        description = "Exports decimated LODs of quick exported meshes. LOD meshes are cached in the .blend file and reused while the source geometry is unchanged"
+    )
+
+    quick_export_lod_ratios : StringProperty(
+        name = "LOD Ratios",
+        default = "0.5, 0.25, 0.125",
+        description = "Comma separated decimation ratios of LOD1 and higher"
+    )
+
+    quick_export_packaging : EnumProperty(
+        name = "Packaging",
+        items = (('NONE', "None", "Does not package exported files"),
+                 ('ASSET', "Per Asset", "Packages the files of every exported object into its own zip archive"),
+                 ('BATCH', "Per Batch", "Packages all files of a quick export into one zip archive")),
+        default = 'NONE',
+        description = "Compresses exported files into zip archives in the 'packages' folder of the export directory while the export continues"
+    )
+
+    # Naming lint
+
+    naming_lint_type_prefixes : StringProperty(
+        name = "Type Prefixes",
+        default = "",
+        description = "Comma separated object types and the prefix their names must start with, e.g. 'MESH:SM_, ARMATURE:SK_'"
+    )
+
+    naming_lint_bake_suffixes : BoolProperty(
+        name = "Bake suffixes at the end",
+        default = True,
+        description = "Reports names with text after a bake suffix, e.g. 'Rock_low.001'"
+    )
+
+    naming_lint_path_names : BoolProperty(
+        name = "No path names",
+        default = False,
+        description = "Reports names that contain a '/' export path"
+    )
+
+    naming_lint_data_names : BoolProperty(
+        name = "Data name matches object name",
+        default = True,
+        description = "Reports single user object data whose name differs from the object name"
+    )
+
     # Panels in properties
     show_object_attribute_utils_in_properties : BoolProperty(
         name = "Attribute Utilities in object properties",
@@ -221,6 +286,35 @@ class ABBU_AddonPreferences(AddonPreferences):
         description = "Exports custom properties"
     )
 
+    custom_ex_apply_modifiers : BoolProperty(
+        name = "Apply Modifiers",
+        default = True,
+        description = "Exports the evaluated mesh with modifiers applied"
+    )
+
+    custom_ex_export_normals : BoolProperty(
+        name = "Normals",
+        default = True
+    )
+
+    custom_ex_export_uvs : BoolProperty(
+        name = "UVs",
+        default = True
+    )
+
+    custom_ex_export_colors : BoolProperty(
+        name = "Color Attributes",
+        default = True,
+        description = "Exports the active color attribute"
+    )
+
+    custom_ex_weld_vertices : BoolProperty(
+        name = "Weld Vertices",
+        default = True,
+        description = "Merges face corners with identical attributes into shared vertices.\n\
+        Produces smaller files at the cost of a slightly slower export"
+    )
+
     do_not_load_keymaps : BoolProperty(
         name = "Do not load keymaps",
         default = False,
@@ -248,6 +342,8 @@ class ABBU_AddonPreferences(AddonPreferences):
             self.__draw_keymaps(box)
         elif self.panel_vars_ptr.tabs == 'QUICK_EXPORT':
             self.__draw_quick_export(box)
+        elif self.panel_vars_ptr.tabs == 'NAMING_LINT':
+            self.__draw_naming_lint(box)
         elif self.panel_vars_ptr.tabs == 'ADVANCED':
             self.__draw_advanced(box)
 
@@ -296,6 +392,16 @@ class ABBU_AddonPreferences(AddonPreferences):
         column.prop(self, "do_not_load_keymaps")
         column.prop(self, "auto_re_add_missing_keymaps")
 
+    def __draw_naming_lint(self, parent) -> None:
+        split = parent.split()
+        box = split.box()
+        box.label(text = "Naming Lint Rules")
+        box.prop(self, "naming_lint_type_prefixes")
+        box.prop(self, "naming_lint_bake_suffixes")
+        box.prop(self, "naming_lint_path_names")
+        box.prop(self, "naming_lint_data_names")
+        box.label(text = "Changed rules are applied when the naming lint is started again.")
+
     def __draw_quick_export(self, parent) -> None:
         split = parent.split()
         column = split.column()
@@ -304,14 +410,22 @@ class ABBU_AddonPreferences(AddonPreferences):
         box.prop(self, "uses_default_export_path")
         if self.uses_default_export_path:
             box.prop(self, "default_export_path")
+        box.prop(self, "quick_export_record_timings")
+        box.prop(self, "quick_export_watch_delay")
+        box.prop(self, "quick_export_packaging")
         box.operator("wm.abbu_delete_quick_export_paths")
+        box_lods = column.box()
+        box_lods.prop(self, "quick_export_lod_mode")
+        if self.quick_export_lod_mode != 'NONE':
+            box_lods.prop(self, "quick_export_lod_ratios")
+        box_lods.operator("wm.abbu_clear_lod_cache")
+        box_naming = column.box()
+        box_naming.label(text = "Quick Export Name Collection")
+        box_naming.label(text = "Include the following objects despite their viewport display type:")
+        self.__draw_quick_export_names(box_naming)
         box = column.box()
         if self.fbx_exporter_type == 'NATIVE':
             box.label(text = "Native FBX Export Preferences")
-            box_naming = box.box()
-            box_naming.label(text = "Quick Export Name Collection")
-            box_naming.label(text = "Include the following objects despite their viewport display type:")
-            self.__draw_quick_export_names(box_naming)
             box.prop(self, "native_fbx_ex_scale_options")
             box.prop(self, "native_fbx_ex_mesh_smooth_type")
             box.prop(self, "native_fbx_ex_use_tspace")
@@ -325,4 +439,10 @@ class ABBU_AddonPreferences(AddonPreferences):
             row.prop(self, "native_fbx_ex_export_other", icon = 'FILE_3D')
             box.prop(self, "native_fbx_ex_check_existing")
         elif self.fbx_exporter_type == 'CUSTOM':
-            box.label(text = "This is for custom exporters.")
+            box.label(text = "Custom glTF Binary Export Preferences")
+            box.prop(self, "custom_ex_apply_modifiers")
+            box.prop(self, "custom_ex_weld_vertices")
+            row = box.column(align = True)
+            row.prop(self, "custom_ex_export_normals", icon = 'NORMALS_VERTEX_FACE')
+            row.prop(self, "custom_ex_export_uvs", icon = 'GROUP_UVS')
+            row.prop(self, "custom_ex_export_colors", icon = 'GROUP_VCOL')
@@ -0,0 +1,107 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Quick exports every .blend file of a directory with parallel background Blender processes.\n
+Usage:
+    python batch_driver.py <directory> [--blender PATH] [--jobs N] [--report PATH] -- [batch_export.py options]\n
+Every file runs `batch_export.py` in its own `blender -b` process. The per-file reports
+are merged into one JSON report.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+_export_script : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "batch_export.py")
+
+def _parse_args(argv : list[str]) -> tuple[argparse.Namespace, list[str]]:
+    export_args : list[str] = argv[argv.index("--") + 1:] if "--" in argv else []
+    argv = argv[:argv.index("--")] if "--" in argv else argv
+    parser = argparse.ArgumentParser(description = "Quick exports every .blend file of a directory.")
+    parser.add_argument("directory", help = "Directory that is searched recursively for .blend files.")
+    parser.add_argument("--blender", default = os.environ.get("BLENDER", "blender"), help = "Blender executable.")
+    parser.add_argument("--jobs", type = int, default = os.cpu_count() or 1, help = "Number of Blender processes.")
+    parser.add_argument("--timeout", type = float, default = None, help = "Timeout in seconds for each file.")
+    parser.add_argument("--report", default = "batch_export_report.json", help = "Path of the consolidated JSON report.")
+    return parser.parse_args(argv), export_args
+
+def find_blend_files(directory : str) -> list[str]:
+    """Returns all .blend files in `directory` and its subdirectories, skipping backup files."""
+    blend_files : list[str] = []
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            if file_name.lower().endswith(".blend"):
+                blend_files.append(os.path.join(root, file_name))
+    return sorted(blend_files)
+
+def export_blend_file(blender : str, blend_file : str, export_args : list[str], timeout : float | None) -> dict:
+    """Runs `batch_export.py` on `blend_file` in a background Blender process.\n
+    Returns the report of the file."""
+    start : float = time.perf_counter()
+    report_handle, report_path = tempfile.mkstemp(suffix = ".json")
+    os.close(report_handle)
+    command : list[str] = [blender, "-b", "--factory-startup", blend_file, "-P", _export_script,
+                           "--", "--report", report_path] + export_args
+    try:
+        process = subprocess.run(command, capture_output = True, text = True, timeout = timeout)
+        report : dict = {"file" : blend_file, "failures" : []}
+        if os.path.getsize(report_path) > 0:
+            with open(report_path, 'r', encoding = 'utf8') as file_handle:
+                report = json.load(file_handle)
+        if process.returncode != 0 and not report["failures"]:
+            report["failures"].append({"root" : None, "error" : process.stderr[-2000:] or "Exit code " + str(process.returncode)})
+    except subprocess.TimeoutExpired:
+        report = {"file" : blend_file, "failures" : [{"root" : None, "error" : "Timed out"}]}
+    except (OSError, ValueError) as e:
+        report = {"file" : blend_file, "failures" : [{"root" : None, "error" : str(e)}]}
+    finally:
+        os.remove(report_path)
+    report["file"] = blend_file
+    report["process_time"] = time.perf_counter() - start
+    return report
+
+def main() -> int:
+    args, export_args = _parse_args(sys.argv[1:])
+    start : float = time.perf_counter()
+    blend_files : list[str] = find_blend_files(args.directory)
+    print("Exporting " + str(len(blend_files)) + " file(s) with " + str(args.jobs) + " job(s).")
+
+    # Each job is a separate Blender process, the threads only wait on them.
+    with ThreadPoolExecutor(max_workers = max(1, args.jobs)) as executor:
+        reports : list[dict] = list(executor.map(lambda x : export_blend_file(args.blender, x, export_args, args.timeout),
+                                                 blend_files))
+
+    failed_files : list[str] = [report["file"] for report in reports if report["failures"]]
+    consolidated : dict = {"directory" : os.path.abspath(args.directory),
+                           "time" : time.perf_counter() - start,
+                           "file_count" : len(blend_files),
+                           "failed_files" : failed_files,
+                           "files" : reports}
+    with open(args.report, 'w', encoding = 'utf8') as file_handle:
+        json.dump(consolidated, file_handle, indent = 4)
+
+    print("Exported " + str(len(blend_files) - len(failed_files)) + " of " + str(len(blend_files)) + " file(s). Report: " + args.report)
+    return 1 if failed_files else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Quick exports the open .blend file from the command line.\n
+Usage:
+    blender -b file.blend -P ab_blender_utilities/cli/batch_export.py -- [options]\n
+Export roots are chosen by collection, object name pattern and/or custom property.
+Objects whose ancestor is also a root are not exported separately.
+"""
+import bpy
+import addon_utils
+
+import argparse
+import fnmatch
+import importlib
+import json
+import os
+import sys
+import time
+
+
+_package_dir : str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_package_name : str = os.path.basename(_package_dir)
+
+def _parse_args(argv : list[str]) -> argparse.Namespace:
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog = "blender -b <file.blend> -P batch_export.py --",
+                                     description = "Quick exports objects of a .blend file.")
+    parser.add_argument("--scene", help = "Scene to export from. Defaults to the active scene.")
+    parser.add_argument("--output", help = "Export directory. Defaults to the scene's quick export path.")
+    parser.add_argument("--collection", action = "append", default = [],
+                        help = "Exports the objects of this collection as roots. Can be repeated.")
+    parser.add_argument("--pattern", action = "append", default = [],
+                        help = "Exports objects whose name matches this wildcard pattern. Can be repeated.")
+    parser.add_argument("--property", action = "append", default = [],
+                        help = "Exports objects that have this custom property. Can be repeated.")
+    parser.add_argument("--exporter", choices = ("NATIVE", "CUSTOM"), help = "Overrides the exporter type.")
+    parser.add_argument("--export-wire", action = "store_true", help = "Exports objects with the 'Wire' display type.")
+    parser.add_argument("--no-recursive", action = "store_true", help = "Only exports direct children of the roots.")
+    parser.add_argument("--deduplicate", action = "store_true",
+                        help = "Exports identical geometry once and writes an instance manifest.")
+    parser.add_argument("--merge", action = "store_true", help = "Merges each root and its children into one mesh.")
+    parser.add_argument("--resume", action = "store_true",
+                        help = "Skips roots that were already exported by a failed or interrupted run of the same export.")
+    parser.add_argument("--package", choices = ("NONE", "ASSET", "BATCH"), help = "Overrides the packaging preference.")
+    parser.add_argument("--timings", action = "store_true", help = "Writes per-stage export timings to the export directory.")
+    parser.add_argument("--report", help = "Writes a JSON report to this path.")
+    return parser.parse_args(argv)
+
+def _enable_addon() -> None:
+    if os.path.dirname(_package_dir) not in sys.path:
+        sys.path.insert(0, os.path.dirname(_package_dir))
+    addon_utils.enable(_package_name, default_set = True)
+    if _package_name not in bpy.context.preferences.addons:
+        raise RuntimeError("Unable to enable the addon " + _package_name)
+
+def _get_roots(scene : bpy.types.Scene, args : argparse.Namespace) -> list[bpy.types.Object]:
+    candidates : set[bpy.types.Object] = set()
+    for collection_name in args.collection:
+        collection : bpy.types.Collection | None = bpy.data.collections.get(collection_name)
+        if collection is None:
+            print("Collection not found: " + collection_name)
+            continue
+        candidates.update(collection.all_objects)
+    for o in scene.objects:
+        if any(fnmatch.fnmatchcase(o.name, pattern) for pattern in args.pattern)\
+            or any(key in o for key in args.property):
+                candidates.add(o)
+
+    scene_objects : set[bpy.types.Object] = set(scene.objects)
+    roots : list[bpy.types.Object] = []
+    for o in candidates:
+        if o not in scene_objects:
+            continue
+        parent : bpy.types.Object | None = o.parent
+        while parent is not None and parent not in candidates:
+            parent = parent.parent
+        if parent is None:
+            roots.append(o)
+    return sorted(roots, key = lambda x : x.name)
+
+def main() -> int:
+    args : argparse.Namespace = _parse_args(sys.argv)
+    start : float = time.perf_counter()
+    report : dict = {"file" : bpy.data.filepath, "roots" : [], "failures" : []}
+    exit_code : int = 0
+
+    try:
+        _enable_addon()
+        persistent = importlib.import_module(_package_name + ".addon.persistent")
+        quick_export = importlib.import_module(_package_name + ".lib.quick_export")
+        file_ops_fbx = importlib.import_module(_package_name + ".operators.file_ops.file_ops_fbx")
+
+        scene : bpy.types.Scene = bpy.data.scenes[args.scene] if args.scene else bpy.context.scene
+        view_layer : bpy.types.ViewLayer = bpy.context.view_layer if scene == bpy.context.scene else scene.view_layers[0]
+
+        prefs = persistent.get_preferences()
+        if args.exporter:
+            prefs.fbx_exporter_type = args.exporter
+        prefs.quick_export_record_timings = args.timings
+        if args.package:
+            prefs.quick_export_packaging = args.package
+        if args.output:
+            prefs.uses_default_export_path = True
+            prefs.default_export_path = os.path.abspath(args.output)
+        elif not quick_export.has_quick_export_path(scene):
+            raise RuntimeError(quick_export.export_path_warning_msg)
+
+        roots : list[bpy.types.Object] = _get_roots(scene, args)
+        report["roots"] = [o.name for o in roots]
+        report["export_directory"] = quick_export.get_export_directory(scene)
+
+        options = file_ops_fbx.QuickExportOptions(export_wire_objects = args.export_wire,
+                                                  recursive_export = not args.no_recursive,
+                                                  deduplicate_geometry = args.deduplicate,
+                                                  merge_hierarchy = args.merge)
+        with bpy.context.temp_override(scene = scene, view_layer = view_layer):
+            summary = file_ops_fbx.quick_export_objects(options, roots, resume_unfinished = args.resume)
+        report["exported"] = summary.exported_count
+        report["changed"] = summary.changed_count
+        report["archives"] = list(summary.archives)
+        report["failures"] = [{"root" : name, "error" : msg} for name, msg in summary.failures]
+        if summary.failures:
+            exit_code = 1
+    except Exception as e:
+        report["failures"].append({"root" : None, "error" : str(e)})
+        print("Batch export failed: " + str(e))
+        exit_code = 1
+
+    report["time"] = time.perf_counter() - start
+    if args.report:
+        with open(args.report, 'w', encoding = 'utf8') as file_handle:
+            json.dump(report, file_handle, indent = 4)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
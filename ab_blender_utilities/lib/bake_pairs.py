@@ -0,0 +1,88 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Index of bake high/low object pairs.\n
+Objects are grouped by their name without the bake suffix in a single pass,
+so pairing does not compare every name with every other name.
+"""
+import bpy
+import re
+
+from typing import Final, NamedTuple
+from ..addon import constants
+
+
+# A bake suffix at the end of the name or followed by a separator or a number, e.g. `Rock_low` or `Rock_low.001`.
+# Suffixes inside words are not bake suffixes, so `Tree_Lower`, `Wall_lowpoly` and `Cliff_highlands_A` have none.
+_bake_suffix_pattern : Final[re.Pattern] = re.compile(r'(' + "|".join(re.escape(x) for x in constants.bake_suffixes) + r')(?=[._\d]|$)')
+
+class BakePair(NamedTuple):
+    name : str  # Name without the bake suffix
+    high : bpy.types.Object
+    low : bpy.types.Object
+
+class BakePairIndex(NamedTuple):
+    pairs : tuple[BakePair]
+    unpaired : tuple[bpy.types.Object]  # Objects without a counterpart
+    ambiguous : dict[str, tuple[bpy.types.Object]]  # Base name -> objects, if a side has more than one object
+
+def split_bake_suffix(name : str) -> tuple[str, str | None]:
+    """Returns the name without its bake suffix and the side of the suffix, 'HIGH' or 'LOW'.\n
+    The side is `None` if the name has no bake suffix."""
+    name = name.split("/")[-1]
+    match = _bake_suffix_pattern.search(name)
+    if match is None:
+        return name, None
+    return name[:match.start()] + name[match.end():], 'HIGH' if match.group(1).lower() == "_high" else 'LOW'
+
+def __has_ancestor_of_side(o : bpy.types.Object, side : str, sides : dict[bpy.types.Object, str]) -> bool:
+    parent : bpy.types.Object | None = o.parent
+    while parent is not None:
+        if sides.get(parent) == side:
+            return True
+        parent = parent.parent
+    return False
+
+def build_bake_pair_index(objects) -> BakePairIndex:
+    """Pairs the high and low objects of `objects` by name.\n
+    Objects with a bake suffix whose parent chain already contains an object of the same side
+    are treated as parts of that object and are not indexed."""
+    sides : dict[bpy.types.Object, str] = {}
+    groups : dict[str, dict[str, list[bpy.types.Object]]] = {}
+    for o in objects:
+        base_name, side = split_bake_suffix(o.name)
+        if side is None:
+            continue
+        sides[o] = side
+        groups.setdefault(base_name, {'HIGH' : [], 'LOW' : []})[side].append(o)
+
+    pairs : list[BakePair] = []
+    unpaired : list[bpy.types.Object] = []
+    ambiguous : dict[str, tuple[bpy.types.Object]] = {}
+    for base_name, group in groups.items():
+        for side in ('HIGH', 'LOW'):
+            group[side] = [o for o in group[side] if not __has_ancestor_of_side(o, side, sides)]
+        high, low = group['HIGH'], group['LOW']
+        if len(high) > 1 or len(low) > 1:
+            ambiguous[base_name] = tuple(high + low)
+        elif len(high) == 1 and len(low) == 1:
+            pairs.append(BakePair(base_name, high[0], low[0]))
+        else:
+            unpaired += high + low
+
+    pairs.sort(key = lambda x : x.name)
+    return BakePairIndex(tuple(pairs), tuple(unpaired), ambiguous)
@@ -20,7 +20,9 @@ Common functions shared between different operators
 import bpy
 from bpy.types import Operator
 
+import hashlib
 import os
+from collections.abc import Iterator
 from ..addon import constants
 
 
@@ -62,56 +64,79 @@ def get_name_from_path(target : str) -> str:
     This is used with objects that have a path part of their name."""
     return target.name.split("/")[-1:][0]
 
-def __select_child_objects(o : bpy.types.Object,
-                           select_wire : bool = False,
-                           recursive : bool = False) -> None:
-    """Selects all child objects in the `obj` argument.\n
-    The `select_wire` argument bypasses the `display_type` check."""
-    child_objects : list = []
-    for ch_obj in o.children:
+def get_children_map(objects = None) -> dict[bpy.types.Object, list[bpy.types.Object]]:
+    """Maps every parent object to its children in one pass over `objects`, which defaults to `bpy.data.objects`.\n
+    `Object.children` scans all objects on every access, so traversals of many objects should share one map.
+    Children keep the order of `objects`, like `Object.children`."""
+    if objects is None:
+        objects = bpy.data.objects
+    children_map : dict[bpy.types.Object, list[bpy.types.Object]] = {}
+    for o in objects:
+        if o.parent is not None:
+            children_map.setdefault(o.parent, []).append(o)
+    return children_map
+
+def iter_child_objects(o : bpy.types.Object,
+                       select_wire : bool = False,
+                       recursive : bool = False,
+                       children_map : dict[bpy.types.Object, list[bpy.types.Object]] | None = None) -> Iterator[bpy.types.Object]:
+    """Yields the child objects of `o` depth-first, without recursion.\n
+    The `select_wire` argument bypasses the `display_type` check. Children of skipped objects are skipped as well.
+    A `children_map` from `get_children_map` avoids `Object.children` lookups."""
+    get_children = (lambda x : children_map.get(x, ())) if children_map is not None else (lambda x : x.children)
+    stack : list[bpy.types.Object] = list(reversed(get_children(o)))
+    while stack:
+        ch_obj : bpy.types.Object = stack.pop()
         if ch_obj.display_type == 'TEXTURED'\
             or ch_obj.display_type == 'SOLID'\
             or select_wire:
-                child_objects.append(ch_obj)
-                ch_obj.select_set(True)
-                if len(ch_obj.children) > 0 and recursive:
-                    child_objects += __select_child_objects(ch_obj, select_wire, recursive)
-    return child_objects
+                yield ch_obj
+                if recursive:
+                    stack.extend(reversed(get_children(ch_obj)))
 
 def select_child_objects(select_wire : bool = False,
                          recursive : bool = False,
                          *,
-                         objects : bpy.types.Object = None) -> tuple:
+                         objects : bpy.types.Object = None,
+                         children_map : dict[bpy.types.Object, list[bpy.types.Object]] | None = None) -> tuple:
     """Selects all child objects in selected objects.\n
     The `select_wire` argument bypasses the `display_type` check."""
     if objects == None:
         objects = bpy.context.selected_objects
+    if children_map is None:
+        children_map = get_children_map()
     
     child_objects : list = []
     for o in objects:
-        child_objects += __select_child_objects(o, select_wire, recursive)
+        child_objects += iter_child_objects(o, select_wire, recursive, children_map)
+    select_objects(child_objects)
     return tuple(child_objects)
 
 def get_child_objects(o : bpy.types.Object,
                       select_wire : bool = False,
-                      recursive : bool = False) -> list[bpy.types.Object]:
+                      recursive : bool = False,
+                      children_map : dict[bpy.types.Object, list[bpy.types.Object]] | None = None) -> list[bpy.types.Object]:
     """Gets all child objects in the `obj` argument.\n
     The `select_wire` argument bypasses the `display_type` check."""
-    children : list[bpy.types.Object] = []
-    for ch_obj in o.children:
-            if ch_obj.display_type == 'TEXTURED'\
-            or ch_obj.display_type == 'SOLID'\
-            or select_wire:
-                children.append(ch_obj)
-                if len(ch_obj.children) > 0 and recursive:
-                    children += get_child_objects(ch_obj, select_wire, recursive)
-    return children
+    return list(iter_child_objects(o, select_wire, recursive, children_map))
+
+def get_root_objects(targets : list[bpy.types.Object] | tuple[bpy.types.Object]) -> list[bpy.types.Object]:
+    """Returns the objects of `targets` whose parent chain contains no other object of `targets`."""
+    target_set : set[bpy.types.Object] = set(targets)
+    roots : list[bpy.types.Object] = []
+    for o in targets:
+        parent : bpy.types.Object | None = o.parent
+        while parent is not None and parent not in target_set:
+            parent = parent.parent
+        if parent is None:
+            roots.append(o)
+    return roots
 
 def select_objects(targets : list[bpy.types.Object] | tuple[bpy.types.Object]) -> None:
-    """Selects target objects."""
+    """Selects target objects. Objects that are already selected are not touched."""
     for o in targets:
         # Selection
-        if o:
+        if o and not o.select_get():
             o.select_set(True)
 
 def deselect_all() -> None:
@@ -119,6 +144,55 @@ def deselect_all() -> None:
     for o in bpy.context.selected_objects:
         o.select_set(False)
 
+def _apply_selection(selection : set[bpy.types.Object], active_object : bpy.types.Object | None) -> None:
+    """Changes the selection of the context view layer to `selection`, only touching objects whose state differs."""
+    current : set[bpy.types.Object] = set(bpy.context.selected_objects)
+    for o in current - selection:
+        o.select_set(False)
+    for o in selection - current:
+        o.select_set(True)
+    if bpy.context.view_layer.objects.active != active_object:
+        bpy.context.view_layer.objects.active = active_object
+
+class SelectionTransaction():
+    """Collects selection changes and applies only the difference once, when the `with` block ends.\n
+    `select`, `deselect`, `deselect_all` and `set_active` change the desired selection without touching any object,
+    so repeated changes inside loops cost nothing. If the block raises, the original selection and active object are restored."""
+    def __init__(self):
+        self.original_selection : set[bpy.types.Object] = set(bpy.context.selected_objects)
+        self.original_active : bpy.types.Object | None = bpy.context.view_layer.objects.active
+        self.selection : set[bpy.types.Object] = set(self.original_selection)
+        self.active : bpy.types.Object | None = self.original_active
+
+    def select(self, objects, state : bool = True) -> None:
+        if state:
+            self.selection.update(o for o in objects if o)
+        else:
+            self.selection.difference_update(objects)
+
+    def deselect(self, objects) -> None:
+        self.select(objects, False)
+
+    def deselect_all(self) -> None:
+        self.selection.clear()
+
+    def set_active(self, o : bpy.types.Object | None) -> None:
+        self.active = o
+
+    def apply(self) -> None:
+        """Applies the desired selection now, e.g. before an operator that reads the selection."""
+        _apply_selection(self.selection, self.active)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.apply()
+        else:
+            _apply_selection(self.original_selection, self.original_active)
+        return False
+
 def get_modifier_objects(o : bpy.types.Object,
                          select : bool = False) -> tuple[bpy.types.Object]:
     """Get objects referenced in modifiers of an object.\n
@@ -139,3 +213,34 @@ def make_directory_from_file_path(value : str) -> None:
     file_directory : tuple[str, any]= os.path.split(value)
     if not os.path.exists(file_directory[0]):
         os.makedirs(file_directory[0])
+
+def get_temp_file_path(value : str) -> str:
+    """Returns a temporary file path next to the `value` file path, so that `os.replace` stays atomic.\n
+    The path does not end in the extension of `value`, so importers that watch the directory ignore the file.
+    Exporters writing to it should not append their own extension."""
+    return value + ".abbu_tmp"
+
+def get_file_digest(value : str) -> str | None:
+    """Returns the SHA-256 digest of a file, or `None` if the file does not exist."""
+    if not os.path.isfile(value):
+        return None
+    hasher = hashlib.sha256()
+    with open(value, 'rb') as file_handle:
+        for chunk in iter(lambda: file_handle.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def replace_file_if_changed(temp_file_path : str,
+                            file_path : str,
+                            digest_func = get_file_digest) -> bool:
+    """Atomically moves `temp_file_path` to `file_path` if their contents differ.\n
+    If the contents match, the temporary file is removed and `file_path` is left untouched,
+    keeping its modification time.\n
+    Returns `True` if `file_path` was written."""
+    if not os.path.isfile(temp_file_path):
+        return False
+    if os.path.isfile(file_path) and digest_func(temp_file_path) == digest_func(file_path):
+        os.remove(temp_file_path)
+        return False
+    os.replace(temp_file_path, file_path)
+    return True
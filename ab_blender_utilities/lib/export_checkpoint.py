@@ -0,0 +1,105 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Checkpoint file of a quick export batch.\n
+Every completed root is stored with its output files and their digests,
+so an interrupted or partially failed batch can be resumed.
+The file is saved at most every `save_interval` seconds while a batch runs, and once at its end.
+The checkpoint belongs to one batch, identified by its roots and export options,
+and is discarded when a different batch is exported.
+"""
+import hashlib
+import json
+import os
+import time
+
+from typing import Final
+from . import common
+
+
+checkpoint_file_name : Final[str] = "abbu_quick_export_checkpoint.json"
+save_interval : Final[float] = 2.0  # Seconds
+
+def get_batch_id(root_keys, options : tuple) -> str:
+    """Returns an id of a batch from the keys of its roots and its export options."""
+    hasher = hashlib.sha1()
+    for key in sorted(root_keys):
+        hasher.update(key.encode('utf8') + b'\0')
+    hasher.update(repr(options).encode('utf8'))
+    return hasher.hexdigest()
+
+class ExportCheckpoint():
+    def __init__(self, directory : str, batch_id : str, resume : bool = True):
+        """The checkpoint of an earlier batch is discarded if its `batch_id` differs, or if `resume` is `False`."""
+        self.file_path : str = os.path.join(directory, checkpoint_file_name)
+        self.batch_id : str = batch_id
+        self.roots : dict[str, dict[str, str]] = {}  # Root name -> {output file path : digest}
+        self._is_dirty : bool = False
+        self._last_save_time : float = time.monotonic()
+        if resume and os.path.isfile(self.file_path):
+            try:
+                with open(self.file_path, 'r', encoding = 'utf8') as file_handle:
+                    data : dict = json.load(file_handle)
+                if data.get("batch_id") == batch_id:
+                    self.roots = data.get("roots", {})
+                else:
+                    print(common.info(None, "Discarding the export checkpoint of a different batch: " + self.file_path))
+            except (OSError, ValueError, AttributeError):
+                print(common.warning(None, "Ignoring unreadable export checkpoint: " + self.file_path))
+                self.roots = {}
+
+    def is_complete(self, root_name : str) -> bool:
+        """Returns `True` if the root was exported by an earlier run and its files were not changed since."""
+        files : dict[str, str] | None = self.roots.get(root_name)
+        if not files:
+            return False
+        for file_path, digest in files.items():
+            if common.get_file_digest(file_path) != digest:
+                return False
+        return True
+
+    def get_files(self, root_name : str) -> tuple[str]:
+        return tuple(self.roots.get(root_name, {}).keys())
+
+    def mark_complete(self, root_name : str, file_paths : list[str] | tuple[str]) -> None:
+        """Stores the root with the digests of its output files.\n
+        The checkpoint is saved if the last save was more than `save_interval` seconds ago,
+        so large batches don't rewrite the file for every root."""
+        self.roots[root_name] = {file_path : common.get_file_digest(file_path) for file_path in file_paths}
+        self._is_dirty = True
+        if time.monotonic() - self._last_save_time >= save_interval:
+            self.save()
+
+    def flush(self) -> None:
+        """Saves the roots stored since the last save, used at the end of a batch."""
+        if self._is_dirty:
+            self.save()
+
+    def save(self) -> None:
+        temp_file_path : str = common.get_temp_file_path(self.file_path)
+        with open(temp_file_path, 'w', encoding = 'utf8') as file_handle:
+            json.dump({"batch_id" : self.batch_id, "roots" : self.roots}, file_handle, indent = 4)
+        os.replace(temp_file_path, self.file_path)
+        self._is_dirty = False
+        self._last_save_time = time.monotonic()
+
+    def clear(self) -> None:
+        """Removes the checkpoint file, used once a batch finished without failures."""
+        self.roots.clear()
+        self._is_dirty = False
+        if os.path.isfile(self.file_path):
+            os.remove(self.file_path)
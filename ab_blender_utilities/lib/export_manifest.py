@@ -0,0 +1,79 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Instance manifest of a geometry-deduplicated quick export.\n
+Every root is mapped to the file that holds its geometry and to its transform,
+so roots that share geometry can be placed from a single exported file.
+"""
+import bpy
+
+import json
+import os
+
+from typing import Final
+from . import common
+
+
+manifest_file_name : Final[str] = "abbu_quick_export_manifest.json"
+
+class ExportManifest():
+    def __init__(self, directory : str, keep_roots : bool = False):
+        """`keep_roots` loads the roots of an existing manifest, used when a batch resumes from a checkpoint.
+        Only the roots passed to `keep_root` are carried over."""
+        self.directory : str = directory
+        self.file_path : str = os.path.join(directory, manifest_file_name)
+        self.geometry_files : dict[str, str] = {}  # Geometry hash -> file path, for the current batch
+        self.roots : dict[str, dict] = {}
+        self._previous_roots : dict[str, dict] = {}
+        if keep_roots and os.path.isfile(self.file_path):
+            try:
+                with open(self.file_path, 'r', encoding = 'utf8') as file_handle:
+                    self._previous_roots = json.load(file_handle).get("roots", {})
+            except (OSError, ValueError, AttributeError):
+                print(common.warning(None, "Ignoring unreadable export manifest: " + self.file_path))
+                self._previous_roots = {}
+
+    def keep_root(self, root_name : str) -> None:
+        """Carries over the entry of a root that was skipped because an earlier run already exported it.\n
+        Its geometry file can then be shared with later roots of this batch."""
+        root : dict | None = self._previous_roots.get(root_name)
+        if root is None:
+            return
+        self.roots[root_name] = root
+        self.geometry_files.setdefault(root["hash"], os.path.join(self.directory, root["geometry"]))
+
+    def get_geometry_file(self, geometry_hash : str) -> str | None:
+        return self.geometry_files.get(geometry_hash)
+
+    def add_root(self, root : bpy.types.Object, geometry_hash : str, file_path : str) -> None:
+        """Records `root` as an instance of the geometry written to `file_path`.\n
+        The location and rotation are not part of the geometry file, the scale is."""
+        self.geometry_files.setdefault(geometry_hash, file_path)
+        self.roots[root.name] = {"geometry" : os.path.relpath(file_path, self.directory).replace("\\", "/"),
+                                 "hash" : geometry_hash,
+                                 "location" : tuple(root.location),
+                                 "rotation_euler" : tuple(root.rotation_euler),
+                                 "rotation_mode" : root.rotation_mode,
+                                 "scale" : tuple(root.scale),
+                                 "matrix_world" : [tuple(row) for row in root.matrix_world]}
+
+    def save(self) -> None:
+        temp_file_path : str = common.get_temp_file_path(self.file_path)
+        with open(temp_file_path, 'w', encoding = 'utf8') as file_handle:
+            json.dump({"geometry_count" : len(set(x["hash"] for x in self.roots.values())),
+                       "roots" : self.roots}, file_handle, indent = 4)
+        common.replace_file_if_changed(temp_file_path, self.file_path)
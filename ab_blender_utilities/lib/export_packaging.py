@@ -0,0 +1,114 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Packages quick export outputs into zip archives on background threads.\n
+The exporting thread only hands off file paths, compression runs on a thread pool while later roots export.
+Entries use the modification time of their files, and archives are only replaced when their content changed.
+"""
+import os
+import shutil
+import time
+import zipfile
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Final
+from . import common
+
+
+packages_directory_name : Final[str] = "packages"
+
+def _get_zip_info(file_path : str, arcname : str) -> zipfile.ZipInfo:
+    zip_info = zipfile.ZipInfo(arcname, time.localtime(max(os.path.getmtime(file_path), 315532800.0))[:6])  # Zip dates start in 1980
+    zip_info.compress_type = zipfile.ZIP_DEFLATED
+    zip_info.external_attr = 0o644 << 16
+    return zip_info
+
+def _add_file(archive : zipfile.ZipFile, file_path : str, arcname : str) -> None:
+    with open(file_path, 'rb') as source, archive.open(_get_zip_info(file_path, arcname), 'w') as target:
+        shutil.copyfileobj(source, target, 1024 * 1024)
+
+class ExportPackager():
+    """Packages the files of every root into its own archive (`'ASSET'`) or all files into one archive (`'BATCH'`)."""
+    def __init__(self, export_directory : str, mode : str, batch_name : str):
+        self.export_directory : str = export_directory
+        self.directory : str = os.path.join(export_directory, packages_directory_name)
+        self.mode : str = mode
+        self.futures : list[tuple[str, Future]] = []  # (archive path, future)
+        os.makedirs(self.directory, exist_ok = True)
+        if mode == 'BATCH':
+            # A single worker appends to the batch archive in hand-off order
+            self.executor = ThreadPoolExecutor(max_workers = 1)
+            self.batch_path : str = os.path.join(self.directory, batch_name + ".zip")
+            self.batch_arcnames : set[str] = set()
+            self.batch_archive : zipfile.ZipFile | None = None
+        else:
+            self.executor = ThreadPoolExecutor(max_workers = max(1, (os.cpu_count() or 2) - 1))
+
+    def __get_arcname(self, file_path : str) -> str:
+        return os.path.relpath(file_path, self.export_directory).replace("\\", "/")
+
+    def __write_asset(self, archive_path : str, file_paths : tuple[str]) -> None:
+        os.makedirs(os.path.dirname(archive_path), exist_ok = True)
+        temp_file_path : str = common.get_temp_file_path(archive_path)
+        with zipfile.ZipFile(temp_file_path, 'w') as archive:
+            for file_path in file_paths:
+                _add_file(archive, file_path, self.__get_arcname(file_path))
+        common.replace_file_if_changed(temp_file_path, archive_path)
+
+    def __append_to_batch(self, file_paths : tuple[str]) -> None:
+        if self.batch_archive is None:
+            self.batch_archive = zipfile.ZipFile(common.get_temp_file_path(self.batch_path), 'w')
+        for file_path in file_paths:
+            arcname : str = self.__get_arcname(file_path)
+            if arcname not in self.batch_arcnames:  # Files shared by several roots are added once
+                self.batch_arcnames.add(arcname)
+                _add_file(self.batch_archive, file_path, arcname)
+
+    def __close_batch(self) -> None:
+        if self.batch_archive is not None:
+            self.batch_archive.close()
+            common.replace_file_if_changed(common.get_temp_file_path(self.batch_path), self.batch_path)
+
+    def add(self, root_name : str, file_paths : list[str] | tuple[str]) -> None:
+        """Hands off the output files of a root. Returns without waiting for compression."""
+        file_paths = tuple(x for x in file_paths if os.path.isfile(x))
+        if not file_paths:
+            return
+        if self.mode == 'BATCH':
+            self.futures.append((self.batch_path, self.executor.submit(self.__append_to_batch, file_paths)))
+        else:
+            archive_path : str = os.path.join(self.directory, root_name + ".zip")  # Path names package into subdirectories
+            self.futures.append((archive_path, self.executor.submit(self.__write_asset, archive_path, file_paths)))
+
+    def finish(self, extra_file_paths : list[str] | tuple[str] = ()) -> tuple[str]:
+        """Waits for all archives to be written.\n
+        `extra_file_paths`, such as manifests, are added to the batch archive.
+        Returns the paths of the written archives."""
+        if self.mode == 'BATCH':
+            self.add("", extra_file_paths)
+            self.futures.append((self.batch_path, self.executor.submit(self.__close_batch)))
+        archive_paths : dict[str, None] = {}
+        failed_paths : set[str] = set()
+        for archive_path, future in self.futures:
+            try:
+                future.result()
+                archive_paths[archive_path] = None
+            except (OSError, zipfile.BadZipFile) as e:
+                failed_paths.add(archive_path)
+                print(common.warning(None, "Failed to package " + archive_path + ": " + str(e)))
+        self.executor.shutdown()
+        return tuple(x for x in archive_paths.keys() if x not in failed_paths)
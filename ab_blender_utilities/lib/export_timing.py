@@ -0,0 +1,158 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Per-root and per-stage timings of quick exports.\n
+Timings are only recorded between `begin()` and `end()`, otherwise `stage()`
+returns a shared no-op context manager.
+"""
+import json
+import os
+import time
+
+from typing import Final
+
+
+report_file_name : Final[str] = "abbu_quick_export_timings.json"
+
+class _NullStage():
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+class _Stage():
+    __slots__ = ("_stages", "_name", "_start")
+
+    def __init__(self, stages : dict[str, float], name : str):
+        self._stages = stages
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        duration : float = time.perf_counter() - self._start
+        self._stages[self._name] = self._stages.get(self._name, 0.0) + duration
+        return False
+
+class ExportProfiler():
+    """Records stage durations and output file sizes for each export root."""
+    def __init__(self):
+        self.roots : dict[str, dict] = {}
+        self.batch : dict = {"stages" : {}, "archives" : []}  # Work that belongs to no single root
+        self._start : float = time.perf_counter()
+        self._current : dict = self.__new_entry()
+
+    @staticmethod
+    def __new_entry() -> dict:
+        return {"stages" : {}, "files" : {}}
+
+    def begin_root(self, name : str) -> None:
+        """Starts recording stages for the export root `name`."""
+        self._current = self.roots.setdefault(name, self.__new_entry())
+
+    def stage(self, name : str) -> _Stage:
+        """Returns a context manager that adds its duration to the stage `name` of the current root."""
+        return _Stage(self._current["stages"], name)
+
+    def batch_stage(self, name : str) -> _Stage:
+        """Returns a context manager that adds its duration to the batch stage `name`."""
+        return _Stage(self.batch["stages"], name)
+
+    def add_output(self, file_path : str) -> None:
+        """Records the size of an output file of the current root."""
+        self._current["files"][file_path] = os.path.getsize(file_path) if os.path.isfile(file_path) else 0
+
+    def add_archive(self, file_path : str) -> None:
+        self.batch["archives"].append(file_path)
+
+    def get_stage_totals(self) -> dict[str, float]:
+        """Returns the duration of every stage summed over all roots."""
+        totals : dict[str, float] = {}
+        for entry in self.roots.values():
+            for stage_name, duration in entry["stages"].items():
+                totals[stage_name] = totals.get(stage_name, 0.0) + duration
+        return totals
+
+    def get_summary(self) -> str:
+        """Returns a single line summary of the recorded timings."""
+        totals : dict[str, float] = self.get_stage_totals()
+        stages : str = ", ".join(name + ": " + format(duration, ".3f") + "s"
+                                 for name, duration in sorted(totals.items(),
+                                                              key = lambda x : x[1],
+                                                              reverse = True))
+        return str(len(self.roots)) + " root(s) in " + format(time.perf_counter() - self._start, ".3f") + "s (" + stages + ")"
+
+    def to_dict(self) -> dict:
+        return {"total" : time.perf_counter() - self._start,
+                "stages" : self.get_stage_totals(),
+                "batch" : self.batch,
+                "roots" : self.roots}
+
+    def write_report(self, directory : str) -> str:
+        """Writes the timings as a JSON file inside `directory`.\n
+        Returns the report file path."""
+        file_path : str = os.path.join(directory, report_file_name)
+        with open(file_path, 'w', encoding = 'utf8') as file_handle:
+            json.dump(self.to_dict(), file_handle, indent = 4)
+        return file_path
+
+_null_stage : Final[_NullStage] = _NullStage()
+_active_profiler : ExportProfiler | None = None
+
+def begin() -> ExportProfiler:
+    """Starts recording timings. Returns the active `ExportProfiler`."""
+    global _active_profiler
+    _active_profiler = ExportProfiler()
+    return _active_profiler
+
+def end() -> ExportProfiler | None:
+    """Stops recording timings. Returns the `ExportProfiler` that was active, if any."""
+    global _active_profiler
+    profiler : ExportProfiler | None = _active_profiler
+    _active_profiler = None
+    return profiler
+
+def begin_root(name : str) -> None:
+    if _active_profiler is not None:
+        _active_profiler.begin_root(name)
+
+def stage(name : str) -> _Stage | _NullStage:
+    """Returns a context manager timing the stage `name` of the current root.\n
+    When timings are not being recorded, a shared no-op context manager is returned."""
+    if _active_profiler is None:
+        return _null_stage
+    return _active_profiler.stage(name)
+
+def batch_stage(name : str) -> _Stage | _NullStage:
+    """Returns a context manager timing the batch stage `name`, see `stage`."""
+    if _active_profiler is None:
+        return _null_stage
+    return _active_profiler.batch_stage(name)
+
+def add_output(file_path : str) -> None:
+    if _active_profiler is not None:
+        _active_profiler.add_output(file_path)
+
+def add_archive(file_path : str) -> None:
+    if _active_profiler is not None:
+        _active_profiler.add_archive(file_path)
@@ -0,0 +1,131 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Watches export roots and re-exports them after they stop changing.\n
+Objects and data blocks are tracked by `session_uid`, which maps to the export roots
+that include them. A depsgraph update of an untracked ID only costs a dictionary lookup.
+"""
+import bpy
+
+import time
+from collections.abc import Callable
+from . import common
+
+
+_root_uids : set[int] = set()
+_index : dict[int, set[int]] = {}  # Object or data `session_uid` -> root `session_uid`s
+_dirty_roots : set[int] = set()
+_export_callback : Callable[[list[bpy.types.Object]], None] | None = None
+_delay : float = 1.0
+_last_change : float = 0.0
+_exporting : bool = False
+_skip_next_update : bool = False
+
+def __add_to_index(uid : int, root_uid : int) -> None:
+    if uid not in _index:
+        _index[uid] = {root_uid}
+    else:
+        _index[uid].add(root_uid)
+
+def _rebuild_index() -> None:
+    """Maps every object and data block included in the export of a root to that root."""
+    _index.clear()
+    roots : list[bpy.types.Object] = [o for o in bpy.data.objects if o.session_uid in _root_uids]
+    children_map : dict[bpy.types.Object, list[bpy.types.Object]] = common.get_children_map()
+    for root in roots:
+        members : list[bpy.types.Object] = [root] + common.get_child_objects(root, True, True, children_map)
+        for o in tuple(members):
+            members += common.get_modifier_objects(o)
+        for o in members:
+            __add_to_index(o.session_uid, root.session_uid)
+            if o.data is not None:
+                __add_to_index(o.data.session_uid, root.session_uid)
+
+def _on_depsgraph_update(scene, depsgraph) -> None:
+    global _last_change, _skip_next_update
+    if _exporting:
+        return
+    if _skip_next_update:  # Updates caused by restoring the scene after an export
+        _skip_next_update = False
+        return
+
+    touched : bool = False
+    for update in depsgraph.updates:
+        root_uids : set[int] | None = _index.get(update.id.original.session_uid)
+        if root_uids is not None:
+            _dirty_roots.update(root_uids)
+            touched = True
+
+    if touched:
+        _last_change = time.monotonic()
+        if not bpy.app.timers.is_registered(_on_timer):
+            bpy.app.timers.register(_on_timer, first_interval = _delay)
+
+def _on_timer() -> float | None:
+    global _exporting, _skip_next_update
+    remaining : float = _delay - (time.monotonic() - _last_change)
+    if remaining > 0.0:
+        return remaining
+    if bpy.context.mode != 'OBJECT':
+        return _delay  # Wait until the user leaves edit modes
+
+    roots : list[bpy.types.Object] = [o for o in bpy.data.objects if o.session_uid in _dirty_roots]
+    _dirty_roots.clear()
+    if not roots or _export_callback is None:
+        return None
+
+    _exporting = True
+    try:
+        if bpy.context.window_manager.windows:
+            # Timers run without a window, which is needed for selection context members
+            with bpy.context.temp_override(window = bpy.context.window_manager.windows[0]):
+                _export_callback(roots)
+        else:
+            _export_callback(roots)
+    finally:
+        _exporting = False
+        _skip_next_update = True
+        _rebuild_index()  # Picks up new children or modifier objects
+    return None
+
+def is_running() -> bool:
+    return _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post
+
+def start(roots : list[bpy.types.Object] | tuple[bpy.types.Object],
+          export_callback : Callable[[list[bpy.types.Object]], None],
+          delay : float = 1.0) -> None:
+    """Starts watching `roots`.\n
+    `export_callback` is called with the changed roots once no change happened for `delay` seconds."""
+    global _export_callback, _delay
+    stop()
+    _root_uids.update(o.session_uid for o in roots)
+    _export_callback = export_callback
+    _delay = delay
+    _rebuild_index()
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+
+def stop() -> None:
+    """Stops watching and discards pending exports."""
+    global _export_callback
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if bpy.app.timers.is_registered(_on_timer):
+        bpy.app.timers.unregister(_on_timer)
+    _root_uids.clear()
+    _index.clear()
+    _dirty_roots.clear()
+    _export_callback = None
@@ -17,11 +17,18 @@
 import bpy
 from bpy.types import AddonPreferences
 
+import hashlib
+import os
+import struct
+from . import common, export_timing, gltf_files
 from ..addon import persistent
 from typing import Final
 
 exporter_type : Final[tuple[tuple]]= (('NATIVE', "Native FBX", ""),
-                                      ('CUSTOM', "Custom", ""))
+                                      ('CUSTOM', "Custom (glTF Binary)", "Built-in glTF binary exporter that streams mesh data directly to disk"))
+
+export_extensions : Final[dict[str, str]] = {'NATIVE' : ".fbx",
+                                             'CUSTOM' : ".glb"}
 
 scale_options : Final[tuple[tuple]]= (('FBX_SCALE_NONE', "None", "FBX_SCALE_NONE"),
                                       ('FBX_SCALE_UNITS', "Units", "FBX_SCALE_UNITS"),
@@ -36,6 +43,58 @@ color_types : Final[tuple[tuple]]= (('NONE', "None", ""),
                                     ('SRGB', "sRGB", ""),
                                     ('LINEAR', "Linear", ""))
 
+_fbx_binary_magic : Final[bytes] = b"Kaydara FBX Binary  \x00"
+_fbx_header_size : Final[int] = 27
+
+# Top level nodes that change on every export (time stamps, file paths, exporter version).
+_fbx_volatile_nodes : Final[frozenset[bytes]] = frozenset((b"FBXHeaderExtension",
+                                                            b"FileId",
+                                                            b"CreationTime",
+                                                            b"Creator"))
+
+def get_fbx_content_digest(file_path : str) -> str | None:
+    """Returns a SHA-256 digest of the content of a binary FBX file.\n
+    Header nodes holding time stamps and file paths are skipped, and node offsets are not hashed,
+    so two exports of the same scene data produce the same digest.
+    Non-binary files are hashed as a whole."""
+    if not os.path.isfile(file_path):
+        return None
+    with open(file_path, 'rb') as file_handle:
+        data : bytes = file_handle.read()
+    if not data.startswith(_fbx_binary_magic) or len(data) < _fbx_header_size:
+        return hashlib.sha256(data).hexdigest()
+
+    version : int = struct.unpack_from("<I", data, 23)[0]
+    record_format : str = "<QQQB" if version >= 7500 else "<IIIB"
+    record_size : int = struct.calcsize(record_format)
+    view : memoryview = memoryview(data)
+    hasher = hashlib.sha256()
+    hasher.update(data[:_fbx_header_size])
+
+    try:
+        # Node ranges as (position, end, depth), children are visited before the next sibling.
+        ranges : list[tuple[int, int, int]] = [(_fbx_header_size, len(data), 0)]
+        while ranges:
+            pos, end, depth = ranges.pop()
+            if pos + record_size > end:
+                continue
+            end_offset, _, prop_len, name_len = struct.unpack_from(record_format, data, pos)
+            if end_offset == 0 or end_offset <= pos or end_offset > end:
+                continue  # Null record or end of the node list
+            name_start : int = pos + record_size
+            props_start : int = name_start + name_len
+            children_start : int = props_start + prop_len
+            ranges.append((end_offset, end, depth))  # Next sibling
+            if depth == 0 and data[name_start:props_start] in _fbx_volatile_nodes:
+                continue
+            hasher.update(struct.pack("<IQ", depth, prop_len))
+            hasher.update(view[name_start:children_start])
+            ranges.append((children_start, end_offset, depth + 1))
+    except struct.error:
+        return hashlib.sha256(data).hexdigest()
+
+    return hasher.hexdigest()
+
 def export_fbx_file(file_path : str) -> None:
     """Exports an FBX file based on the current selection."""
     prefs : AddonPreferences = persistent.get_preferences()
@@ -58,6 +117,7 @@ def export_fbx_file(file_path : str) -> None:
             object_types.add('OTHER')
 
         bpy.ops.export_scene.fbx(filepath = file_path,
+                                check_extension = False,  # Temporary file paths don't end in `.fbx`
                                 check_existing = prefs.native_fbx_ex_check_existing,
                                 use_selection = True,
                                 apply_scale_options = prefs.native_fbx_ex_scale_options,
@@ -66,3 +126,40 @@ def export_fbx_file(file_path : str) -> None:
                                 use_tspace = prefs.native_fbx_ex_use_tspace,
                                 use_custom_props = prefs.native_fbx_ex_use_custom_props,
                                 add_leaf_bones = False)
+
+def get_export_extension() -> str:
+    """Returns the file extension of the exporter type set in the preferences."""
+    return export_extensions[persistent.get_preferences().fbx_exporter_type]
+
+def get_glb_export_options() -> gltf_files.GLBExportOptions:
+    """Returns the custom exporter options set in the preferences."""
+    prefs : AddonPreferences = persistent.get_preferences()
+    return gltf_files.GLBExportOptions(apply_modifiers = prefs.custom_ex_apply_modifiers,
+                                       export_normals = prefs.custom_ex_export_normals,
+                                       export_uvs = prefs.custom_ex_export_uvs,
+                                       export_colors = prefs.custom_ex_export_colors,
+                                       weld_vertices = prefs.custom_ex_weld_vertices)
+
+def export_selection(file_path : str) -> None:
+    """Exports the current selection with the exporter type set in the preferences."""
+    if persistent.get_preferences().fbx_exporter_type == 'CUSTOM':
+        gltf_files.export_glb_file(file_path, bpy.context.selected_objects, get_glb_export_options())
+    else:
+        export_fbx_file(file_path)
+
+def export_selection_if_changed(file_path : str) -> bool:
+    """Exports the current selection to a temporary file,
+    and only replaces `file_path` if the exported content differs.\n
+    Returns `True` if the file at `file_path` was written."""
+    temp_file_path : str = common.get_temp_file_path(file_path)
+    try:
+        with export_timing.stage("export"):
+            export_selection(temp_file_path)
+    except BaseException:
+        if os.path.isfile(temp_file_path):
+            os.remove(temp_file_path)
+        raise
+    with export_timing.stage("compare"):
+        file_changed : bool = common.replace_file_if_changed(temp_file_path, file_path, get_fbx_content_digest)
+    export_timing.add_output(file_path)
+    return file_changed
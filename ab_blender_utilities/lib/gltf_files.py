@@ -0,0 +1,292 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Minimal glTF 2.0 binary (.glb) writer used by the custom exporter.\n
+Mesh data is read with `foreach_get` into NumPy arrays and streamed into a temporary
+binary chunk, so no per-vertex Python loops are used and only one mesh is held in memory at a time.
+"""
+import bpy
+
+import json
+import shutil
+import struct
+import tempfile
+import numpy as np
+from typing import Final, NamedTuple
+from . import common
+
+
+_glb_magic : Final[int] = 0x46546C67
+_glb_version : Final[int] = 2
+_chunk_json : Final[int] = 0x4E4F534A
+_chunk_bin : Final[int] = 0x004E4942
+
+_component_float : Final[int] = 5126
+_component_uint : Final[int] = 5125
+_target_array_buffer : Final[int] = 34962
+_target_element_array_buffer : Final[int] = 34963
+
+_accessor_types : Final[dict[int, str]] = {1 : "SCALAR", 2 : "VEC2", 3 : "VEC3", 4 : "VEC4"}
+
+# Blender is Z up, glTF is Y up: (x, y, z) -> (x, z, -y)
+_axis_conversion : Final[np.ndarray] = np.array(((1.0, 0.0, 0.0, 0.0),
+                                                  (0.0, 0.0, 1.0, 0.0),
+                                                  (0.0, -1.0, 0.0, 0.0),
+                                                  (0.0, 0.0, 0.0, 1.0)), dtype = np.float64)
+
+_mesh_object_types : Final[frozenset[str]] = frozenset(('MESH', 'CURVE', 'SURFACE', 'FONT', 'META'))
+
+
+class GLBExportOptions(NamedTuple):
+    apply_modifiers : bool = True
+    export_normals : bool = True
+    export_uvs : bool = True
+    export_colors : bool = True
+    weld_vertices : bool = True
+
+
+class _BinaryChunk():
+    """Writes buffer views into a temporary file and records their glTF description."""
+    def __init__(self):
+        self.file_handle = tempfile.TemporaryFile()
+        self.length : int = 0
+        self.buffer_views : list[dict] = []
+        self.accessors : list[dict] = []
+
+    def add_accessor(self, data : np.ndarray, component_count : int, target : int, *, min_max : bool = False) -> int:
+        """Streams `data` into the binary chunk.\n
+        Returns the index of the new accessor."""
+        data = np.ascontiguousarray(data)
+        byte_length : int = data.nbytes
+        buffer_view : dict = {"buffer" : 0,
+                              "byteOffset" : self.length,
+                              "byteLength" : byte_length,
+                              "target" : target}
+        self.file_handle.write(data.tobytes())
+        padding : int = (4 - byte_length % 4) % 4
+        self.file_handle.write(b"\x00" * padding)
+        self.length += byte_length + padding
+        self.buffer_views.append(buffer_view)
+
+        accessor : dict = {"bufferView" : len(self.buffer_views) - 1,
+                           "componentType" : _component_uint if data.dtype == np.uint32 else _component_float,
+                           "count" : len(data) // component_count if data.ndim == 1 else len(data),
+                           "type" : _accessor_types[component_count]}
+        if min_max:
+            values : np.ndarray = data.reshape(-1, component_count)
+            accessor["min"] = values.min(axis = 0).tolist()
+            accessor["max"] = values.max(axis = 0).tolist()
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+    def close(self) -> None:
+        self.file_handle.close()
+
+
+def _get_corner_normals(mesh : bpy.types.Mesh, loop_count : int) -> np.ndarray:
+    normals : np.ndarray = np.empty(loop_count * 3, dtype = np.float32)
+    if hasattr(mesh, "corner_normals"):  # Blender 4.1+
+        mesh.corner_normals.foreach_get("vector", normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+def _get_color_attribute(mesh : bpy.types.Mesh) -> bpy.types.Attribute | None:
+    if len(mesh.color_attributes) == 0:
+        return None
+    if mesh.color_attributes.active_color is not None:
+        return mesh.color_attributes.active_color
+    return mesh.color_attributes[0]
+
+def _read_loop_attributes(mesh : bpy.types.Mesh, options : GLBExportOptions) -> dict[str, np.ndarray]:
+    """Returns per face corner vertex attributes converted to glTF space."""
+    loop_count : int = len(mesh.loops)
+    vertex_co : np.ndarray = np.empty(len(mesh.vertices) * 3, dtype = np.float32)
+    mesh.vertices.foreach_get("co", vertex_co)
+    loop_vertices : np.ndarray = np.empty(loop_count, dtype = np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+
+    axis : np.ndarray = _axis_conversion[:3, :3].T.astype(np.float32)
+    attributes : dict[str, np.ndarray] = {"POSITION" : vertex_co.reshape(-1, 3)[loop_vertices] @ axis}
+
+    if options.export_normals:
+        attributes["NORMAL"] = _get_corner_normals(mesh, loop_count) @ axis
+
+    if options.export_uvs:
+        for i, uv_layer in enumerate(mesh.uv_layers):
+            uvs : np.ndarray = np.empty(loop_count * 2, dtype = np.float32)
+            uv_layer.data.foreach_get("uv", uvs)
+            uvs = uvs.reshape(-1, 2)
+            uvs[:, 1] = 1.0 - uvs[:, 1]
+            attributes["TEXCOORD_" + str(i)] = uvs
+
+    if options.export_colors:
+        color_attribute = _get_color_attribute(mesh)
+        if color_attribute is not None and color_attribute.domain in {'POINT', 'CORNER'}:
+            colors : np.ndarray = np.empty(len(color_attribute.data) * 4, dtype = np.float32)
+            color_attribute.data.foreach_get("color", colors)
+            colors = colors.reshape(-1, 4)
+            attributes["COLOR_0"] = colors[loop_vertices] if color_attribute.domain == 'POINT' else colors
+
+    return attributes
+
+def _weld(attributes : dict[str, np.ndarray], indices : np.ndarray) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """Merges face corners that share every attribute value into one vertex."""
+    names : list[str] = list(attributes.keys())
+    combined : np.ndarray = np.ascontiguousarray(np.hstack([attributes[name] for name in names]))
+    rows : np.ndarray = combined.view(np.dtype((np.void, combined.dtype.itemsize * combined.shape[1]))).ravel()
+    _, first, inverse = np.unique(rows, return_index = True, return_inverse = True)
+    welded : dict[str, np.ndarray] = {name : attributes[name][first] for name in names}
+    return welded, inverse.ravel().astype(np.uint32)[indices]
+
+def _to_gltf_matrix(matrix) -> list[float]:
+    """Converts a Blender matrix to a column major glTF matrix."""
+    converted : np.ndarray = _axis_conversion @ np.array(matrix, dtype = np.float64) @ _axis_conversion.T
+    return converted.T.ravel().tolist()
+
+def _get_material(material : bpy.types.Material | None,
+                  materials : list[dict],
+                  material_indices : dict[str, int]) -> int | None:
+    if material is None:
+        return None
+    if material.name not in material_indices:
+        materials.append({"name" : material.name,
+                          "pbrMetallicRoughness" : {"baseColorFactor" : list(material.diffuse_color),
+                                                    "metallicFactor" : material.metallic,
+                                                    "roughnessFactor" : material.roughness}})
+        material_indices[material.name] = len(materials) - 1
+    return material_indices[material.name]
+
+def _write_mesh(o : bpy.types.Object,
+                mesh : bpy.types.Mesh,
+                chunk : _BinaryChunk,
+                materials : list[dict],
+                material_indices : dict[str, int],
+                options : GLBExportOptions) -> dict | None:
+    """Streams the mesh of `o` into the binary chunk and returns its glTF mesh description."""
+    mesh.calc_loop_triangles()
+    triangle_count : int = len(mesh.loop_triangles)
+    if triangle_count == 0:
+        return None
+
+    indices : np.ndarray = np.empty(triangle_count * 3, dtype = np.int32)
+    mesh.loop_triangles.foreach_get("loops", indices)
+    triangle_materials : np.ndarray = np.empty(triangle_count, dtype = np.int32)
+    mesh.loop_triangles.foreach_get("material_index", triangle_materials)
+
+    attributes : dict[str, np.ndarray] = _read_loop_attributes(mesh, options)
+    if options.weld_vertices:
+        attributes, indices = _weld(attributes, indices)
+    else:
+        indices = indices.astype(np.uint32)
+
+    attribute_accessors : dict[str, int] = {}
+    for name, values in attributes.items():
+        attribute_accessors[name] = chunk.add_accessor(values.astype(np.float32),
+                                                       values.shape[1],
+                                                       _target_array_buffer,
+                                                       min_max = name == "POSITION")
+
+    # One primitive per material index
+    order : np.ndarray = np.argsort(triangle_materials, kind = 'stable')
+    sorted_materials : np.ndarray = triangle_materials[order]
+    triangles : np.ndarray = indices.reshape(-1, 3)[order]
+    material_ids, starts = np.unique(sorted_materials, return_index = True)
+    ends : list[int] = starts[1:].tolist() + [triangle_count]
+
+    primitives : list[dict] = []
+    for material_id, start, end in zip(material_ids.tolist(), starts.tolist(), ends):
+        primitive : dict = {"attributes" : attribute_accessors,
+                            "indices" : chunk.add_accessor(triangles[start:end].ravel(), 1, _target_element_array_buffer),
+                            "mode" : 4}
+        if material_id < len(o.material_slots):
+            material_index : int | None = _get_material(o.material_slots[material_id].material, materials, material_indices)
+            if material_index is not None:
+                primitive["material"] = material_index
+        primitives.append(primitive)
+
+    return {"name" : mesh.name, "primitives" : primitives}
+
+def export_glb_file(file_path : str,
+                    objects : list[bpy.types.Object] | tuple[bpy.types.Object],
+                    options : GLBExportOptions = GLBExportOptions()) -> None:
+    """Exports `objects` as a glTF binary file.\n
+    Parent and child relationships are kept between the exported objects."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    chunk : _BinaryChunk = _BinaryChunk()
+    nodes : list[dict] = []
+    meshes : list[dict] = []
+    materials : list[dict] = []
+    material_indices : dict[str, int] = {}
+
+    objects = [o for o in objects if o.type in _mesh_object_types or o.type == 'EMPTY']
+    node_indices : dict[bpy.types.Object, int] = {o : i for i, o in enumerate(objects)}
+    children_map : dict[bpy.types.Object, list[bpy.types.Object]] = common.get_children_map(objects)  # Only exported children
+
+    try:
+        for o in objects:
+            node : dict = {"name" : o.name}
+            if o.parent in node_indices:
+                node["matrix"] = _to_gltf_matrix(o.parent.matrix_world.inverted() @ o.matrix_world)
+            else:
+                node["matrix"] = _to_gltf_matrix(o.matrix_world)
+            children : list[int] = [node_indices[ch_obj] for ch_obj in children_map.get(o, ())]
+            if children:
+                node["children"] = children
+
+            if o.type in _mesh_object_types:
+                source : bpy.types.Object = o.evaluated_get(depsgraph) if options.apply_modifiers else o
+                mesh : bpy.types.Mesh | None = source.to_mesh()
+                if mesh is not None:
+                    try:
+                        mesh_entry : dict | None = _write_mesh(o, mesh, chunk, materials, material_indices, options)
+                    finally:
+                        source.to_mesh_clear()
+                    if mesh_entry is not None:
+                        meshes.append(mesh_entry)
+                        node["mesh"] = len(meshes) - 1
+            nodes.append(node)
+
+        gltf : dict = {"asset" : {"version" : "2.0", "generator" : "AB Blender Utilities"},
+                       "scene" : 0,
+                       "scenes" : [{"nodes" : [node_indices[o] for o in objects if o.parent not in node_indices]}],
+                       "nodes" : nodes}
+        if meshes:
+            gltf["meshes"] = meshes
+        if materials:
+            gltf["materials"] = materials
+        if chunk.length > 0:
+            gltf["buffers"] = [{"byteLength" : chunk.length}]
+            gltf["bufferViews"] = chunk.buffer_views
+            gltf["accessors"] = chunk.accessors
+
+        json_data : bytes = json.dumps(gltf, separators = (",", ":")).encode('utf8')
+        json_data += b" " * ((4 - len(json_data) % 4) % 4)
+        bin_chunk_size : int = 8 + chunk.length if chunk.length > 0 else 0
+        total_length : int = 12 + 8 + len(json_data) + bin_chunk_size
+
+        with open(file_path, 'wb') as file_handle:
+            file_handle.write(struct.pack("<III", _glb_magic, _glb_version, total_length))
+            file_handle.write(struct.pack("<II", len(json_data), _chunk_json))
+            file_handle.write(json_data)
+            if chunk.length > 0:
+                file_handle.write(struct.pack("<II", chunk.length, _chunk_bin))
+                chunk.file_handle.seek(0)
+                shutil.copyfileobj(chunk.file_handle, file_handle)
+    finally:
+        chunk.close()
@@ -0,0 +1,91 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Decimated LOD meshes cached across exports.\n
+LOD meshes are stored in `bpy.data.meshes` with a fake user and a key made of the source geometry hash
+and the decimation ratio, so they are saved with the .blend file and reused while the source is unchanged.
+"""
+import bpy
+
+from typing import Final
+from .mesh_hash import GeometryHashCache
+
+
+lod_key_property : Final[str] = "abbu_lod_key"
+_lod_mesh_prefix : Final[str] = "ABBU_LOD_"
+
+
+def parse_lod_ratios(value : str) -> tuple[float]:
+    """Parses comma separated decimation ratios, e.g. "0.5, 0.25, 0.125".\n
+    Values outside of the 0-1 range and values that are not numbers are ignored."""
+    ratios : list[float] = []
+    for x in value.split(","):
+        try:
+            ratio : float = float(x)
+        except ValueError:
+            continue
+        if 0.0 < ratio < 1.0:
+            ratios.append(ratio)
+    return tuple(ratios)
+
+def get_lod_name(name : str, lod_index : int) -> str:
+    return name + "_LOD" + str(lod_index)
+
+def clear_lod_cache() -> int:
+    """Removes all cached LOD meshes that are not used by an object.\n
+    Returns the number of removed meshes."""
+    meshes : list[bpy.types.Mesh] = [x for x in bpy.data.meshes if lod_key_property in x and x.users <= 1]
+    for mesh in meshes:
+        bpy.data.meshes.remove(mesh)
+    return len(meshes)
+
+class LODCache():
+    def __init__(self, hash_cache : GeometryHashCache):
+        self.hash_cache : GeometryHashCache = hash_cache
+        self.meshes : dict[str, bpy.types.Mesh] = {x[lod_key_property] : x for x in bpy.data.meshes if lod_key_property in x}
+        self.hit_count : int = 0
+        self.miss_count : int = 0
+
+    def __generate(self, o : bpy.types.Object, ratio : float) -> bpy.types.Mesh:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        base_mesh : bpy.types.Mesh = bpy.data.meshes.new_from_object(o.evaluated_get(depsgraph))
+        temp_object : bpy.types.Object = bpy.data.objects.new(_lod_mesh_prefix + "Temp", base_mesh)
+        bpy.context.scene.collection.objects.link(temp_object)  # Only objects in the scene are evaluated
+        try:
+            modifier = temp_object.modifiers.new("Decimate", 'DECIMATE')
+            modifier.ratio = ratio
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            return bpy.data.meshes.new_from_object(temp_object.evaluated_get(depsgraph))
+        finally:
+            bpy.data.objects.remove(temp_object)
+            bpy.data.meshes.remove(base_mesh)
+
+    def get_lod_mesh(self, o : bpy.types.Object, ratio : float) -> bpy.types.Mesh:
+        """Returns the evaluated mesh of `o` decimated by `ratio`, generating it on a cache miss."""
+        key : str = self.hash_cache.get_object_digest(o).hex() + "_" + format(ratio, ".4f")
+        mesh : bpy.types.Mesh | None = self.meshes.get(key)
+        if mesh is not None:
+            self.hit_count += 1
+            return mesh
+
+        self.miss_count += 1
+        mesh = self.__generate(o, ratio)
+        mesh.name = _lod_mesh_prefix + o.data.name + "_" + format(ratio, ".3f")
+        mesh[lod_key_property] = key
+        mesh.use_fake_user = True
+        self.meshes[key] = mesh
+        return mesh
@@ -0,0 +1,113 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Geometry hashes of export roots.\n
+An export is hashed from the evaluated meshes, materials and relative transforms of its objects,
+so copies of a root hash the same regardless of object names. Meshes of objects without modifiers
+are hashed once per data block, which makes linked duplicates cheap.
+"""
+import bpy
+
+import hashlib
+import numpy as np
+from typing import Final
+
+
+_mesh_object_types : Final[frozenset[str]] = frozenset(('MESH', 'CURVE', 'SURFACE', 'FONT', 'META'))
+_matrix_decimals : Final[int] = 5
+
+
+def _get_array(collection, attribute : str, dtype, component_count : int = 1) -> np.ndarray:
+    array : np.ndarray = np.empty(len(collection) * component_count, dtype = dtype)
+    collection.foreach_get(attribute, array)
+    return array
+
+def _hash_mesh(hasher, mesh : bpy.types.Mesh) -> None:
+    """Hashes everything of `mesh` that ends up in an export.\n
+    Edges are included for loose edges and sharp edges. Custom split normals are only hashed if the mesh has them,
+    as other normals follow from the geometry and the shading flags."""
+    hasher.update(_get_array(mesh.vertices, "co", np.float32, 3).tobytes())
+    hasher.update(_get_array(mesh.edges, "vertices", np.int32, 2).tobytes())
+    hasher.update(_get_array(mesh.edges, "use_edge_sharp", bool).tobytes())
+    hasher.update(_get_array(mesh.loops, "vertex_index", np.int32).tobytes())
+    hasher.update(_get_array(mesh.polygons, "loop_total", np.int32).tobytes())
+    hasher.update(_get_array(mesh.polygons, "material_index", np.int32).tobytes())
+    hasher.update(_get_array(mesh.polygons, "use_smooth", bool).tobytes())
+    if mesh.has_custom_normals:
+        hasher.update(b"custom_normals")
+        if hasattr(mesh, "corner_normals"):  # Blender 4.1+
+            hasher.update(_get_array(mesh.corner_normals, "vector", np.float32, 3).tobytes())
+        else:
+            mesh.calc_normals_split()
+            hasher.update(_get_array(mesh.loops, "normal", np.float32, 3).tobytes())
+    for uv_layer in mesh.uv_layers:
+        hasher.update(uv_layer.name.encode('utf8'))
+        hasher.update(_get_array(uv_layer.data, "uv", np.float32, 2).tobytes())
+    for color_attribute in mesh.color_attributes:
+        hasher.update((color_attribute.name + ":" + color_attribute.domain).encode('utf8'))
+        hasher.update(_get_array(color_attribute.data, "color", np.float32, 4).tobytes())
+
+class GeometryHashCache():
+    """Caches object geometry digests for the duration of a batch.\n
+    Objects are expected not to change while the cache is in use."""
+    def __init__(self):
+        self.data_digests : dict[int, bytes] = {}  # Data `session_uid` -> digest
+        self.object_digests : dict[int, bytes] = {}  # Object `session_uid` -> digest
+
+    def get_object_digest(self, o : bpy.types.Object) -> bytes:
+        """Returns the digest of the evaluated geometry and materials of `o`."""
+        if o.session_uid in self.object_digests:
+            return self.object_digests[o.session_uid]
+        shares_data : bool = o.data is not None and len(o.modifiers) == 0
+        if shares_data and o.data.session_uid in self.data_digests:
+            self.object_digests[o.session_uid] = self.data_digests[o.data.session_uid]
+            return self.data_digests[o.data.session_uid]
+
+        hasher = hashlib.sha1(o.type.encode('utf8'))
+        for slot in o.material_slots:
+            hasher.update(slot.material.name.encode('utf8') if slot.material is not None else b"\x00")
+        if o.type in _mesh_object_types:
+            evaluated_object : bpy.types.Object = o.evaluated_get(bpy.context.evaluated_depsgraph_get())
+            mesh : bpy.types.Mesh | None = evaluated_object.to_mesh()
+            try:
+                if mesh is not None:
+                    _hash_mesh(hasher, mesh)
+            finally:
+                evaluated_object.to_mesh_clear()
+        elif o.data is not None:
+            hasher.update(o.data.name.encode('utf8'))
+
+        digest : bytes = hasher.digest()
+        if shares_data:
+            self.data_digests[o.data.session_uid] = digest
+        self.object_digests[o.session_uid] = digest
+        return digest
+
+    def get_export_digest(self, root : bpy.types.Object, objects) -> str:
+        """Returns the geometry hash of an export of `root` that includes `objects`.\n
+        Objects are hashed with their transforms relative to `root`, and the order of `objects` is ignored.
+        The scale of `root` is included, as quick export keeps it."""
+        root_inverse = root.matrix_world.inverted_safe()
+        object_digests : list[bytes] = []
+        for o in objects:
+            matrix : np.ndarray = np.round(np.array(root_inverse @ o.matrix_world, dtype = np.float64), _matrix_decimals) + 0.0
+            object_digests.append(self.get_object_digest(o) + matrix.tobytes())
+
+        hasher = hashlib.sha1(np.round(np.array(root.scale, dtype = np.float64), _matrix_decimals).tobytes())
+        for object_digest in sorted(object_digests):
+            hasher.update(object_digest)
+        return hasher.hexdigest()
@@ -0,0 +1,148 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Merges the meshes of many objects into one mesh without `bpy.ops.object.join`.\n
+Vertices, loops, polygons, UVs, color attributes and material indices are read with `foreach_get`,
+transformed into the space of a root object with NumPy and written to a new mesh with `foreach_set`.
+Custom split normals, vertex groups and shape keys are not transferred.
+"""
+import bpy
+
+import numpy as np
+from typing import Final, NamedTuple
+
+
+_mesh_object_types : Final[frozenset[str]] = frozenset(('MESH', 'CURVE', 'SURFACE', 'FONT', 'META'))
+_max_uv_layers : Final[int] = 8
+
+
+class _MeshPart(NamedTuple):
+    co : np.ndarray  # (n, 3) in root space
+    vertex_indices : np.ndarray
+    loop_starts : np.ndarray
+    material_indices : np.ndarray  # Indices into the merged material list
+    smooth : np.ndarray
+    uvs : dict[str, np.ndarray]  # Name -> (loop count, 2)
+    colors : dict[str, np.ndarray]  # Name -> (loop count, 4), always in the corner domain
+
+def _get_array(collection, attribute : str, dtype, component_count : int = 1) -> np.ndarray:
+    array : np.ndarray = np.empty(len(collection) * component_count, dtype = dtype)
+    collection.foreach_get(attribute, array)
+    return array.reshape(-1, component_count) if component_count > 1 else array
+
+def _get_reversed_loop_order(loop_starts : np.ndarray, loop_totals : np.ndarray) -> np.ndarray:
+    """Returns the loop order that reverses the winding of every polygon, used for mirrored objects."""
+    polygon_indices : np.ndarray = np.repeat(np.arange(len(loop_starts)), loop_totals)
+    loop_indices : np.ndarray = np.arange(len(polygon_indices))
+    return 2 * loop_starts[polygon_indices] + loop_totals[polygon_indices] - 1 - loop_indices
+
+def _read_part(mesh : bpy.types.Mesh,
+               matrix : np.ndarray,
+               slot_material_indices : np.ndarray) -> _MeshPart:
+    co : np.ndarray = _get_array(mesh.vertices, "co", np.float32, 3).astype(np.float64)
+    co = co @ matrix[:3, :3].T + matrix[:3, 3]
+    vertex_indices : np.ndarray = _get_array(mesh.loops, "vertex_index", np.int32)
+    loop_starts : np.ndarray = _get_array(mesh.polygons, "loop_start", np.int32)
+    loop_totals : np.ndarray = _get_array(mesh.polygons, "loop_total", np.int32)
+    material_indices : np.ndarray = _get_array(mesh.polygons, "material_index", np.int32)
+    material_indices = slot_material_indices[np.clip(material_indices, 0, len(slot_material_indices) - 1)]
+    smooth : np.ndarray = _get_array(mesh.polygons, "use_smooth", bool)
+
+    uvs : dict[str, np.ndarray] = {x.name : _get_array(x.data, "uv", np.float32, 2) for x in mesh.uv_layers}
+    colors : dict[str, np.ndarray] = {}
+    for attribute in mesh.color_attributes:
+        if attribute.domain == 'POINT':
+            colors[attribute.name] = _get_array(attribute.data, "color", np.float32, 4)[vertex_indices]
+        elif attribute.domain == 'CORNER':
+            colors[attribute.name] = _get_array(attribute.data, "color", np.float32, 4)
+
+    if np.linalg.det(matrix[:3, :3]) < 0.0:  # Mirrored, the winding order is flipped to keep normals outside
+        loop_order : np.ndarray = _get_reversed_loop_order(loop_starts, loop_totals)
+        vertex_indices = vertex_indices[loop_order]
+        uvs = {name : x[loop_order] for name, x in uvs.items()}
+        colors = {name : x[loop_order] for name, x in colors.items()}
+
+    return _MeshPart(co, vertex_indices, loop_starts, material_indices, smooth, uvs, colors)
+
+def build_merged_mesh(name : str,
+                      root : bpy.types.Object,
+                      objects : list[bpy.types.Object] | tuple[bpy.types.Object],
+                      apply_modifiers : bool = True) -> bpy.types.Mesh:
+    """Creates a new mesh from the geometry of `objects` in the local space of `root`.\n
+    Materials are merged by slot, and UV layers and color attributes are merged by name.
+    Objects without a UV layer or color attribute of a name get zero UVs and white colors."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    root_inverse : np.ndarray = np.array(root.matrix_world.inverted_safe(), dtype = np.float64)
+    materials : list[bpy.types.Material | None] = []
+    material_indices : dict[bpy.types.Material | None, int] = {}
+    parts : list[_MeshPart] = []
+
+    for o in objects:
+        if o.type not in _mesh_object_types:
+            continue
+        slot_materials : list[bpy.types.Material | None] = [x.material for x in o.material_slots] or [None]
+        for material in slot_materials:
+            if material not in material_indices:
+                material_indices[material] = len(materials)
+                materials.append(material)
+        slot_material_indices : np.ndarray = np.array([material_indices[x] for x in slot_materials], dtype = np.int32)
+
+        source : bpy.types.Object = o.evaluated_get(depsgraph) if apply_modifiers else o
+        mesh : bpy.types.Mesh | None = source.to_mesh()
+        if mesh is None:
+            continue
+        try:
+            matrix : np.ndarray = root_inverse @ np.array(o.matrix_world, dtype = np.float64)
+            parts.append(_read_part(mesh, matrix, slot_material_indices))
+        finally:
+            source.to_mesh_clear()
+
+    uv_names : list[str] = list(dict.fromkeys(name for x in parts for name in x.uvs))[:_max_uv_layers]
+    color_names : list[str] = list(dict.fromkeys(name for x in parts for name in x.colors))
+
+    vertex_offsets : np.ndarray = np.cumsum([0] + [len(x.co) for x in parts])
+    loop_offsets : np.ndarray = np.cumsum([0] + [len(x.vertex_indices) for x in parts])
+    merged = bpy.data.meshes.new(name)
+    if not parts:
+        return merged
+
+    co : np.ndarray = np.concatenate([x.co for x in parts]).astype(np.float32)
+    vertex_indices : np.ndarray = np.concatenate([x.vertex_indices + vertex_offsets[i] for i, x in enumerate(parts)]).astype(np.int32)
+    loop_starts : np.ndarray = np.concatenate([x.loop_starts + loop_offsets[i] for i, x in enumerate(parts)]).astype(np.int32)
+
+    merged.vertices.add(len(co))
+    merged.vertices.foreach_set("co", co.ravel())
+    merged.loops.add(len(vertex_indices))
+    merged.loops.foreach_set("vertex_index", vertex_indices)
+    merged.polygons.add(len(loop_starts))
+    merged.polygons.foreach_set("loop_start", loop_starts)
+    merged.polygons.foreach_set("material_index", np.concatenate([x.material_indices for x in parts]).astype(np.int32))
+    merged.polygons.foreach_set("use_smooth", np.concatenate([x.smooth for x in parts]))
+
+    for uv_name in uv_names:
+        uv_layer = merged.uv_layers.new(name = uv_name)
+        uv_layer.data.foreach_set("uv", np.concatenate([x.uvs.get(uv_name, np.zeros((len(x.vertex_indices), 2), np.float32))
+                                                        for x in parts]).ravel())
+    for color_name in color_names:
+        attribute = merged.color_attributes.new(color_name, 'FLOAT_COLOR', 'CORNER')
+        attribute.data.foreach_set("color", np.concatenate([x.colors.get(color_name, np.ones((len(x.vertex_indices), 4), np.float32))
+                                                            for x in parts]).ravel())
+
+    for material in materials:
+        merged.materials.append(material)
+    merged.update(calc_edges = True)
+    return merged
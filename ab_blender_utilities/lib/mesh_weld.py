@@ -0,0 +1,220 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Merges vertices within a distance of each other without entering edit mode.\n
+Vertices are bucketed by a spatial hash of their grid cell, candidate pairs are found with a sorted search
+over the 27 neighbouring cells of every vertex, and clusters are labelled by propagating the lowest vertex index.
+Each mesh is then rebuilt once with `foreach_set`.\n
+Point, corner and face attributes are kept. Edge attributes and seams are kept for edges that still exist,
+including loose edges.
+Meshes with shape keys, vertex group weights or custom split normals are not supported.
+"""
+import bpy
+
+import numpy as np
+from typing import Final
+
+
+_neighbour_offsets : Final[np.ndarray] = np.array([(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)], dtype = np.int64)
+_hash_primes : Final[np.ndarray] = np.array((73856093, 19349663, 83492791), dtype = np.int64)
+
+# Attribute data type -> (`foreach_get` property, component count, dtype)
+_attribute_formats : Final[dict[str, tuple[str, int, type]]] = {'FLOAT' : ("value", 1, np.float32),
+                                                               'INT' : ("value", 1, np.int32),
+                                                               'INT8' : ("value", 1, np.int32),
+                                                               'BOOLEAN' : ("value", 1, bool),
+                                                               'FLOAT2' : ("vector", 2, np.float32),
+                                                               'INT32_2D' : ("value", 2, np.int32),
+                                                               'FLOAT_VECTOR' : ("vector", 3, np.float32),
+                                                               'FLOAT_COLOR' : ("color", 4, np.float32),
+                                                               'BYTE_COLOR' : ("color", 4, np.float32),
+                                                               'QUATERNION' : ("value", 4, np.float32)}
+
+
+def _hash_cells(cells : np.ndarray) -> np.ndarray:
+    return np.bitwise_xor.reduce(cells * _hash_primes, axis = 1)  # Collisions only add candidates
+
+def get_vertex_clusters(co : np.ndarray, distance : float) -> np.ndarray:
+    """Returns a cluster label for every vertex of `co`, the lowest vertex index of its cluster.\n
+    Vertices are in the same cluster if they are connected by a chain of vertices within `distance`."""
+    vertex_count : int = len(co)
+    labels : np.ndarray = np.arange(vertex_count)
+    if vertex_count < 2:
+        return labels
+
+    cells : np.ndarray = np.floor(co / max(distance, 1e-12)).astype(np.int64)
+    order : np.ndarray = np.argsort(_hash_cells(cells), kind = 'stable')
+    sorted_keys : np.ndarray = _hash_cells(cells)[order]
+    squared_distance : float = distance * distance
+
+    first_indices : list[np.ndarray] = []
+    second_indices : list[np.ndarray] = []
+    for offset in _neighbour_offsets:
+        neighbour_keys : np.ndarray = _hash_cells(cells + offset)
+        lower : np.ndarray = np.searchsorted(sorted_keys, neighbour_keys, side = 'left')
+        counts : np.ndarray = np.searchsorted(sorted_keys, neighbour_keys, side = 'right') - lower
+        total : int = int(counts.sum())
+        if total == 0:
+            continue
+        first : np.ndarray = np.repeat(labels, counts)
+        run_starts : np.ndarray = np.repeat(np.cumsum(counts) - counts, counts)
+        second : np.ndarray = order[np.repeat(lower, counts) + np.arange(total) - run_starts]
+        mask : np.ndarray = second > first
+        first, second = first[mask], second[mask]
+        mask = np.einsum('ij,ij->i', co[first] - co[second], co[first] - co[second]) <= squared_distance
+        first_indices.append(first[mask])
+        second_indices.append(second[mask])
+
+    if not first_indices:
+        return labels
+    first = np.concatenate(first_indices)
+    second = np.concatenate(second_indices)
+    if len(first) == 0:
+        return labels
+
+    labels = labels.copy()
+    while True:
+        minimum : np.ndarray = np.minimum(labels[first], labels[second])
+        if np.array_equal(minimum, labels[first]) and np.array_equal(minimum, labels[second]):
+            break
+        np.minimum.at(labels, first, minimum)
+        np.minimum.at(labels, second, minimum)
+        labels = labels[labels]  # Pointer jumping shortens long chains
+    return labels
+
+def _get_attribute_data(attribute) -> np.ndarray:
+    key, component_count, dtype = _attribute_formats[attribute.data_type]
+    data : np.ndarray = np.empty(len(attribute.data) * component_count, dtype = dtype)
+    attribute.data.foreach_get(key, data)
+    return data.reshape(-1, component_count) if component_count > 1 else data
+
+def _get_edge_keys(edge_vertices : np.ndarray, vertex_count : int) -> np.ndarray:
+    edge_vertices = np.sort(edge_vertices, axis = 1).astype(np.int64)
+    return edge_vertices[:, 0] * vertex_count + edge_vertices[:, 1]
+
+def is_supported(mesh : bpy.types.Mesh, users) -> bool:
+    """Returns `False` for meshes that would lose information when they are rebuilt.\n
+    `users` should be every object that uses `mesh`, as deform weights are kept for any object with vertex groups."""
+    return mesh.shape_keys is None and not mesh.has_custom_normals and all(len(o.vertex_groups) == 0 for o in users)
+
+def weld_mesh(mesh : bpy.types.Mesh, distance : float) -> int:
+    """Merges the vertices of `mesh` that are within `distance` and rebuilds the mesh.\n
+    Polygons that collapse to less than 3 vertices and edges that collapse to a single vertex are removed.
+    Other degenerate polygons, e.g. ones using the same vertex twice, are removed by `Mesh.validate`.
+    Returns the number of removed vertices."""
+    vertex_count : int = len(mesh.vertices)
+    co : np.ndarray = np.empty(vertex_count * 3, dtype = np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    representatives, remap = np.unique(get_vertex_clusters(co.astype(np.float64), distance), return_inverse = True)
+    if len(representatives) == vertex_count:
+        return 0
+
+    loop_count : int = len(mesh.loops)
+    polygon_count : int = len(mesh.polygons)
+    vertex_indices : np.ndarray = np.empty(loop_count, dtype = np.int32)
+    mesh.loops.foreach_get("vertex_index", vertex_indices)
+    vertex_indices = remap[vertex_indices]
+    loop_starts : np.ndarray = np.empty(polygon_count, dtype = np.int32)
+    loop_totals : np.ndarray = np.empty(polygon_count, dtype = np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+
+    # Corners followed by a corner of the same vertex collapse
+    polygon_indices : np.ndarray = np.repeat(np.arange(polygon_count), loop_totals)
+    next_loops : np.ndarray = np.arange(1, loop_count + 1)
+    next_loops[loop_starts + loop_totals - 1] = loop_starts
+    keep_loops : np.ndarray = vertex_indices != vertex_indices[next_loops]
+    new_totals : np.ndarray = np.bincount(polygon_indices, weights = keep_loops, minlength = polygon_count).astype(np.int32)
+    keep_polygons : np.ndarray = new_totals >= 3
+    keep_loops &= keep_polygons[polygon_indices]
+    kept_loops : np.ndarray = np.flatnonzero(keep_loops)
+    kept_polygons : np.ndarray = np.flatnonzero(keep_polygons)
+    new_totals = new_totals[kept_polygons]
+    new_starts : np.ndarray = (np.cumsum(new_totals) - new_totals).astype(np.int32)
+
+    edge_vertices : np.ndarray = np.empty(len(mesh.edges) * 2, dtype = np.int32)
+    mesh.edges.foreach_get("vertices", edge_vertices)
+    old_edge_keys : np.ndarray = _get_edge_keys(remap[edge_vertices.reshape(-1, 2)], len(representatives))
+    # Remapped edges are added back before the polygon edges are calculated, so loose edges are kept
+    kept_edge_keys : np.ndarray = np.unique(old_edge_keys)
+    kept_edge_vertices : np.ndarray = np.stack(np.divmod(kept_edge_keys, len(representatives)), axis = 1).astype(np.int32)
+    kept_edge_vertices = kept_edge_vertices[kept_edge_vertices[:, 0] != kept_edge_vertices[:, 1]]
+    seams : np.ndarray = np.empty(len(mesh.edges), dtype = bool)
+    mesh.edges.foreach_get("use_seam", seams)
+
+    attributes : list[tuple[str, str, str, np.ndarray]] = []
+    for attribute in mesh.attributes:
+        if attribute.name.startswith(".") or attribute.name == "position" or attribute.data_type not in _attribute_formats:
+            continue
+        data : np.ndarray = _get_attribute_data(attribute)
+        if attribute.domain == 'POINT':
+            data = data[representatives]
+        elif attribute.domain == 'CORNER':
+            data = data[kept_loops]
+        elif attribute.domain == 'FACE':
+            data = data[kept_polygons]
+        elif attribute.domain != 'EDGE':
+            continue
+        attributes.append((attribute.name, attribute.domain, attribute.data_type, data))
+    active_uv_name : str | None = mesh.uv_layers.active.name if mesh.uv_layers.active else None
+    active_color_name : str = mesh.color_attributes.active_color_name
+    default_color_name : str = mesh.color_attributes.default_color_name
+
+    mesh.clear_geometry()
+    mesh.vertices.add(len(representatives))
+    mesh.vertices.foreach_set("co", co[representatives].ravel())
+    mesh.loops.add(len(kept_loops))
+    mesh.loops.foreach_set("vertex_index", vertex_indices[kept_loops].astype(np.int32))
+    mesh.polygons.add(len(kept_polygons))
+    mesh.polygons.foreach_set("loop_start", new_starts)
+    mesh.edges.add(len(kept_edge_vertices))
+    mesh.edges.foreach_set("vertices", kept_edge_vertices.ravel())
+    for name, domain, data_type, data in attributes:
+        if domain == 'EDGE':
+            continue
+        attribute = mesh.attributes.get(name) or mesh.attributes.new(name, data_type, domain)
+        attribute.data.foreach_set(_attribute_formats[data_type][0], data.ravel())
+    mesh.update(calc_edges = True)
+    mesh.validate(clean_customdata = False)
+
+    # Edge data is copied from the old edges that connect the same merged vertices
+    if len(old_edge_keys) > 0:
+        new_edge_vertices : np.ndarray = np.empty(len(mesh.edges) * 2, dtype = np.int32)
+        mesh.edges.foreach_get("vertices", new_edge_vertices)
+        new_edge_keys : np.ndarray = _get_edge_keys(new_edge_vertices.reshape(-1, 2), len(representatives))
+        unique_keys, old_edge_indices = np.unique(old_edge_keys, return_index = True)
+        positions : np.ndarray = np.clip(np.searchsorted(unique_keys, new_edge_keys), 0, len(unique_keys) - 1)
+        source_edges : np.ndarray = old_edge_indices[positions]
+        found : np.ndarray = unique_keys[positions] == new_edge_keys
+        mesh.edges.foreach_set("use_seam", np.where(found, seams[source_edges], False))
+        for name, domain, data_type, data in attributes:
+            if domain != 'EDGE':
+                continue
+            attribute = mesh.attributes.get(name) or mesh.attributes.new(name, data_type, domain)
+            default : np.ndarray = np.zeros_like(data[:1])
+            values : np.ndarray = np.where(found.reshape((-1,) + (1,) * (data.ndim - 1)), data[source_edges], default)
+            attribute.data.foreach_set(_attribute_formats[data_type][0], values.ravel())
+
+    if active_uv_name in mesh.uv_layers:
+        mesh.uv_layers.active = mesh.uv_layers[active_uv_name]
+    if active_color_name in mesh.color_attributes:
+        mesh.color_attributes.active_color_name = active_color_name
+    if default_color_name in mesh.color_attributes:
+        mesh.color_attributes.default_color_name = default_color_name
+    mesh.update()
+    return vertex_count - len(representatives)
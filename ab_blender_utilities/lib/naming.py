@@ -17,54 +17,304 @@
 import bpy
 import re
 
-from typing import Final
-
-
-__exp_pattern : Final[str] = r'\$\w+\([^)]*\)'
-__exp_name : Final[str] = r'\$name\(\)'
-__exp_type : Final[str] = r'\$type\(\)'
-__exp_active : Final[str] = r'\$active\(\)'
-__exp_idx : Final[str] = r'\$idx\((.*?)\)'
-__exp_oidx : Final[str] = r'\$oidx\((.*?)\)'
-__exp_replace : Final[str] = r'\$replace\((.*?)\)'
-__pattern_brackets : Final[str] = r'\((.*?)\)'
-__pattern_replace_arg : Final[str] = r'\$replace\(\"([^"]+)\",\"([^"]+)\"\)'
-
-def object_name_custom_expr(o : bpy.types.Object, value : str, index_str : str) -> str | bool:
-    expression_find = re.finditer(__exp_pattern, value)
-    oidx_found : bool = False
-    expressions = []
-    for exp in expression_find:
-        expressions.append(value[exp.start():exp.end()])
-    for exp in expressions:
-        target_exp = re.escape(exp)
-        expression_match = re.search(target_exp, value)
-        # The existing name of the current object
-        if bool(re.search(__exp_name, value)):
-            value = value[:expression_match.start()] + o.name + value[expression_match.end():]
-        # Object type
-        elif bool(re.search(__exp_type, value)):
-            value = value[:expression_match.start()] + o.type + value[expression_match.end():]
-        # Active object
-        elif bool(re.search(__exp_active, value)):
-            if bpy.context.active_object == None:
-                continue
-            value = value[:expression_match.start()] + bpy.context.active_object.name + value[expression_match.end():]
-        # Index
-        elif bool(re.search(__exp_idx, value)):
-            padding = re.findall(__pattern_brackets, exp)[0]
-            index = index_str
-            if padding != '':
-                if padding.isnumeric():
-                    index = index.zfill(int(padding))
-            value = value[:expression_match.start()] + index + value[expression_match.end():]
-        # Index override
-        elif bool(re.search(__exp_oidx, value)):
-            oidx_found = True
-        # Replace words
-        elif bool(re.search(__exp_replace, value)):
-            words = re.findall(__pattern_replace_arg, exp.strip(" "))[0]
-            value = value[:expression_match.start()] + value[expression_match.end():]
-            value = value.replace(words[0], words[1])
-
-    return value, oidx_found
+from functools import lru_cache
+from typing import Final, NamedTuple
+
+
+max_name_length : Final[int] = 63  # Bytes, longer names are truncated by Blender
+__numeric_suffix : Final[re.Pattern] = re.compile(r'^(.*)\.(\d{3,})$')
+__temp_name_prefix : Final[str] = "\u2060abbu_rename_"
+
+# `ID.id_type` -> `bpy.data` collection name
+id_collection_names : Final[dict[str, str]] = {'OBJECT' : "objects",
+                                               'MESH' : "meshes",
+                                               'CURVE' : "curves",
+                                               'CURVES' : "hair_curves",
+                                               'LIGHT' : "lights",
+                                               'CAMERA' : "cameras",
+                                               'ARMATURE' : "armatures",
+                                               'LATTICE' : "lattices",
+                                               'GREASEPENCIL' : "grease_pencils",
+                                               'META' : "metaballs",
+                                               'SPEAKER' : "speakers",
+                                               'LIGHT_PROBE' : "lightprobes",
+                                               'VOLUME' : "volumes",
+                                               'POINTCLOUD' : "pointclouds",
+                                               'MATERIAL' : "materials",
+                                               'COLLECTION' : "collections"}
+
+__exp_pattern : Final[re.Pattern] = re.compile(r'\$(\w+)\(((?:"[^"]*"|[^)"])*)\)')
+__pattern_replace_arg : Final[re.Pattern] = re.compile(r'^\s*"([^"]+)"\s*,\s*"([^"]*)"\s*$')
+__pattern_match_arg : Final[re.Pattern] = re.compile(r'^\s*"([^"]*)"\s*(?:,\s*(\d+)\s*)?$')
+__pattern_prop_arg : Final[re.Pattern] = re.compile(r'^\s*"?([^"]*?)"?\s*$')
+__no_arg_functions : Final[tuple[str]] = ("name", "type", "active", "parent", "root", "collection", "material", "data")
+
+class _Token(NamedTuple):
+    function : str  # Empty for plain text
+    text : str  # Plain text, or the source of the expression
+    args : tuple
+
+class NameTemplate():
+    """A custom rename expression, parsed once and evaluated for every object.\n
+    Expressions: `$name()`, `$type()`, `$active()`, `$idx(<padding>)`, `$oidx(<padding>)`, `$pidx(<padding>)`,
+    `$parent()`, `$root()`, `$collection()`, `$material()`, `$data()`, `$prop("<key>")`, `$match("<regex>", <group>)`
+    and `$replace("<word1>","<word2>")`.
+    `$replace` applies to the text produced by everything left of it. Unknown expressions are kept as text.
+    Lookups over the whole file, like collection membership, are built once on first use."""
+    def __init__(self, template : str):
+        self.template : str = template
+        self.tokens : tuple[_Token] = _get_tokens(template)
+        self.uses_oidx : bool = any(x.function == "oidx" for x in self.tokens)
+        active_object : bpy.types.Object | None = bpy.context.active_object
+        self.active_name : str = active_object.name if active_object is not None else "None"
+        self._collection_names : dict[bpy.types.Object, str] | None = None
+        self._roots : dict[bpy.types.Object, bpy.types.Object] = {}
+        self._parent_counters : dict[bpy.types.Object | None, int] = {}
+        self._parent_indices : dict[bpy.types.Object, str] = {}
+
+    def _get_collection_name(self, o : bpy.types.Object) -> str:
+        """Returns the name of the first collection `o` is linked to.\n
+        `Object.users_collection` scans every collection, so all collections are indexed at once instead."""
+        if self._collection_names is None:
+            self._collection_names = {}
+            for collection in bpy.data.collections:
+                for collection_object in collection.objects:
+                    self._collection_names.setdefault(collection_object, collection.name)
+        return self._collection_names.get(o, "Scene Collection")
+
+    def _get_root(self, o : bpy.types.Object) -> bpy.types.Object:
+        """Returns the topmost parent of `o`, memoizing every object on the way."""
+        chain : list[bpy.types.Object] = []
+        root : bpy.types.Object = o
+        while root not in self._roots and root.parent is not None:
+            chain.append(root)
+            root = root.parent
+        root = self._roots.get(root, root)
+        for x in chain:
+            self._roots[x] = root
+        return root
+
+    def _get_parent_index(self, o : bpy.types.Object) -> str:
+        """Counts the objects that were evaluated with the same parent, starting at 1.\n
+        The index of an object is memoized, so every `$pidx` token of an object gets the same index."""
+        if o not in self._parent_indices:
+            index : int = self._parent_counters.get(o.parent, 0) + 1
+            self._parent_counters[o.parent] = index
+            self._parent_indices[o] = str(index)
+        return self._parent_indices[o]
+
+    def evaluate(self, o : bpy.types.Object, index_str : str) -> str:
+        parts : list[str] = []
+        for token in self.tokens:
+            if not token.function:
+                parts.append(token.text)
+            elif token.function == "name":
+                parts.append(o.name)
+            elif token.function == "type":
+                parts.append(o.type)
+            elif token.function == "active":
+                parts.append(self.active_name)
+            elif token.function in ("idx", "oidx"):
+                parts.append(index_str.zfill(int(token.args[0])) if token.args else index_str)
+            elif token.function == "pidx":
+                parent_index : str = self._get_parent_index(o)
+                parts.append(parent_index.zfill(int(token.args[0])) if token.args else parent_index)
+            elif token.function == "parent":
+                parts.append(o.parent.name if o.parent is not None else "")
+            elif token.function == "root":
+                parts.append(self._get_root(o).name)
+            elif token.function == "collection":
+                parts.append(self._get_collection_name(o))
+            elif token.function == "material":
+                material : bpy.types.Material | None = o.material_slots[0].material if len(o.material_slots) > 0 else None
+                parts.append(material.name if material is not None else "")
+            elif token.function == "data":
+                parts.append(o.data.name if o.data is not None else "")
+            elif token.function == "prop":
+                parts.append(str(o.get(token.args[0], "")))
+            elif token.function == "match":
+                match = token.args[0].search(o.name)
+                parts.append((match.group(token.args[1]) or "") if match is not None else "")
+            elif token.function == "replace":
+                parts = ["".join(parts).replace(token.args[0], token.args[1])]
+        return "".join(parts)
+
+def __parse_token(function : str, text : str, args : str) -> _Token:
+    args = args.strip()
+    if function in __no_arg_functions and args == "":
+        return _Token(function, text, ())
+    if function in ("idx", "oidx", "pidx"):
+        return _Token(function, text, (args,) if args.isnumeric() else ())
+    if function == "replace":
+        match = __pattern_replace_arg.match(args)
+        if match is not None:
+            return _Token(function, text, match.groups())
+    if function == "prop":
+        match = __pattern_prop_arg.match(args)
+        if match is not None and match.group(1):
+            return _Token(function, text, (match.group(1),))
+    if function == "match":
+        match = __pattern_match_arg.match(args)
+        if match is not None:
+            try:
+                pattern : re.Pattern = re.compile(match.group(1))
+            except re.error:
+                return _Token("", text, ())
+            group : int = int(match.group(2)) if match.group(2) else min(1, pattern.groups)
+            if group <= pattern.groups:
+                return _Token(function, text, (pattern, group))
+    return _Token("", text, ())
+
+def _parse(template : str) -> tuple[_Token]:
+    tokens : list[_Token] = []
+    position : int = 0
+    for match in __exp_pattern.finditer(template):
+        if match.start() > position:
+            tokens.append(_Token("", template[position:match.start()], ()))
+        tokens.append(__parse_token(match.group(1), match.group(0), match.group(2)))
+        position = match.end()
+    if position < len(template):
+        tokens.append(_Token("", template[position:], ()))
+    return tuple(tokens)
+
+@lru_cache(maxsize = 16)
+def _get_tokens(template : str) -> tuple[_Token]:
+    return _parse(template)
+
+def object_name_custom_expr(o : bpy.types.Object, value : str, index_str : str) -> tuple[str, bool]:
+    """Evaluates the custom expression `value` for `o`.\n
+    Returns the new name and whether `$oidx()` was used.
+    Operators renaming many objects should create one `NameTemplate` instead."""
+    template : NameTemplate = NameTemplate(value)
+    return template.evaluate(o, index_str), template.uses_oidx
+
+def __truncate(name : str, max_length : int) -> str:
+    """Truncates `name` to `max_length` UTF-8 bytes without splitting a character."""
+    encoded : bytes = name.encode('utf8')
+    if len(encoded) <= max_length:
+        return name
+    return encoded[:max_length].decode('utf8', errors = 'ignore')
+
+def get_unique_names(assignments : list[tuple[bpy.types.ID, str]], taken_names : set[str]) -> list[tuple[bpy.types.ID, str]]:
+    """Resolves the desired names of `assignments` against `taken_names` and against each other.\n
+    IDs whose current name is the desired name keep it. IDs whose current name is a numbered variant of the desired
+    name get the desired name when it is free and keep their numbered name otherwise. Other collisions get
+    the lowest free `.001` style suffix, like Blender would give them, but assignments are resolved in the order
+    of their desired and current names, so the result does not depend on the input order.
+    `taken_names` should hold the names of IDs that are not renamed and is updated with the resolved names."""
+    counters : dict[str, int] = {}  # Base name -> last number tried
+    resolved : list[tuple[bpy.types.ID, str]] = []
+    numbered : list[tuple[bpy.types.ID, str]] = []
+    pending : list[tuple[bpy.types.ID, str]] = []
+
+    # IDs that already have their desired name keep it
+    for id_block, name in assignments:
+        name = __truncate(name, max_name_length)
+        match = __numeric_suffix.match(id_block.name)
+        if id_block.name == name and name not in taken_names:
+            taken_names.add(name)
+            resolved.append((id_block, name))
+        elif match is not None and match.group(1) == name:
+            numbered.append((id_block, name))
+        else:
+            pending.append((id_block, name))
+
+    # Numbered variants, e.g. `Cube.001` for `Cube`, only keep their number if the desired name is taken
+    for id_block, name in sorted(numbered, key = lambda x : (x[1], x[0].name)):
+        if name not in taken_names:
+            taken_names.add(name)
+            resolved.append((id_block, name))
+        elif id_block.name not in taken_names:
+            taken_names.add(id_block.name)
+            resolved.append((id_block, id_block.name))
+        else:
+            pending.append((id_block, name))
+
+    for id_block, name in sorted(pending, key = lambda x : (x[1], x[0].name)):
+        if name in taken_names:
+            match = __numeric_suffix.match(name)
+            base : str = match.group(1) if match else name
+            number : int = counters.get(base, 0)
+            while True:
+                number += 1
+                suffix : str = "." + str(number).zfill(3)
+                name = __truncate(base, max_name_length - len(suffix)) + suffix
+                if name not in taken_names:
+                    break
+            counters[base] = number
+        taken_names.add(name)
+        resolved.append((id_block, name))
+    return resolved
+
+def get_synced_names(user_names : dict[bpy.types.ID, list[str]], include_shared : bool = False) -> list[tuple[bpy.types.ID, str]]:
+    """Decides one target name per ID from the names its users want to give it.\n
+    The first name in sort order is used. IDs that are shared, by several indexed users or by users outside the index,
+    are skipped unless `include_shared` is `True`. IDs that already have their target name are skipped."""
+    assignments : list[tuple[bpy.types.ID, str]] = []
+    for id_block, names in user_names.items():
+        is_shared : bool = len(names) > 1 or id_block.users - int(id_block.use_fake_user) > len(names)
+        if is_shared and not include_shared:
+            continue
+        name : str = min(names)
+        if id_block.name != name:
+            assignments.append((id_block, name))
+    return assignments
+
+def get_data_user_names(objects, include_materials : bool = False) -> dict[bpy.types.ID, list[str]]:
+    """Indexes the data blocks of `objects` with the names their objects give them, in one pass.\n
+    Object data is named after its object. With `include_materials`, materials are named after the object as well,
+    with a `_<slot>` suffix for objects that have several material slots."""
+    user_names : dict[bpy.types.ID, list[str]] = {}
+    for o in objects:
+        if o.data is not None:
+            user_names.setdefault(o.data, []).append(o.name)
+        if include_materials:
+            slot_count : int = len(o.material_slots)
+            for i, slot in enumerate(o.material_slots):
+                if slot.material is not None:
+                    user_names.setdefault(slot.material, []).append(o.name if slot_count == 1 else o.name + "_" + str(i + 1).zfill(2))
+    return user_names
+
+def sync_data_names(objects, include_shared : bool = False, include_materials : bool = False) -> list[tuple[bpy.types.ID, str]]:
+    """Renames the data, and optionally the materials, of `objects` after the objects in one `bulk_rename` batch.\n
+    Shared data is named after its first user in sort order if `include_shared` is `True`, and skipped otherwise.
+    Returns the resolved assignments."""
+    return bulk_rename(get_synced_names(get_data_user_names(objects, include_materials), include_shared))
+
+def get_collision_count(assignments : list[tuple[bpy.types.ID, str]]) -> int:
+    """Returns how many of `assignments` would not get their desired name from `bulk_rename`."""
+    renamed : set[bpy.types.ID] = {x[0] for x in assignments}
+    taken_names : set[str] = set()
+    for id_type in {x[0].id_type for x in assignments}:
+        collection_name : str | None = id_collection_names.get(id_type)
+        if collection_name:
+            taken_names.update(x.name for x in getattr(bpy.data, collection_name) if x not in renamed)
+    desired_names : dict[bpy.types.ID, str] = {id_block : __truncate(name, max_name_length) for id_block, name in assignments}
+    return sum(1 for id_block, name in get_unique_names(list(desired_names.items()), taken_names) if name != desired_names[id_block])
+
+def bulk_rename(assignments : list[tuple[bpy.types.ID, str]]) -> list[tuple[bpy.types.ID, str]]:
+    """Renames many IDs with predictable results.\n
+    Final names are computed up front with `get_unique_names`. Only IDs whose final name is held by another renamed ID,
+    like swapped or chained names, are given temporary names first, so they do not collide while they are assigned.
+    Other IDs are renamed directly. Returns the resolved assignments."""
+    assignments_by_type : dict[str, dict[bpy.types.ID, str]] = {}
+    for id_block, name in assignments:
+        assignments_by_type.setdefault(id_block.id_type, {})[id_block] = name  # The last assignment of an ID wins
+
+    resolved : list[tuple[bpy.types.ID, str]] = []
+    for id_type, id_names in assignments_by_type.items():
+        renamed : set[bpy.types.ID] = set(id_names.keys())
+        collection_name : str | None = id_collection_names.get(id_type)
+        taken_names : set[str] = {x.name for x in getattr(bpy.data, collection_name) if x not in renamed} if collection_name else set()
+        resolved += [x for x in get_unique_names(list(id_names.items()), taken_names) if x[0].name != x[1]]
+
+    held_names : set[tuple[str, str]] = {(id_block.id_type, id_block.name) for id_block, _ in resolved}
+    blocked : list[tuple[bpy.types.ID, str]] = [x for x in resolved if (x[0].id_type, x[1]) in held_names]
+    for i, (id_block, _) in enumerate(blocked):
+        id_block.name = __temp_name_prefix + str(i)  # Frees the names the other renamed IDs need
+    for id_block, name in resolved:
+        if (id_block.id_type, name) not in held_names:
+            id_block.name = name
+    for id_block, name in blocked:  # Their names were freed by the loops above
+        id_block.name = name
+    return resolved
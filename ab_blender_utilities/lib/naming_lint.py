@@ -0,0 +1,219 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Scene-wide naming lint.\n
+Rules are compiled once into regular expressions and predicates. After a full scan, only the objects
+reported by `depsgraph_update_post` are validated again, so the cost of an edit does not grow with the scene.
+Violations are tracked by object `session_uid`.
+"""
+import bpy
+
+import re
+from collections.abc import Callable
+from typing import Final, NamedTuple
+from ..addon import constants
+
+
+path_splitter : Final[str] = "/"
+
+class LintRule(NamedTuple):
+    name : str
+    is_valid : Callable[[bpy.types.Object], bool]
+    get_fix : Callable[[bpy.types.Object], tuple[bpy.types.ID, str] | None]  # Returns the ID to rename and its new name
+
+class LintSettings(NamedTuple):
+    type_prefixes : dict[str, str]  # Object type -> required name prefix
+    check_bake_suffixes : bool = True
+    check_path_names : bool = False
+    check_data_names : bool = True
+
+_rules : tuple[LintRule] = ()
+_violations : dict[int, tuple[str]] = {}  # Object `session_uid` -> names of the broken rules
+_data_users : dict[int, dict[int, str]] = {}  # Data `session_uid` -> object `session_uid` -> object name
+_object_data : dict[int, int] = {}  # Object `session_uid` -> data `session_uid`
+
+def parse_type_prefixes(value : str) -> dict[str, str]:
+    """Parses comma separated `TYPE:Prefix` pairs, e.g. `MESH:SM_, ARMATURE:SK_`.\n
+    Raises `ValueError` for pairs without a type or a prefix."""
+    type_prefixes : dict[str, str] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        object_type, _, prefix = item.partition(":")
+        if not object_type.strip() or not prefix.strip():
+            raise ValueError("Invalid type prefix: " + item.strip())
+        type_prefixes[object_type.strip().upper()] = prefix.strip()
+    return type_prefixes
+
+def __get_short_name(name : str) -> str:
+    return name.split(path_splitter)[-1]
+
+def __type_prefix_rule(object_type : str, prefix : str) -> LintRule:
+    pattern : re.Pattern = re.compile(re.escape(prefix))
+    return LintRule("Prefix " + prefix,
+                    lambda o : o.type != object_type or pattern.match(__get_short_name(o.name)) is not None,
+                    lambda o : (o, o.name[:len(o.name) - len(__get_short_name(o.name))] + prefix + __get_short_name(o.name)))
+
+def __bake_suffix_rule() -> LintRule:
+    # A bake suffix followed by a separator or a number, e.g. `Rock_low.001` or `Rock_low_2`, which are fixed to
+    # `Rock.001_low` and `Rock_2_low`. Suffixes inside words are not bake suffixes, so `Tree_Lower`, `Wall_lowpoly`
+    # and `Cliff_highlands_A` are valid.
+    pattern : re.Pattern = re.compile(r'^(.*?)(' + "|".join(re.escape(x) for x in constants.bake_suffixes) + r')([._\d].*)$')
+
+    def get_fix(o : bpy.types.Object) -> tuple[bpy.types.ID, str] | None:
+        match = pattern.match(o.name)
+        return (o, match.group(1) + match.group(3) + match.group(2)) if match is not None else None
+    return LintRule("Bake suffix", lambda o : pattern.match(o.name) is None, get_fix)
+
+def __path_name_rule() -> LintRule:
+    return LintRule("Path name",
+                    lambda o : path_splitter not in o.name,
+                    lambda o : (o, __get_short_name(o.name)))
+
+def __data_name_rule() -> LintRule:
+    # Shared data can only match one of its objects, so it is not checked
+    return LintRule("Data name",
+                    lambda o : o.data is None or o.data.users > 1 or o.data.name == o.name,
+                    lambda o : (o.data, o.name))
+
+def compile_rules(settings : LintSettings) -> tuple[LintRule]:
+    rules : list[LintRule] = [__type_prefix_rule(object_type, prefix) for object_type, prefix in settings.type_prefixes.items()]
+    if settings.check_bake_suffixes:
+        rules.append(__bake_suffix_rule())
+    if settings.check_path_names:
+        rules.append(__path_name_rule())
+    if settings.check_data_names:
+        rules.append(__data_name_rule())
+    return tuple(rules)
+
+def get_broken_rules(o : bpy.types.Object, rules : tuple[LintRule] | None = None) -> tuple[LintRule]:
+    return tuple(rule for rule in (rules if rules is not None else _rules) if not rule.is_valid(o))
+
+def _validate(o : bpy.types.Object) -> None:
+    data_uid : int | None = o.data.session_uid if o.data is not None else None
+    old_data_uid : int | None = _object_data.get(o.session_uid)
+    if old_data_uid != data_uid and old_data_uid is not None:  # The object uses other data now
+        _data_users.get(old_data_uid, {}).pop(o.session_uid, None)
+    if data_uid is not None:
+        _data_users.setdefault(data_uid, {})[o.session_uid] = o.name  # The name is kept current for lookups
+        _object_data[o.session_uid] = data_uid
+    else:
+        _object_data.pop(o.session_uid, None)
+    broken_rules : tuple[LintRule] = get_broken_rules(o)
+    if broken_rules:
+        _violations[o.session_uid] = tuple(rule.name for rule in broken_rules)
+    else:
+        _violations.pop(o.session_uid, None)
+
+def validate_objects(objects) -> None:
+    """Validates `objects` again, e.g. after they were fixed."""
+    for o in objects:
+        _validate(o)
+
+def scan() -> None:
+    """Validates every object of the file."""
+    _violations.clear()
+    _data_users.clear()
+    _object_data.clear()
+    for o in bpy.data.objects:
+        _validate(o)
+
+def _on_depsgraph_update(scene, depsgraph) -> None:
+    changed_objects : dict[int, bpy.types.Object] = {}
+    data_users : dict[int, str] = {}
+    for update in depsgraph.updates:
+        id_block : bpy.types.ID = update.id.original
+        if isinstance(id_block, bpy.types.Object):
+            changed_objects[id_block.session_uid] = id_block
+        else:
+            data_users.update(_data_users.get(id_block.session_uid, {}))  # Renamed or edited data
+
+    # Objects are only held by `session_uid` and name, as undo reallocates IDs. Users of data that changed
+    # without an update of the object itself are looked up by name, and skipped if they no longer exist.
+    for uid, name in data_users.items():
+        if uid not in changed_objects:
+            o : bpy.types.Object | None = bpy.data.objects.get(name)
+            if o is not None and o.session_uid == uid:
+                changed_objects[uid] = o
+
+    for o in changed_objects.values():
+        _validate(o)
+
+def is_running() -> bool:
+    return _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post
+
+def start(settings : LintSettings) -> None:
+    """Compiles the rules, scans the file and validates changed objects from then on."""
+    global _rules
+    stop()
+    _rules = compile_rules(settings)
+    scan()
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+
+def stop() -> None:
+    global _rules
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    _rules = ()
+    _violations.clear()
+    _data_users.clear()
+    _object_data.clear()
+
+def get_violation_count() -> int:
+    return len(_violations)
+
+def get_offenders() -> list[bpy.types.Object]:
+    """Returns the objects that break a rule. Deleted objects are dropped from the violations."""
+    offenders : list[bpy.types.Object] = [o for o in bpy.data.objects if o.session_uid in _violations]
+    found_uids : set[int] = {o.session_uid for o in offenders}
+    for uid in tuple(_violations.keys()):
+        if uid not in found_uids:
+            del _violations[uid]
+    return offenders
+
+def get_fixes(objects : list[bpy.types.Object]) -> list[tuple[bpy.types.ID, str]]:
+    """Returns the renames that fix the broken rules of `objects`.\n
+    The fixes of one object are chained in rule order, so several rules can be fixed at once,
+    and data renames use the fixed object name."""
+    fixes : list[tuple[bpy.types.ID, str]] = []
+    for o in objects:
+        proxy : _NameProxy = _NameProxy(o)
+        data_block : bpy.types.ID | None = None
+        for rule in _rules:
+            if rule.is_valid(proxy):
+                continue
+            fix : tuple[bpy.types.ID, str] | None = rule.get_fix(proxy)
+            if fix is None:
+                continue
+            if fix[0] is proxy:
+                proxy.name = fix[1]
+            else:
+                data_block = fix[0]
+        if proxy.name != o.name:
+            fixes.append((o, proxy.name))
+        if data_block is not None:
+            fixes.append((data_block, proxy.name))
+    return fixes
+
+class _NameProxy():
+    """Stands in for an object while its fixes are chained, with the name the previous fixes produced."""
+    def __init__(self, o : bpy.types.Object):
+        self._object : bpy.types.Object = o
+        self.name : str = o.name
+
+    def __getattr__(self, attribute : str):
+        return getattr(self._object, attribute)
@@ -19,39 +19,67 @@ from bpy.props import CollectionProperty
 from bpy.types import Scene
 
 from typing import Final
+from ..addon import persistent
 
 
 export_path_attribute : Final[str] = "abbu_quick_export_path"
 export_path_warning_msg : Final[str] = "No quick export path was set in the current scene."
+export_root_attribute : Final[str] = "abbu_quick_export_root"
 
 def has_quick_export_path(scene : Scene = None) -> bool:
     """Checks if the current scene has a quick export path set.\n
     Returns `True` if the quick export attribute is found"""
-    return True if export_path_attribute in bpy.context.scene else False
-    
-def __select_by_name_collection(o : bpy.types.Object, name_collection):
+    if scene is None:
+        scene = bpy.context.scene
+    return True if export_path_attribute in scene else False
+
+def get_export_directory(scene : Scene = None) -> str:
+    """Returns the absolute quick export directory.\n
+    The default export path from the preferences is used if enabled, otherwise the scene's quick export path."""
+    if scene is None:
+        scene = bpy.context.scene
+    prefs = persistent.get_preferences()
+    if prefs.uses_default_export_path:
+        quick_export_dir : str = prefs.default_export_path
+    else:
+        quick_export_dir : str = scene[export_path_attribute]
+    return bpy.path.abspath(quick_export_dir).replace("\\","/").rstrip("/")
+
+def get_export_roots(scene : Scene, view_layer : bpy.types.ViewLayer = None) -> list[bpy.types.Object]:
+    """Returns the objects of `scene` that are tagged as quick export roots.\n
+    If `view_layer` is set, objects that are not in the view layer are left out."""
+    objects = view_layer.objects if view_layer is not None else scene.objects
+    return [o for o in objects if export_root_attribute in o]
+
+def name_matches_collection(name : str, name_collection) -> bool:
+    """Returns `True` if `name` matches any entry of the quick export name collection."""
     for name_item in name_collection:
         if name_item.arg_type == 'CONTAINS':
-            if name_item.name in o.name:
-                o.select_set(True)
+            if name_item.name in name:
+                return True
         elif name_item.arg_type == 'BEGINS_WITH':
-            if o.name.startswith(name_item.name):
-                o.select_set(True)
+            if name.startswith(name_item.name):
+                return True
         elif name_item.arg_type == 'ENDS_WITH':
-            if o.name.endswith(name_item.name):
-                o.select_set(True)
-
-def select_objects_from_name_collection(name_collection : CollectionProperty, target_object = None) -> None:
-    if target_object == None:
-        for o in bpy.context.selected_objects:
-            for ch_obj in o.children:
-                if ch_obj.type == 'MESH':
-                    __select_by_name_collection(ch_obj, name_collection)
-                if ch_obj.type == 'EMPTY':
-                    select_objects_from_name_collection(name_collection, ch_obj)
-    else:
-        for ch_obj in target_object.children:
+            if name.endswith(name_item.name):
+                return True
+    return False
+
+def __select_by_name_collection(o : bpy.types.Object, name_collection):
+    if name_matches_collection(o.name, name_collection):
+        o.select_set(True)
+
+def select_objects_from_name_collection(name_collection : CollectionProperty,
+                                        target_object = None,
+                                        *,
+                                        children_map : dict[bpy.types.Object, list[bpy.types.Object]] | None = None) -> None:
+    """Selects the mesh children of the target object, or of the selected objects, that match `name_collection`.\n
+    Children of empties are searched as well. A `children_map` from `common.get_children_map` avoids `Object.children` lookups."""
+    get_children = (lambda x : children_map.get(x, ())) if children_map is not None else (lambda x : x.children)
+    stack : list[bpy.types.Object] = list(bpy.context.selected_objects) if target_object == None else [target_object]
+    while stack:
+        for ch_obj in get_children(stack.pop()):
             if ch_obj.type == 'MESH':
                 __select_by_name_collection(ch_obj, name_collection)
             if ch_obj.type == 'EMPTY':
-                select_objects_from_name_collection(name_collection, ch_obj)
+                stack.append(ch_obj)
@@ -0,0 +1,77 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Old to new name mapping files used for bulk renames.\n
+CSV files hold one `old,new` pair per row, with an optional `old,new` header.
+JSON files hold an object of `"old" : "new"` pairs, or a list of `[old, new]` pairs.
+"""
+import csv
+import json
+import os
+
+from typing import Final
+
+
+csv_header : Final[tuple[str, str]] = ("old", "new")
+undo_file_suffix : Final[str] = "_undo"
+
+def __load_csv(file_path : str) -> dict[str, str]:
+    mapping : dict[str, str] = {}
+    # `utf-8-sig` drops the byte order mark Excel writes, which would otherwise be part of the first old name
+    with open(file_path, 'r', encoding = 'utf-8-sig', newline = '') as file_handle:
+        for i, row in enumerate(csv.reader(file_handle)):
+            if not row or (i == 0 and tuple(x.strip().lower() for x in row[:2]) == csv_header):
+                continue
+            if len(row) < 2:
+                raise ValueError("Row " + str(i + 1) + " has no new name")
+            mapping[row[0]] = row[1]
+    return mapping
+
+def __load_json(file_path : str) -> dict[str, str]:
+    with open(file_path, 'r', encoding = 'utf-8-sig') as file_handle:
+        data = json.load(file_handle)
+    if isinstance(data, dict):
+        pairs = data.items()
+    elif isinstance(data, list) and all(isinstance(x, list) and len(x) == 2 for x in data):
+        pairs = data
+    else:
+        raise ValueError("Expected an object or a list of [old, new] pairs")
+    if not all(isinstance(old, str) and isinstance(new, str) for old, new in pairs):
+        raise ValueError("Names must be strings")
+    return dict(pairs)
+
+def load_mapping(file_path : str) -> dict[str, str]:
+    """Loads a CSV or JSON mapping file, chosen by the file extension.\n
+    Raises `OSError` or `ValueError` if the file cannot be read."""
+    if file_path.lower().endswith(".json"):
+        return __load_json(file_path)
+    return __load_csv(file_path)
+
+def save_mapping(file_path : str, mapping : dict[str, str]) -> None:
+    """Saves `mapping` as a CSV or JSON file, chosen by the file extension."""
+    with open(file_path, 'w', encoding = 'utf8', newline = '') as file_handle:
+        if file_path.lower().endswith(".json"):
+            json.dump(mapping, file_handle, indent = 4)
+        else:
+            writer = csv.writer(file_handle)
+            writer.writerow(csv_header)
+            writer.writerows(mapping.items())
+
+def get_undo_file_path(file_path : str) -> str:
+    """Returns the path of the undo mapping file written next to `file_path`."""
+    root, extension = os.path.splitext(file_path)
+    return root + undo_file_suffix + extension
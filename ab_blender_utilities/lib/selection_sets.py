@@ -0,0 +1,81 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Named object selection sets stored in the scene.\n
+Sets hold object pointers, so they survive file reloads and object renames.
+Restoring a set only changes the objects whose selection differs, with `common.SelectionTransaction`.
+"""
+import bpy
+
+from typing import Final
+
+
+sets_attribute : Final[str] = "abbu_selection_sets"
+active_index_attribute : Final[str] = "abbu_selection_set_index"
+
+# Selection modes
+e_selection_mode : Final[tuple[tuple]] = (('SET', "Replace", "Selects only the objects of the set"),
+                                          ('ADD', "Union", "Adds the objects of the set to the selection"),
+                                          ('INTERSECT', "Intersect", "Keeps only selected objects that are in the set"),
+                                          ('SUBTRACT', "Subtract", "Deselects the objects of the set"))
+
+def get_sets(scene : bpy.types.Scene = None):
+    if scene is None:
+        scene = bpy.context.scene
+    return getattr(scene, sets_attribute)
+
+def find_set(name : str, scene : bpy.types.Scene = None):
+    """Returns the selection set called `name`, or `None`."""
+    return get_sets(scene).get(name)
+
+def save_set(name : str, objects, scene : bpy.types.Scene = None):
+    """Stores `objects` as the selection set called `name`, replacing an existing set of that name.\n
+    Returns the set, which becomes the active set."""
+    sets = get_sets(scene)
+    selection_set = sets.get(name)
+    if selection_set is None:
+        selection_set = sets.add()
+        selection_set.name = name
+    selection_set.objects.clear()
+    for o in objects:
+        selection_set.objects.add().object = o
+    setattr(scene if scene is not None else bpy.context.scene, active_index_attribute, sets.find(name))
+    return selection_set
+
+def remove_set(name : str, scene : bpy.types.Scene = None) -> bool:
+    sets = get_sets(scene)
+    index : int = sets.find(name)
+    if index < 0:
+        return False
+    sets.remove(index)
+    scene = scene if scene is not None else bpy.context.scene
+    setattr(scene, active_index_attribute, min(getattr(scene, active_index_attribute), len(sets) - 1))
+    return True
+
+def get_set_objects(selection_set) -> set[bpy.types.Object]:
+    """Returns the objects of a set. Deleted objects leave empty pointers, which are skipped."""
+    return {x.object for x in selection_set.objects if x.object is not None}
+
+def get_selection(current : set[bpy.types.Object], set_objects : set[bpy.types.Object], mode : str) -> set[bpy.types.Object]:
+    """Combines the current selection with the objects of a set, using a mode of `e_selection_mode`."""
+    if mode == 'ADD':
+        return current | set_objects
+    if mode == 'INTERSECT':
+        return current & set_objects
+    if mode == 'SUBTRACT':
+        return current - set_objects
+    return set(set_objects)
@@ -0,0 +1,111 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Applies object transforms to mesh data without `bpy.ops.object.transform_apply`.\n
+For every object, the applied part of its transform is `A = B'^-1 @ B`, where `B` is the current and `B'`
+the remaining basis matrix. `A` is computed for all objects at once, vertex coordinates are transformed
+with `foreach_get`/`foreach_set`, and children keep their world transforms by premultiplying their
+parent inverse matrix with `A`.
+"""
+import bpy
+import mathutils
+
+import numpy as np
+from typing import NamedTuple
+
+
+class ApplyTransformResult(NamedTuple):
+    applied_count : int
+    copied_mesh_count : int  # Shared meshes copied because their users needed different transforms
+    skipped : tuple[bpy.types.Object]  # Objects with data that is not a mesh
+    singular : tuple[bpy.types.Object]  # Objects whose remaining transform can't be inverted, e.g. a kept zero scale
+
+def _get_remaining_basis(o : bpy.types.Object, location : bool, rotation : bool, scale : bool) -> mathutils.Matrix:
+    loc, rot, sca = o.matrix_basis.decompose()
+    return mathutils.Matrix.LocRotScale(None if location else loc,
+                                        None if rotation else rot,
+                                        None if scale else sca)
+
+def _transform_coordinates(collection, matrix : np.ndarray) -> None:
+    co : np.ndarray = np.empty(len(collection) * 3, dtype = np.float32)
+    collection.foreach_get("co", co)
+    co = co.reshape(-1, 3).astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+    collection.foreach_set("co", co.astype(np.float32).ravel())
+
+def _transform_mesh(mesh : bpy.types.Mesh, matrix : np.ndarray) -> None:
+    _transform_coordinates(mesh.vertices, matrix)
+    if mesh.shape_keys is not None:
+        for key_block in mesh.shape_keys.key_blocks:
+            _transform_coordinates(key_block.data, matrix)
+    if np.linalg.det(matrix[:3, :3]) < 0.0:  # Mirrored, keeps normals pointing outside
+        mesh.flip_normals()
+    mesh.update()
+
+def apply_transforms(objects : list[bpy.types.Object] | tuple[bpy.types.Object],
+                     location : bool = False,
+                     rotation : bool = True,
+                     scale : bool = True) -> ApplyTransformResult:
+    """Applies the chosen transform components of `objects` to their mesh data.\n
+    Empties have their transform reset without changing data. Meshes shared with objects that need
+    a different transform, or with objects that are not in `objects`, are copied before they are changed.
+    Objects whose remaining basis matrix is singular are not changed and returned in `singular`."""
+    skipped : list[bpy.types.Object] = [o for o in objects if o.type not in ('MESH', 'EMPTY')]
+    objects = [o for o in objects if o.type in ('MESH', 'EMPTY')]
+    remaining_bases : list[mathutils.Matrix] = [_get_remaining_basis(o, location, rotation, scale) for o in objects]
+    invertible : list[bool] = [abs(x.determinant()) > 1e-12 for x in remaining_bases]
+    singular : list[bpy.types.Object] = [o for o, x in zip(objects, invertible) if not x]
+    objects = [o for o, x in zip(objects, invertible) if x]
+    remaining_bases = [basis for basis, x in zip(remaining_bases, invertible) if x]
+    if not objects:
+        return ApplyTransformResult(0, 0, tuple(skipped), tuple(singular))
+
+    bases : np.ndarray = np.array([o.matrix_basis for o in objects], dtype = np.float64)
+    applied : np.ndarray = np.linalg.solve(np.array(remaining_bases, dtype = np.float64), bases)  # B'^-1 @ B, batched
+
+    # Children are corrected from the original parent inverse matrices before any object changes
+    indices : dict[bpy.types.Object, int] = {o : i for i, o in enumerate(objects)}
+    child_objects : list[bpy.types.Object] = [ch_obj for o in objects for ch_obj in o.children]
+    if child_objects:
+        parent_inverses : np.ndarray = np.array([ch_obj.matrix_parent_inverse for ch_obj in child_objects], dtype = np.float64)
+        parent_inverses = applied[[indices[ch_obj.parent] for ch_obj in child_objects]] @ parent_inverses
+        for ch_obj, matrix in zip(child_objects, parent_inverses):
+            ch_obj.matrix_parent_inverse = mathutils.Matrix(matrix.tolist())
+
+    # Meshes are transformed once per data block if all of its users are applied with the same matrix
+    mesh_users : dict[bpy.types.Mesh, list[int]] = {}
+    for i, o in enumerate(objects):
+        if o.type == 'MESH':
+            mesh_users.setdefault(o.data, []).append(i)
+    object_counts : dict[bpy.types.Mesh, int] = {}
+    for o in bpy.data.objects:
+        if o.type == 'MESH' and o.data in mesh_users:
+            object_counts[o.data] = object_counts.get(o.data, 0) + 1
+
+    copied_mesh_count : int = 0
+    for mesh, user_indices in mesh_users.items():
+        matrices : np.ndarray = applied[user_indices]
+        if object_counts[mesh] == len(user_indices) and np.allclose(matrices, matrices[0], atol = 1e-6):
+            _transform_mesh(mesh, matrices[0])
+            continue
+        for i in user_indices:
+            objects[i].data = mesh.copy()
+            _transform_mesh(objects[i].data, applied[i])
+            copied_mesh_count += 1
+
+    for o, remaining_basis in zip(objects, remaining_bases):
+        o.matrix_basis = remaining_basis
+    return ApplyTransformResult(len(objects), copied_mesh_count, tuple(skipped), tuple(singular))
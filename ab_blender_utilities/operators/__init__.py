@@ -14,18 +14,20 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from . import color_attribute_ops, custom_prop_ops, global_ops, mat_ops, modifier_ops, naming_ops, rot_ops, data_block_ops, selection_ops, uv_ops
+from . import cleanup_ops, color_attribute_ops, custom_prop_ops, global_ops, mat_ops, modifier_ops, naming_ops, object_ops, rot_ops, data_block_ops, selection_ops, uv_ops
 from .file_ops import file_ops_common, file_ops_custom, file_ops_fbx
 from types import ModuleType
 
 
 def get_modules() -> tuple[ModuleType]:
-    modules : tuple[ModuleType] = (color_attribute_ops,
+    modules : tuple[ModuleType] = (cleanup_ops,
+                                   color_attribute_ops,
                                    custom_prop_ops,
                                    global_ops,
                                    mat_ops,
                                    modifier_ops,
                                    naming_ops,
+                                   object_ops,
                                    rot_ops,
                                    data_block_ops,
                                    selection_ops,
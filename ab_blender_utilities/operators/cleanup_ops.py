@@ -0,0 +1,62 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import bpy
+from bpy.props import FloatProperty
+from bpy.types import Operator
+
+from .categories import CatCleanup, PollType
+from ..lib import common, mesh_weld
+
+
+class ABBU_OT_MergeByDistance(Operator, CatCleanup):
+    """Merges vertices within a distance of each other on the selected meshes without entering edit mode"""
+    bl_idname = "object.abbu_merge_by_distance"
+    bl_label = "Merge By Distance"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    category_poll = PollType.OBJ_MESH_SEL
+
+    distance : FloatProperty(
+        name = "Merge Distance",
+        default = 0.0001,
+        min = 0.0,
+        precision = 5,
+        subtype = 'DISTANCE'
+    )
+
+    def execute(self, context):
+        # Support is checked per mesh across all of its users, as shared meshes are merged once
+        mesh_users : dict[bpy.types.Mesh, list[bpy.types.Object]] = {o.data : [] for o in context.selected_objects if o.type == 'MESH'}
+        for o in bpy.data.objects:
+            if o.type == 'MESH' and o.data in mesh_users:
+                mesh_users[o.data].append(o)
+        meshes : list[bpy.types.Mesh] = [mesh for mesh, users in mesh_users.items() if mesh_weld.is_supported(mesh, users)]
+        unsupported : list[bpy.types.Mesh] = [mesh for mesh in mesh_users.keys() if mesh not in meshes]
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode = 'OBJECT')
+        removed_count : int = 0
+        for mesh in meshes:
+            removed_count += mesh_weld.weld_mesh(mesh, self.distance)
+
+        if unsupported:
+            common.warning(self, "Skipped meshes with shape keys, vertex groups or custom normals: " + ", ".join(mesh.name for mesh in unsupported))
+        else:
+            common.info(self, "Removed " + str(removed_count) + " vertices from " + str(len(meshes)) + " mesh(es).")
+        return {'FINISHED'}
+
+OPERATORS : tuple[Operator] = (ABBU_OT_MergeByDistance,)
@@ -14,24 +14,34 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import bpy
+from bpy.props import StringProperty
 from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
 
-from ...lib import common
-from ...addon import persistent
+from ...lib import fbx_files, gltf_files
 
 
-class ABBU_OT_ExportCustom(Operator):
-    """Starts a quick export operation"""
+class ABBU_OT_ExportCustom(Operator, ExportHelper):
+    """Exports the currently selected objects as a glTF binary file using the addon's custom exporter"""
     bl_idname = "export_scene.ab_export_custom"
     bl_label = "Custom Export"
-    bl_options = {'REGISTER', 'UNDO'}
-    
+    bl_options = {'REGISTER'}
+    bl_menu_label = "AB Utilities glTF Binary (.glb)"
+
+    filename_ext = ".glb"
+    filter_glob: StringProperty(default="*.glb", options={'HIDDEN'}, maxlen=255)
+
+    @classmethod
+    def poll(cl, context):
+        return len(context.selected_objects) > 0
+
     def execute(self, context):
-        """Available for custom implementation"""
-        if persistent.get_preferences().fbx_exporter_type == 'CUSTOM':
-            common.warning(self, "Custom operator not yet implemented.")
-            return {'FINISHED'}
-        
-        return {'CANCELED'}
-    
+        gltf_files.export_glb_file(self.filepath, bpy.context.selected_objects, fbx_files.get_glb_export_options())
+        return {'FINISHED'}
+
+    def menu_func(self, context):
+        self.layout.operator(ABBU_OT_ExportCustom.bl_idname, text=ABBU_OT_ExportCustom.bl_menu_label)
+
 OPERATORS : tuple[Operator] = (ABBU_OT_ExportCustom,)
+EXPORTERS : tuple[Operator] = (ABBU_OT_ExportCustom,)
@@ -15,74 +15,480 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import bpy
-from bpy.props import BoolProperty
+from bpy.props import BoolProperty, EnumProperty
 from bpy.types import Operator
 
 import mathutils
-from ..categories import CatFileFBX
+import os
+from typing import NamedTuple
+from ..categories import CatFileFBX, PollType
 from ...addon import constants, persistent
-from ...lib import common, quick_export, fbx_files
+from ...lib import bake_pairs, common, export_checkpoint, export_manifest, export_packaging, export_timing, export_watch, lod_cache, mesh_hash, mesh_merge, quick_export, fbx_files
 
 
-def _process_export_object(operator, obj):
-    # Selection
-    common.deselect_all()
-    obj.select_set(True)
-                
-    bpy.context.view_layer.objects.active = obj
-    active_object : bpy.types.Object = obj
-    child_objects = common.select_child_objects(operator.export_wire_objects, recursive = operator.recursive_export)
-    
-    renamed_child_objects : list = []
+class QuickExportOptions(NamedTuple):
+    """Quick export options for callers that are not the quick export operator.\n
+    The operator itself is passed as the options, as it has the same properties."""
+    export_wire_objects : bool = False
+    recursive_export : bool = True
+    deduplicate_geometry : bool = False
+    merge_hierarchy : bool = False
 
-    for child_object in child_objects:
-        if "/" in child_object.name:  # Name is path
-            child_object_entry : dict = {}
-            child_object_entry["ref"] = child_object
-            child_object_entry["old_name"] = child_object.name
-            child_object_name_split = child_object.name.split("/")
-            child_object.name = child_object_name_split[len(child_object_name_split) - 1]
-            renamed_child_objects.append(child_object_entry)
+class ExportResult(NamedTuple):
+    file_paths : tuple[str]
+    changed_count : int
 
-    prefs = persistent.get_preferences()
-    if len(prefs.quick_export_name_collection) > 0:
-        quick_export.select_objects_from_name_collection(prefs.quick_export_name_collection)
+class QuickExportSummary(NamedTuple):
+    exported_count : int
+    changed_count : int
+    skipped_count : int
+    failures : tuple[tuple[str, str]]  # (root name, error message)
+    archives : tuple[str] = ()
 
-    # Location & rotation
-    location : mathutils.Vector = active_object.location.copy()
-    rotation : mathutils.Euler = active_object.rotation_euler.copy()
-    active_object.location = mathutils.Vector((0.0, 0.0, 0.0))
-    active_object.rotation_euler = mathutils.Euler((0.0, 0.0, 0.0))
+class LODSettings(NamedTuple):
+    mode : str  # 'FILES' or 'GROUP'
+    ratios : tuple[float]
+    cache : lod_cache.LODCache
 
-    # Export name
-    export_name : str = active_object.name
+def _get_lod_settings(hash_cache : mesh_hash.GeometryHashCache) -> LODSettings | None:
+    """Returns the LOD settings of the preferences, or `None` if LODs are not exported."""
+    prefs = persistent.get_preferences()
+    ratios : tuple[float] = lod_cache.parse_lod_ratios(prefs.quick_export_lod_ratios)
+    if prefs.quick_export_lod_mode == 'NONE' or not ratios:
+        return None
+    return LODSettings(prefs.quick_export_lod_mode, ratios, lod_cache.LODCache(hash_cache))
+
+def _get_export_name(name : str) -> str:
+    """Returns the export file name of a root, without bake suffixes.\n
+    Path names are kept, so they export into subdirectories."""
+    export_name : str = name
     for x in constants.bake_suffixes:
         export_name = export_name.replace(x, "")
+    return export_name
 
-    # Remove path from object name
-    old_name : str = obj.name
-    obj.name = common.get_name_from_path(obj)
-                
-                
-    # FBX export operator
-    if persistent.get_preferences().uses_default_export_path:
-        quick_export_dir = persistent.get_preferences().default_export_path
-    else:
-        quick_export_dir = bpy.context.scene[quick_export.export_path_attribute]
-    file_path : str = bpy.path.abspath(quick_export_dir)\
-    .replace("\\","/")+"/"+export_name+".fbx"
+def _strip_path_names(objects) -> list[tuple[bpy.types.Object, str]]:
+    """Removes the path from object names that are paths.\n
+    Returns the renamed objects with their old names."""
+    renamed_objects : list[tuple[bpy.types.Object, str]] = []
+    for o in objects:
+        if "/" in o.name:  # Name is path
+            renamed_objects.append((o, o.name))
+            o.name = common.get_name_from_path(o)
+    return renamed_objects
+
+def _restore_names(renamed_objects : list[tuple[bpy.types.Object, str]]) -> None:
+    for o, old_name in reversed(renamed_objects):  # An object can be renamed more than once
+        o.name = old_name
+
+def _create_merged_export_object(root : bpy.types.Object,
+                                 objects : list[bpy.types.Object],
+                                 renamed_objects : list[tuple[bpy.types.Object, str]]) -> bpy.types.Object:
+    """Replaces the selection with a temporary mesh object merged from `objects` in the space of `root`.\n
+    The merged object takes the name of `root`, which is renamed until the names are restored."""
+    name : str = root.name
+    renamed_objects.append((root, name))
+    root.name = name + "_abbu_merge_source"
+    merged_object : bpy.types.Object = bpy.data.objects.new(name, mesh_merge.build_merged_mesh(name, root, objects))
+    bpy.context.scene.collection.objects.link(merged_object)
+    merged_object.scale = root.scale  # Quick export keeps the root scale
+    with common.SelectionTransaction() as selection:
+        selection.deselect_all()
+        selection.select((merged_object,))
+    return merged_object
+
+def _export_selection(export_name : str) -> ExportResult:
+    """Exports the current selection into the quick export directory."""
+    file_path : str = quick_export.get_export_directory() + "/" + export_name + fbx_files.get_export_extension()
     common.make_directory_from_file_path(file_path)
-    fbx_files.export_fbx_file(file_path)
-    active_object.location = location
-    active_object.rotation_euler = rotation
-    # Return old object name
-    obj.name = old_name
-    
-    for child_object in renamed_child_objects:
-        child_object["ref"].name = child_object["old_name"]
+    file_changed : bool = fbx_files.export_selection_if_changed(file_path)
+    return ExportResult((file_path,), 1 if file_changed else 0)
+
+def _swap_lod_meshes(objects, ratio : float, cache : lod_cache.LODCache) -> list[tuple[bpy.types.Object, bpy.types.Mesh, list[bool]]]:
+    """Replaces the meshes of `objects` with their LOD meshes and disables their modifiers.\n
+    Returns the swapped objects with their meshes and modifier states."""
+    lod_meshes : list[tuple[bpy.types.Object, bpy.types.Mesh]] = [(o, cache.get_lod_mesh(o, ratio)) for o in objects if o.type == 'MESH']
+    swapped_objects : list[tuple[bpy.types.Object, bpy.types.Mesh, list[bool]]] = []
+    for o, lod_mesh in lod_meshes:
+        swapped_objects.append((o, o.data, [x.show_viewport for x in o.modifiers]))
+        o.data = lod_mesh
+        for modifier in o.modifiers:
+            modifier.show_viewport = False
+    return swapped_objects
+
+def _restore_lod_meshes(swapped_objects : list[tuple[bpy.types.Object, bpy.types.Mesh, list[bool]]]) -> None:
+    for o, mesh, modifier_states in swapped_objects:
+        o.data = mesh
+        for modifier, show_viewport in zip(o.modifiers, modifier_states):
+            modifier.show_viewport = show_viewport
+
+def _export_lod_group(export_name : str, objects : list[bpy.types.Object], lods : LODSettings) -> ExportResult:
+    """Exports copies of `objects` for every LOD under an empty that is written as an FBX LOD group."""
+    bpy.context.view_layer.update()  # Updates world matrices after the root transform was reset
+    scene_collection : bpy.types.Collection = bpy.context.scene.collection
+    group_name : str = export_name.split("/")[-1]
+    temp_objects : list[bpy.types.Object] = []
+    try:
+        with export_timing.stage("lod"):
+            group : bpy.types.Object = bpy.data.objects.new(group_name + "_LODGroup", None)
+            group["fbx_type"] = "LodGroup"  # Read by Blender's FBX exporter
+            temp_objects.append(group)
+            for lod_index, ratio in enumerate((1.0,) + lods.ratios):
+                level : bpy.types.Object = bpy.data.objects.new("LOD" + str(lod_index) + "_" + group_name, None)
+                level.parent = group
+                temp_objects.append(level)
+                for o in objects:
+                    lod_object : bpy.types.Object = o.copy()
+                    lod_object.name = lod_cache.get_lod_name(o.name, lod_index)
+                    if lod_index > 0 and o.type == 'MESH':
+                        lod_object.data = lods.cache.get_lod_mesh(o, ratio)
+                        lod_object.modifiers.clear()
+                    lod_object.parent = level
+                    lod_object.matrix_parent_inverse = mathutils.Matrix.Identity(4)
+                    lod_object.matrix_basis = o.matrix_world.copy()
+                    temp_objects.append(lod_object)
+            for o in temp_objects:
+                scene_collection.objects.link(o)
+            with common.SelectionTransaction() as selection:
+                selection.deselect_all()
+                selection.select(temp_objects)
+        return _export_selection(export_name)
+    finally:
+        with export_timing.stage("restore"):
+            for o in temp_objects:
+                bpy.data.objects.remove(o)
+            common.select_objects(objects)
+
+def _export_selection_with_lods(export_name : str, lods : LODSettings | None) -> ExportResult:
+    """Exports the current selection, followed by its LODs if `lods` is not `None`."""
+    if lods is None:
+        return _export_selection(export_name)
+    objects : list[bpy.types.Object] = list(bpy.context.selected_objects)
+    if lods.mode == 'GROUP':
+        return _export_lod_group(export_name, objects, lods)
+
+    result : ExportResult = _export_selection(export_name)
+    file_paths : list[str] = list(result.file_paths)
+    changed_count : int = result.changed_count
+    for lod_index, ratio in enumerate(lods.ratios, 1):
+        with export_timing.stage("lod"):
+            swapped_objects = _swap_lod_meshes(objects, ratio, lods.cache)
+        try:
+            lod_result : ExportResult = _export_selection(lod_cache.get_lod_name(export_name, lod_index))
+        finally:
+            _restore_lod_meshes(swapped_objects)
+        file_paths += lod_result.file_paths
+        changed_count += lod_result.changed_count
+    return ExportResult(tuple(file_paths), changed_count)
+
+def _process_export_object(operator,
+                           obj,
+                           manifest : export_manifest.ExportManifest | None = None,
+                           hash_cache : mesh_hash.GeometryHashCache | None = None,
+                           lods : LODSettings | None = None,
+                           export_name : str | None = None,
+                           children_map : dict[bpy.types.Object, list[bpy.types.Object]] | None = None) -> ExportResult:
+    """Exports an object and its children as an FBX file.\n
+    `operator` is the quick export operator or `QuickExportOptions`.
+    `export_name` overrides the file name, which defaults to the object name without bake suffixes.
+    With `merge_hierarchy`, the exported objects are merged into one mesh first.\n
+    With a `manifest`, an object whose geometry was already exported in this batch is only recorded in the manifest.
+    With `lods`, LODs of the exported meshes are exported as well.
+    A `children_map` from `common.get_children_map` can be shared by all roots of a batch.\n
+    The object transform and any renamed objects are restored even if the export fails."""
+    export_timing.begin_root(obj.name)
+
+    # Selection
+    with export_timing.stage("selection"), common.SelectionTransaction() as selection:
+        active_object : bpy.types.Object = obj
+        child_objects = common.get_child_objects(obj, operator.export_wire_objects, operator.recursive_export, children_map)
+        selection.deselect_all()
+        selection.select((obj,))
+        selection.select(child_objects)
+        selection.set_active(obj)
     
+    renamed_objects : list[tuple[bpy.types.Object, str]] = []
+    location : mathutils.Vector = active_object.location.copy()
+    rotation : mathutils.Euler = active_object.rotation_euler.copy()
+    geometry_hash : str | None = None
+    merged_object : bpy.types.Object | None = None
+
+    try:
+        with export_timing.stage("rename"):
+            renamed_objects += _strip_path_names(child_objects)
+
+        prefs = persistent.get_preferences()
+        if len(prefs.quick_export_name_collection) > 0:
+            with export_timing.stage("name_collection"):
+                quick_export.select_objects_from_name_collection(prefs.quick_export_name_collection, children_map = children_map)
+
+        if manifest is not None:
+            with export_timing.stage("hash"):
+                geometry_hash = hash_cache.get_export_digest(active_object, bpy.context.selected_objects)
+            shared_file_path : str | None = manifest.get_geometry_file(geometry_hash)
+            if shared_file_path is not None:
+                manifest.add_root(obj, geometry_hash, shared_file_path)
+                return ExportResult((shared_file_path,), 0)
+
+        # Location & rotation
+        active_object.location = mathutils.Vector((0.0, 0.0, 0.0))
+        active_object.rotation_euler = mathutils.Euler((0.0, 0.0, 0.0))
+
+        if export_name is None:
+            export_name = _get_export_name(active_object.name)
+
+        # Remove path from object name
+        with export_timing.stage("rename"):
+            renamed_objects += _strip_path_names((obj,))
+
+        if operator.merge_hierarchy:
+            with export_timing.stage("merge"):
+                merged_object = _create_merged_export_object(obj, bpy.context.selected_objects, renamed_objects)
+
+        result : ExportResult = _export_selection_with_lods(export_name, lods)
+    finally:
+        with export_timing.stage("restore"):
+            if merged_object is not None:
+                merged_mesh : bpy.types.Mesh = merged_object.data
+                bpy.data.objects.remove(merged_object)
+                bpy.data.meshes.remove(merged_mesh)
+            active_object.location = location
+            active_object.rotation_euler = rotation
+            _restore_names(renamed_objects)
+
+    if geometry_hash is not None:
+        manifest.add_root(obj, geometry_hash, result.file_paths[0])
+    return result
+
+def _process_export_collection(operator,
+                               collection : bpy.types.Collection,
+                               view_layer_objects : set[bpy.types.Object],
+                               lods : LODSettings | None = None) -> ExportResult:
+    """Exports the objects of a collection, including nested collections, as one file.\n
+    `view_layer_objects` holds the objects that can be selected in the current view layer.
+    With `lods`, LODs of the exported meshes are exported as well."""
+    export_timing.begin_root(collection.name)
+    prefs = persistent.get_preferences()
+
+    with export_timing.stage("selection"):
+        members : list[bpy.types.Object] = []
+        for o in collection.all_objects:
+            if o not in view_layer_objects:
+                continue
+            if o.display_type in {'TEXTURED', 'SOLID'} or operator.export_wire_objects\
+                or quick_export.name_matches_collection(o.name, prefs.quick_export_name_collection):
+                    members.append(o)
+        with common.SelectionTransaction() as selection:
+            selection.deselect_all()
+            selection.select(members)
+
+    renamed_objects : list[tuple[bpy.types.Object, str]] = []
+    try:
+        with export_timing.stage("rename"):
+            renamed_objects += _strip_path_names(members)
+        result : ExportResult = _export_selection_with_lods(_get_export_name(collection.name), lods)
+    finally:
+        with export_timing.stage("restore"):
+            _restore_names(renamed_objects)
+
+    return result
+
+def _get_batch_name() -> str:
+    blend_name : str = bpy.path.display_name_from_filepath(bpy.data.filepath) or "quick_export"
+    return blend_name + "_" + bpy.context.scene.name
+
+def _get_checkpoint_batch_id(roots, checkpoint_prefix : str, options) -> str:
+    prefs = persistent.get_preferences()
+    option_values : tuple = tuple(getattr(options, x, None) for x in QuickExportOptions._fields)
+    pref_values : tuple = (prefs.fbx_exporter_type, prefs.quick_export_lod_mode, prefs.quick_export_lod_ratios,
+                           bpy.data.filepath, bpy.context.scene.name)
+    return export_checkpoint.get_batch_id([checkpoint_prefix + root.name for root in roots], option_values + pref_values)
+
+def _quick_export_roots(roots,
+                        process_func,
+                        operator : Operator = None,
+                        resume_unfinished : bool = False,
+                        checkpoint_prefix : str = "",
+                        manifest : export_manifest.ExportManifest | None = None,
+                        options = None) -> QuickExportSummary:
+    """Exports each root with `process_func`, which returns an `ExportResult`.\n
+    A failing root is reported and skipped instead of aborting the batch.
+    Completed roots are always recorded in a checkpoint, which is removed once the batch finishes without failures.
+    With `resume_unfinished`, roots completed by an earlier unfinished run of the same batch are skipped.
+    The batch is identified by the roots, `options` and the export preferences.
+    If packaging is enabled in the preferences, finished outputs are compressed in the background.
+    A `manifest` is saved once all roots are exported."""
+    export_dir : str = quick_export.get_export_directory()
+    os.makedirs(export_dir, exist_ok = True)
+    checkpoint : export_checkpoint.ExportCheckpoint = export_checkpoint.ExportCheckpoint(export_dir,
+                                                                                        _get_checkpoint_batch_id(roots, checkpoint_prefix, options),
+                                                                                        resume_unfinished)
+
+    packager : export_packaging.ExportPackager | None = None
+    packaging_mode : str = persistent.get_preferences().quick_export_packaging
+    if packaging_mode != 'NONE':
+        packager = export_packaging.ExportPackager(export_dir, packaging_mode, _get_batch_name())
+
+    if persistent.get_preferences().quick_export_record_timings:
+        export_timing.begin()
+
+    exported_count : int = 0
+    changed_count : int = 0
+    skipped_count : int = 0
+    failures : list[tuple[str, str]] = []
+    extra_file_paths : list[str] = []  # Batch files added to the batch archive
+    try:
+        for root in roots:
+            root_name : str = root.name
+            checkpoint_key : str = checkpoint_prefix + root_name
+            if resume_unfinished and checkpoint.is_complete(checkpoint_key):
+                skipped_count += 1
+                if manifest is not None:
+                    manifest.keep_root(root_name)
+                if packager is not None:
+                    packager.add(root_name, checkpoint.get_files(checkpoint_key))
+                continue
+            try:
+                result : ExportResult = process_func(root)
+            except Exception as e:
+                failures.append((root_name, str(e)))
+                print(common.error(operator, "Failed to export " + root_name + ": " + str(e)))
+                continue
+            exported_count += 1
+            changed_count += result.changed_count
+            checkpoint.mark_complete(checkpoint_key, result.file_paths)
+            if packager is not None:
+                packager.add(root_name, result.file_paths)
+
+        if manifest is not None:
+            os.makedirs(manifest.directory, exist_ok = True)
+            manifest.save()
+            extra_file_paths.append(manifest.file_path)
+    finally:
+        checkpoint.flush()  # Also kept if the batch was interrupted
+        archives : tuple[str] = ()
+        if packager is not None:
+            with export_timing.batch_stage("packaging_wait"):
+                archives = packager.finish(extra_file_paths)
+            for archive_path in archives:
+                export_timing.add_archive(archive_path)
+        profiler : export_timing.ExportProfiler | None = export_timing.end()
+
+    if not failures:
+        checkpoint.clear()
+
+    msg : str = str(changed_count) + " of " + str(exported_count) + " exported file(s) changed."
+    if skipped_count > 0:
+        msg += " " + str(skipped_count) + " root(s) were already exported by the unfinished previous run."
+    if failures:
+        msg += " " + str(len(failures)) + " root(s) failed: " + ", ".join(name for name, _ in failures) + "."
+        print(common.warning(operator, msg))
+    else:
+        print(common.info(operator, msg))
+    if archives:
+        print(common.info(operator, "Packaged " + str(len(archives)) + " archive(s) in " + os.path.join(export_dir, export_packaging.packages_directory_name)))
+    if profiler is not None:
+        profiler.write_report(export_dir)
+        print(common.info(operator, "Export timings: " + profiler.get_summary()))
+    return QuickExportSummary(exported_count, changed_count, skipped_count, tuple(failures), archives)
+
+def _process_bake_pair(operator,
+                       pair : bake_pairs.BakePair,
+                       children_map : dict[bpy.types.Object, list[bpy.types.Object]] | None = None) -> ExportResult:
+    """Exports the high and low objects of a pair as `<name>_high` and `<name>_low` files.\n
+    The path part of the low object's name is used for both files."""
+    path : str = pair.low.name.rpartition("/")[0]
+    export_name : str = path + "/" + pair.name if path else pair.name
+    high_result : ExportResult = _process_export_object(operator, pair.high, export_name = export_name + "_high", children_map = children_map)
+    low_result : ExportResult = _process_export_object(operator, pair.low, export_name = export_name + "_low", children_map = children_map)
+    return ExportResult(high_result.file_paths + low_result.file_paths,
+                        high_result.changed_count + low_result.changed_count)
+
+def _report_lod_cache(operator : Operator, lods : LODSettings | None) -> None:
+    if lods is not None and lods.cache.hit_count + lods.cache.miss_count > 0:
+        print(common.info(operator, "LOD cache: " + str(lods.cache.hit_count) + " reused, " + str(lods.cache.miss_count) + " generated."))
+
+def quick_export_objects(options,
+                         export_objects,
+                         operator : Operator = None,
+                         *,
+                         resume_unfinished : bool = False) -> QuickExportSummary:
+    """Exports each object of `export_objects` with its children as a separate file.\n
+    `options` is the quick export operator or `QuickExportOptions`.
+    With `deduplicate_geometry`, roots with identical geometry share one file and are listed in the export manifest."""
+    hash_cache : mesh_hash.GeometryHashCache = mesh_hash.GeometryHashCache()
+    lods : LODSettings | None = _get_lod_settings(hash_cache)
+    manifest : export_manifest.ExportManifest | None = None
+    if options.deduplicate_geometry:
+        manifest = export_manifest.ExportManifest(quick_export.get_export_directory(), keep_roots = resume_unfinished)
+    children_map : dict[bpy.types.Object, list[bpy.types.Object]] = common.get_children_map()  # Built once for all roots
+
+    summary : QuickExportSummary = _quick_export_roots(export_objects,
+                                                       lambda o : _process_export_object(options, o, manifest, hash_cache, lods,
+                                                                                         children_map = children_map),
+                                                       operator,
+                                                       resume_unfinished,
+                                                       manifest = manifest,
+                                                       options = options)
+    _report_lod_cache(operator, lods)
+    if manifest is not None:
+        print(common.info(operator, str(len(manifest.roots)) + " root(s) share " + str(len(manifest.geometry_files)) + " geometry file(s)."))
+    return summary
+
+def quick_export_collections(options,
+                             collections,
+                             operator : Operator = None,
+                             *,
+                             resume_unfinished : bool = False) -> QuickExportSummary:
+    """Exports each collection of `collections` as a separate file.\n
+    Members are resolved from `Collection.all_objects`, so nested collections are included.\n
+    `options` is the quick export operator or `QuickExportOptions`."""
+    view_layer_objects : set[bpy.types.Object] = set(bpy.context.view_layer.objects)
+    lods : LODSettings | None = _get_lod_settings(mesh_hash.GeometryHashCache())
+    summary : QuickExportSummary = _quick_export_roots(collections,
+                                                       lambda collection : _process_export_collection(options, collection, view_layer_objects, lods),
+                                                       operator,
+                                                       resume_unfinished,
+                                                       "COLLECTION:",
+                                                       options = options)
+    _report_lod_cache(operator, lods)
+    return summary
+
+def quick_export_bake_pairs(options,
+                            pairs,
+                            operator : Operator = None,
+                            *,
+                            resume_unfinished : bool = False) -> QuickExportSummary:
+    """Exports each `BakePair` of `pairs` as a high and a low file.\n
+    `options` is the quick export operator or `QuickExportOptions`."""
+    children_map : dict[bpy.types.Object, list[bpy.types.Object]] = common.get_children_map()
+    return _quick_export_roots(pairs,
+                               lambda pair : _process_bake_pair(options, pair, children_map),
+                               operator,
+                               resume_unfinished,
+                               "BAKE_PAIR:",
+                               options = options)
+
+def _restore_selection(selected_objects, active_object : bpy.types.Object) -> None:
+    """Restores a selection, only touching objects whose selection changed during the export."""
+    with common.SelectionTransaction() as selection:
+        selection.deselect_all()
+        selection.select(selected_objects)
+        selection.set_active(active_object)
+
+def _watch_export(export_objects : list[bpy.types.Object]) -> None:
+    """Re-exports objects changed while the quick export watch is running."""
+    if not quick_export.has_quick_export_path():
+        print(common.warning(None, quick_export.export_path_warning_msg))
+        return
+    selected_objects : list[bpy.types.Object] = bpy.context.selected_objects
+    active_object : bpy.types.Object = bpy.context.active_object
+    try:
+        quick_export_objects(QuickExportOptions(), export_objects)
+    finally:
+        _restore_selection(selected_objects, active_object)
+
 class ABBU_OT_QuickExportFBX(Operator, CatFileFBX):
-    """Exports one or more selected objects as FBX files, with an option to include child objects recursively"""
+    """Exports one or more selected objects as FBX files (or glTF binary files with the custom exporter), with an option to include child objects recursively"""
     bl_idname = "export_scene.quick_export_selected_fbx"
     bl_label = "Quick Export As FBX"
     bl_options = {'REGISTER', 'UNDO'}
@@ -102,30 +508,282 @@ class ABBU_OT_QuickExportFBX(Operator, CatFileFBX):
     recursive_export : BoolProperty(
         name = "Recursive Export",
         default = True)
+
+    resume_unfinished : BoolProperty(
+        name = "Resume Unfinished Export",
+        description = "Skips objects that were already exported by a previous run of the same export that failed or was interrupted",
+        default = False)
+
+    deduplicate_geometry : BoolProperty(
+        name = "Deduplicate Geometry",
+        description = "Exports objects with identical geometry once and writes a manifest that maps every object to its geometry file and transform",
+        default = False)
+
+    merge_hierarchy : BoolProperty(
+        name = "Merge Hierarchy",
+        description = "Merges each exported object and its children into one mesh before exporting",
+        default = False)
     
     def execute(self, context):
-        if persistent.get_preferences().fbx_exporter_type == 'NATIVE':
-            if not quick_export.has_quick_export_path():
-                common.warning(self, quick_export.export_path_warning_msg)
-                return {'CANCELLED'}
-
-            export_objects : tuple[bpy.types.Object] = bpy.context.selected_objects  # Selected objects
-
-            # Stores the active object in the scene if `restore_selection` is `True`.
-            if self.restore_selection:
-                active_object_scene : bpy.types.Object = bpy.context.active_object
-            
-            for o in export_objects:
-                _process_export_object(self, o)
-
-            if self.restore_selection:
-                common.deselect_all()
-                common.select_objects(export_objects)
-                bpy.context.view_layer.objects.active = active_object_scene
-                    
-            return {'FINISHED'}
+        if not quick_export.has_quick_export_path():
+            common.warning(self, quick_export.export_path_warning_msg)
+            return {'CANCELLED'}
+
+        export_objects : tuple[bpy.types.Object] = bpy.context.selected_objects  # Selected objects
+
+        # Stores the active object in the scene if `restore_selection` is `True`.
+        if self.restore_selection:
+            active_object_scene : bpy.types.Object = bpy.context.active_object
+
+        quick_export_objects(self, export_objects, self, resume_unfinished = self.resume_unfinished)
+
+        if self.restore_selection:
+            _restore_selection(export_objects, active_object_scene)
+
+        return {'FINISHED'}
+
+def _get_export_collections(context, mode : str) -> list[bpy.types.Collection]:
+    if mode == 'ACTIVE':
+        return [context.view_layer.active_layer_collection.collection]
+    elif mode == 'CHILDREN':
+        return list(context.view_layer.active_layer_collection.collection.children)
+    collections : dict[str, bpy.types.Collection] = {}
+    for o in context.selected_objects:
+        for collection in o.users_collection:
+            if collection != context.scene.collection:
+                collections[collection.name] = collection
+    return list(collections.values())
+
+class ABBU_OT_QuickExportCollectionsFBX(Operator, CatFileFBX):
+    """Exports collections as single FBX files (or glTF binary files with the custom exporter), including objects of nested collections"""
+    bl_idname = "export_scene.abbu_quick_export_collections_fbx"
+    bl_label = "Quick Export Collections As FBX"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    category_poll = PollType.NONE
+
+    mode : EnumProperty(
+        name = "Collections",
+        items = (('ACTIVE', "Active Collection", "Exports the active collection"),
+                 ('CHILDREN', "Child Collections", "Exports each child collection of the active collection"),
+                 ('SELECTED_OBJECTS', "Collections of Selected Objects", "Exports each collection that contains a selected object")),
+        default = 'CHILDREN'
+    )
+
+    restore_selection : BoolProperty(
+        name = "Restore Selection",
+        description = constants.restore_selection_description,
+        default = True
+    )
+
+    export_wire_objects : BoolProperty(
+        name = "Export Wired",
+        description = constants.export_wired_description,
+        default = False
+    )
+
+    resume_unfinished : BoolProperty(
+        name = "Resume Unfinished Export",
+        description = "Skips collections that were already exported by a previous run of the same export that failed or was interrupted",
+        default = False)
+
+    def execute(self, context):
+        if not quick_export.has_quick_export_path():
+            common.warning(self, quick_export.export_path_warning_msg)
+            return {'CANCELLED'}
+
+        collections : list[bpy.types.Collection] = _get_export_collections(context, self.mode)
+        if not collections or collections == [context.scene.collection]:
+            common.warning(self, "No collections to export.")
+            return {'CANCELLED'}
+
+        selected_objects : list[bpy.types.Object] = context.selected_objects
+        active_object : bpy.types.Object = context.active_object
+
+        quick_export_collections(self, collections, self, resume_unfinished = self.resume_unfinished)
+
+        if self.restore_selection:
+            _restore_selection(selected_objects, active_object)
+
+        return {'FINISHED'}
+
+class ABBU_OT_QuickExportBakePairsFBX(Operator, CatFileFBX):
+    """Pairs objects by their _high and _low name suffixes and exports every pair as separate _high and _low FBX files (or glTF binary files with the custom exporter)"""
+    bl_idname = "export_scene.abbu_quick_export_bake_pairs_fbx"
+    bl_label = "Quick Export Bake Pairs As FBX"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    category_poll = PollType.NONE
+
+    scope : EnumProperty(
+        name = "Objects",
+        items = (('SELECTED', "Selected", "Pairs the selected objects"),
+                 ('SCENE', "Scene", "Pairs all objects of the scene")),
+        default = 'SELECTED'
+    )
+
+    restore_selection : BoolProperty(
+        name = "Restore Selection",
+        description = constants.restore_selection_description,
+        default = True
+    )
+
+    export_wire_objects : BoolProperty(
+        name = "Export Wired",
+        description = constants.export_wired_description,
+        default = False
+    )
+    
+    recursive_export : BoolProperty(
+        name = "Recursive Export",
+        default = True)
+
+    resume_unfinished : BoolProperty(
+        name = "Resume Unfinished Export",
+        description = "Skips pairs that were already exported by a previous run of the same export that failed or was interrupted",
+        default = False)
+
+    merge_hierarchy : BoolProperty(
+        name = "Merge Hierarchy",
+        description = "Merges each exported object and its children into one mesh before exporting",
+        default = False)
+
+    def execute(self, context):
+        if not quick_export.has_quick_export_path():
+            common.warning(self, quick_export.export_path_warning_msg)
+            return {'CANCELLED'}
+
+        objects = context.selected_objects if self.scope == 'SELECTED' else context.view_layer.objects
+        index : bake_pairs.BakePairIndex = bake_pairs.build_bake_pair_index(objects)
+        if index.unpaired:
+            print(common.warning(self, "Unpaired bake objects: " + ", ".join(o.name for o in index.unpaired)))
+        if index.ambiguous:
+            print(common.warning(self, "Bake pairs with more than one high or low object: " + ", ".join(sorted(index.ambiguous.keys()))))
+        if not index.pairs:
+            common.warning(self, "No bake pairs found.")
+            return {'CANCELLED'}
+
+        selected_objects : list[bpy.types.Object] = context.selected_objects
+        active_object : bpy.types.Object = context.active_object
+
+        quick_export_bake_pairs(self, index.pairs, self, resume_unfinished = self.resume_unfinished)
+
+        if self.restore_selection:
+            _restore_selection(selected_objects, active_object)
+
+        return {'FINISHED'}
+
+class ABBU_OT_QuickExportScenesFBX(Operator, CatFileFBX):
+    """Exports the tagged quick export roots of every scene that has a quick export path as FBX files (or glTF binary files with the custom exporter)"""
+    bl_idname = "export_scene.abbu_quick_export_scenes_fbx"
+    bl_label = "Quick Export All Scenes As FBX"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    category_poll = PollType.NONE
+
+    export_wire_objects : BoolProperty(
+        name = "Export Wired",
+        description = constants.export_wired_description,
+        default = False
+    )
+    
+    recursive_export : BoolProperty(
+        name = "Recursive Export",
+        default = True)
+
+    resume_unfinished : BoolProperty(
+        name = "Resume Unfinished Export",
+        description = "Skips objects that were already exported by a previous run of the same export that failed or was interrupted",
+        default = False)
+
+    merge_hierarchy : BoolProperty(
+        name = "Merge Hierarchy",
+        description = "Merges each exported object and its children into one mesh before exporting",
+        default = False)
+
+    def execute(self, context):
+        scenes : list[bpy.types.Scene] = [x for x in bpy.data.scenes if quick_export.has_quick_export_path(x)]
+        if not scenes:
+            common.warning(self, "No scene has a quick export path.")
+            return {'CANCELLED'}
+
+        options : QuickExportOptions = QuickExportOptions(export_wire_objects = self.export_wire_objects,
+                                                          recursive_export = self.recursive_export,
+                                                          merge_hierarchy = self.merge_hierarchy)
+        exported_count : int = 0
+        failed_count : int = 0
+        for scene in scenes:
+            view_layer : bpy.types.ViewLayer = context.view_layer if scene == context.scene else scene.view_layers[0]
+            roots : list[bpy.types.Object] = quick_export.get_export_roots(scene, view_layer)
+            if not roots:
+                continue
+            # The context is switched once per scene, every root of the scene is exported under it
+            with context.temp_override(scene = scene, view_layer = view_layer):
+                selected_objects : list[bpy.types.Object] = context.selected_objects
+                active_object : bpy.types.Object = view_layer.objects.active
+                print(common.info(None, "Exporting " + str(len(roots)) + " root(s) of scene " + scene.name))
+                summary : QuickExportSummary = quick_export_objects(options, roots, self, resume_unfinished = self.resume_unfinished)
+                _restore_selection(selected_objects, active_object)
+            exported_count += summary.exported_count
+            failed_count += len(summary.failures)
+
+        msg : str = "Exported " + str(exported_count) + " root(s) from " + str(len(scenes)) + " scene(s)."
+        if failed_count > 0:
+            common.warning(self, msg + " " + str(failed_count) + " root(s) failed.")
         else:
-            bpy.ops.export_scene.ab_export_custom()
+            common.info(self, msg)
+        return {'FINISHED'}
+
+class ABBU_OT_TagQuickExportRoots(Operator, CatFileFBX):
+    """Tags or untags the selected objects as quick export roots, which are exported by Quick Export All Scenes"""
+    bl_idname = "object.abbu_tag_quick_export_roots"
+    bl_label = "Tag Quick Export Roots"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    arg : EnumProperty(
+        name = "Action",
+        items = constants.e_add_remove
+    )
+
+    def execute(self, context):
+        for o in context.selected_objects:
+            if self.arg == 'ADD':
+                o[quick_export.export_root_attribute] = True
+            elif quick_export.export_root_attribute in o:
+                del o[quick_export.export_root_attribute]
+        return {'FINISHED'}
+
+class ABBU_OT_ToggleQuickExportWatch(Operator, CatFileFBX):
+    """Starts or stops watching the selected objects, their children and modifier objects.\nWatched objects are quick exported again shortly after they change"""
+    bl_idname = "export_scene.abbu_toggle_quick_export_watch"
+    bl_label = "Toggle Quick Export Watch"
+    bl_options = {'REGISTER'}
+
+    category_poll = PollType.CUSTOM
+
+    @classmethod
+    def poll(cl, context):
+        return export_watch.is_running() or len(context.selected_objects) > 0
+
+    def execute(self, context):
+        if export_watch.is_running():
+            export_watch.stop()
+            common.info(self, "Quick export watch stopped.")
             return {'FINISHED'}
-    
-OPERATORS : tuple[Operator] = (ABBU_OT_QuickExportFBX,)
+
+        if not quick_export.has_quick_export_path():
+            common.warning(self, quick_export.export_path_warning_msg)
+            return {'CANCELLED'}
+
+        export_watch.start(bpy.context.selected_objects,
+                           _watch_export,
+                           persistent.get_preferences().quick_export_watch_delay)
+        common.info(self, "Watching " + str(len(bpy.context.selected_objects)) + " object(s) for quick export.")
+        return {'FINISHED'}
+
+OPERATORS : tuple[Operator] = (ABBU_OT_QuickExportFBX,
+                               ABBU_OT_QuickExportCollectionsFBX,
+                               ABBU_OT_QuickExportBakePairsFBX,
+                               ABBU_OT_QuickExportScenesFBX,
+                               ABBU_OT_TagQuickExportRoots,
+                               ABBU_OT_ToggleQuickExportWatch)
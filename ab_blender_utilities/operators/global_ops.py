@@ -18,7 +18,7 @@ import bpy
 from bpy.props import EnumProperty
 from bpy.types import Operator
 
-from ..lib import quick_export
+from ..lib import common, lod_cache, quick_export
 from ..addon import keymaps, persistent
 from ..addon.constants import e_add_remove
 
@@ -35,6 +35,16 @@ class ABBU_OT_DeleteQuickExportPaths(Operator):
                 del scene[quick_export.export_path_attribute]
         return {'FINISHED'}
     
+class ABBU_OT_ClearLODCache(Operator):
+    """Removes the cached quick export LOD meshes from the current Blend file"""
+    bl_idname = "wm.abbu_clear_lod_cache"
+    bl_label = "Clear LOD Cache"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        common.info(self, "Removed " + str(lod_cache.clear_lod_cache()) + " cached LOD mesh(es).")
+        return {'FINISHED'}
+
 class ABBU_OT_RestoreDefaultKeymaps(Operator):
     """Restores the default keymap"""
     bl_idname = "wm.abbu_restore_default_keymaps"
@@ -70,5 +80,6 @@ class ABBU_OT_AddRemoveQuickExportNames(Operator):
             return {'FINISHED'}
     
 OPERATORS : tuple[Operator] = (ABBU_OT_AddRemoveQuickExportNames,
+                               ABBU_OT_ClearLODCache,
                                ABBU_OT_DeleteQuickExportPaths,
                                ABBU_OT_RestoreDefaultKeymaps)
@@ -34,38 +34,41 @@ class ABBU_OT_CacheModifiers(Operator, CatMod):
                                                                           key = lambda x: x.name,
                                                                           reverse=False))
 
-        for src_obj in selected_objects_ordered:
+        with common.SelectionTransaction() as selection:
+            for src_obj in selected_objects_ordered:
 
-            deps_graph = bpy.context.evaluated_depsgraph_get()
-            obj_data_new = bpy.data.meshes.new_from_object(src_obj.evaluated_get(deps_graph), depsgraph = deps_graph)
+                deps_graph = bpy.context.evaluated_depsgraph_get()
+                obj_data_new = bpy.data.meshes.new_from_object(src_obj.evaluated_get(deps_graph), depsgraph = deps_graph)
             
 
-            copied_obj : bpy.types.Object = bpy.data.objects.new(src_obj.name, obj_data_new)
-            copied_obj.matrix_world = src_obj.matrix_world
+                copied_obj : bpy.types.Object = bpy.data.objects.new(src_obj.name, obj_data_new)
+                copied_obj.matrix_world = src_obj.matrix_world
 
-            copied_obj.name = src_obj.name
-            copied_obj.data.name = src_obj.data.name
+                copied_obj.name = src_obj.name
+                copied_obj.data.name = src_obj.data.name
             
-            # Rename source object
-            src_obj.name = copied_obj.name + "_cache"
-            src_obj.data.name = copied_obj.data.name + "_cache"
+                # Rename source object
+                src_obj.name = copied_obj.name + "_cache"
+                src_obj.data.name = copied_obj.data.name + "_cache"
 
-            # Disable modifiers on source object
-            for modifier in src_obj.modifiers:
-                modifier.show_viewport = False
+                # Disable modifiers on source object
+                for modifier in src_obj.modifiers:
+                    modifier.show_viewport = False
 
-            for child in src_obj.children:
-                parent_and_keep_transform(copied_obj, child)
+                for child in src_obj.children:
+                    parent_and_keep_transform(copied_obj, child)
             
-            bpy.context.collection.objects.link(copied_obj)
+                bpy.context.collection.objects.link(copied_obj)
 
-            copied_obj[cached_obj_prop_name] : bpy.types.Object = src_obj
-            src_obj.select_set(False)
-            copied_obj.select_set(True)
+                copied_obj[cached_obj_prop_name] : bpy.types.Object = src_obj
+                selection.deselect((src_obj,))
+                selection.select((copied_obj,))
 
-            if bpy.context.active_object == src_obj:
-                bpy.context.view_layer.objects.active = copied_obj
+                if selection.active == src_obj:
+                    selection.set_active(copied_obj)
 
+        # Hidden after the selection is applied, disabled objects are not part of `selected_objects`
+        for src_obj in selected_objects_ordered:
             src_obj.hide_viewport = True
             src_obj.hide_render = True
 
@@ -83,11 +86,11 @@ class ABBU_OT_SelectModifierObjects(Operator, CatMod):
     )
 
     def execute(self, context):
-        for o in bpy.context.selected_objects:
-            common.get_modifier_objects(o, select=True)
-
+        with common.SelectionTransaction() as selection:
             if self.deselect_current:
-                o.select_set(False)
+                selection.deselect(bpy.context.selected_objects)
+            for o in bpy.context.selected_objects:
+                selection.select(common.get_modifier_objects(o))
                         
         return {'FINISHED'}
 
@@ -139,27 +142,29 @@ class ABBU_OT_UncacheModifiers(Operator, CatMod):
                                                                           reverse=False))
 
         objects_to_delete : list[bpy.types.Object] = []
-        for o in selected_objects_ordered:
-            if cached_obj_prop_name in o:
-                cached_obj : bpy.types.Object = o[cached_obj_prop_name]
-                cached_obj.name = o.name
-                cached_obj.data.name = o.data.name
+        with common.SelectionTransaction() as selection:
+            for o in selected_objects_ordered:
+                if cached_obj_prop_name in o:
+                    cached_obj : bpy.types.Object = o[cached_obj_prop_name]
+                    cached_obj.name = o.name
+                    cached_obj.data.name = o.data.name
 
-                for modifier in cached_obj.modifiers:
-                    modifier.show_viewport = True
+                    for modifier in cached_obj.modifiers:
+                        modifier.show_viewport = True
 
-                cached_obj.hide_viewport = o.hide_viewport
-                cached_obj.hide_render = o.hide_render
+                    cached_obj.hide_viewport = o.hide_viewport
+                    cached_obj.hide_render = o.hide_render
 
-                cached_obj.select_set(True)
+                    selection.select((cached_obj,))
 
-                for child in o.children:
-                    parent_and_keep_transform(cached_obj, child)
+                    for child in o.children:
+                        parent_and_keep_transform(cached_obj, child)
 
-                if bpy.context.active_object == o:
-                    bpy.context.view_layer.objects.active = cached_obj
+                    if selection.active == o:
+                        selection.set_active(cached_obj)
 
-                objects_to_delete.append(o)
+                    selection.deselect((o,))  # Applied before the object is deleted
+                    objects_to_delete.append(o)
 
         if bpy.app.version >= (4, 0, 0):
             for o in objects_to_delete:
@@ -17,14 +17,24 @@
 import bpy
 from bpy.props import BoolProperty, IntProperty, StringProperty
 from bpy.types import Operator
+from bpy_extras.io_utils import ImportHelper
 
+from typing import Final, NamedTuple
 from .categories import CatNaming, PollType
 
-from ..addon import constants
-from ..lib.common import get_child_objects
-from ..lib.naming import object_name_custom_expr
+from ..addon import constants, persistent
+from ..lib import common, naming_lint, rename_mapping
+from ..lib.common import get_child_objects, get_children_map
+from ..lib.naming import NameTemplate, bulk_rename, get_collision_count, sync_data_names
 
 
+preview_row_count : Final[int] = 8
+
+class _RenamePreview(NamedTuple):
+    key : tuple
+    rows : tuple[tuple[str, str]]  # Old name, new name
+    collision_count : int
+
 class ABBU_OT_AppendBoolOpToBoolObjNames(Operator, CatNaming):
     """Appends the boolean operation to the name of boolean objects.\nSelect one or more objects that contain boolean modifiers"""
     bl_idname = "wm.abbu_append_bool_op_to_bool_obj_names"
@@ -113,31 +123,28 @@ class ABBU_OT_CustomExpressionObjRename(Operator, CatNaming):
         default = False
     )
 
-    def _rename_object(self, o : bpy.types.Object, index : int, num_splitter : str):
-        auto_index_str : str = str(index + 1).zfill(self.padding)
-        new_name, oidx_found = object_name_custom_expr(o, self.obj_name, str(index + 1))
-        o.name = new_name
+    def _get_new_name(self, o : bpy.types.Object, index : int, num_splitter : str, template : NameTemplate, use_auto_index : bool) -> str:
+        new_name : str = template.evaluate(o, str(index + 1))
 
         # Auto index
-        if len(bpy.context.selected_objects) > 1 and self.auto_index_on_multiple and not oidx_found:
-            o.name += num_splitter + auto_index_str
+        if use_auto_index:
+            new_name += num_splitter + str(index + 1).zfill(self.padding)
+        return new_name
 
-        # Object data
-        if o.data and self.rename_obj_data:
-            if o.data.users > 1 and not self.update_multi_user_mesh_data:
-                return
-            o.data.name = o.name
-
-    def execute(self, context):
+    def _get_assignments(self) -> list[tuple[bpy.types.Object, str]]:
+        """Returns the selected objects with their new names, before collisions are resolved."""
         selected_objects : list[bpy.types.Object] = bpy.context.selected_objects.copy()
         if self.sort_selected:
             selected_objects.sort(key = lambda o : o.name, reverse = self.reverse_sort_selected)
 
         num_splitter : str = self.num_splitter if self.should_split_num else ""
+        template : NameTemplate = NameTemplate(self.obj_name)  # Parsed once for all objects
+        use_auto_index : bool = len(selected_objects) > 1 and self.auto_index_on_multiple and not template.uses_oidx
 
+        assignments : list[tuple[bpy.types.Object, str]] = []
         if not self.count_index_by_type:
             for i, o in enumerate(selected_objects):
-                self._rename_object(o, i, num_splitter)
+                assignments.append((o, self._get_new_name(o, i, num_splitter, template, use_auto_index)))
         else:
             obj_by_type = dict()
             for o in selected_objects:
@@ -147,7 +154,35 @@ class ABBU_OT_CustomExpressionObjRename(Operator, CatNaming):
                     obj_by_type[o.type].append(o)
             for key, obj_list in obj_by_type.items():
                 for i, o in enumerate(obj_list):
-                    self._rename_object(o, i, num_splitter)
+                    assignments.append((o, self._get_new_name(o, i, num_splitter, template, use_auto_index)))
+        return assignments
+
+    def _get_preview(self) -> _RenamePreview:
+        """Returns the preview of the rename.\n
+        `draw` runs on every redraw, so the preview is only recomputed when the expression, the options or the selection change.
+        The preview is kept on the operator instance, so each dialog has its own."""
+        active_object : bpy.types.Object | None = bpy.context.active_object
+        key : tuple = (self.obj_name, self.num_splitter, self.should_split_num, self.padding, self.auto_index_on_multiple,
+                       self.sort_selected, self.reverse_sort_selected, self.count_index_by_type,
+                       active_object.name if active_object is not None else None,
+                       tuple((o.session_uid, o.name) for o in bpy.context.selected_objects))
+        preview : _RenamePreview | None = getattr(self, "_rename_preview", None)
+        if preview is None or preview.key != key:
+            assignments : list[tuple[bpy.types.Object, str]] = self._get_assignments()
+            preview = _RenamePreview(key,
+                                     tuple((o.name, name) for o, name in assignments[:preview_row_count]),
+                                     get_collision_count(assignments))
+            self._rename_preview = preview
+        return preview
+
+    def execute(self, context):
+        # All names are computed before any object is renamed
+        assignments : list[tuple[bpy.types.Object, str]] = self._get_assignments()
+        bulk_rename(assignments)
+
+        # Object data
+        if self.rename_obj_data:
+            sync_data_names([o for o, _ in assignments], self.update_multi_user_mesh_data)
 
         return {'FINISHED'}
     
@@ -190,6 +225,18 @@ class ABBU_OT_CustomExpressionObjRename(Operator, CatNaming):
         box.label(text = "Active Object: " + active_object.name)
         box.enabled = False
 
+        preview : _RenamePreview = self._get_preview()
+        preview_box = layout.box()
+        preview_box.label(text = "Preview")
+        for old_name, new_name in preview.rows:
+            row = preview_box.row()
+            row.label(text = old_name)
+            row.label(text = new_name, icon = 'FORWARD')
+        if object_count > len(preview.rows):
+            preview_box.label(text = "... " + str(object_count - len(preview.rows)) + " more")
+        if preview.collision_count > 0:
+            preview_box.label(text = str(preview.collision_count) + " name collision(s), a numbered suffix will be added.", icon = 'ERROR')
+
 class ABBU_OT_ObjectNamesFromParent(Operator, CatNaming):
     """Renames child objects to match the naming of the parent object"""
     bl_idname = "wm.abbu_object_names_from_parent"
@@ -227,7 +274,9 @@ class ABBU_OT_ObjectNamesFromParent(Operator, CatNaming):
         name = "Number Splitter",
         default = ".")
 
-    def execute(self, context):        
+    def execute(self, context):
+        assignments : list[tuple[bpy.types.Object, str]] = []
+        children_map : dict[bpy.types.Object, list[bpy.types.Object]] = get_children_map()
         for o in bpy.context.selected_objects:
             obj_name_split : list = o.name.split("/")
             obj_name : str = obj_name_split[len(obj_name_split)-1]
@@ -240,11 +289,13 @@ class ABBU_OT_ObjectNamesFromParent(Operator, CatNaming):
                         obj_name = obj_name.replace(alias, "")
                         break
             
-            children : list[bpy.types.Object] = get_child_objects(o, self.rename_wireframe, self.is_recursive)
+            children : list[bpy.types.Object] = get_child_objects(o, self.rename_wireframe, self.is_recursive, children_map)
             for i, ch_obj in enumerate(children):
-                ch_obj.name = obj_name + self.number_splitter + str(i+1).zfill(self.number_padding) + obj_alias
-                if ch_obj.data and self.rename_mesh_data:
-                    ch_obj.data.name = ch_obj.name
+                assignments.append((ch_obj, obj_name + self.number_splitter + str(i+1).zfill(self.number_padding) + obj_alias))
+        bulk_rename(assignments)
+
+        if self.rename_mesh_data:
+            sync_data_names([ch_obj for ch_obj, _ in assignments], include_shared = True)
 
         return {'FINISHED'}
 
@@ -256,21 +307,175 @@ class ABBU_OT_UpdateDataName(Operator, CatNaming):
     
     update_multi_user_data : BoolProperty(
         name = "Update multi-user data names",
+        description = "Names shared data after the first of its objects in alphabetical order",
+        default = False
+    )
+
+    update_material_names : BoolProperty(
+        name = "Update material names",
+        description = "Names materials after their object, with a slot number for objects with several materials",
         default = False
     )
     
     category_poll = PollType.OBJ_SEL
 
     def execute(self, context):
-        for o in bpy.context.selected_objects:
-            if o.type == 'MESH':
-                if o.data.users > 1 and not self.update_multi_user_data:
-                    continue
-                o.data.name = o.name
+        resolved : list[tuple[bpy.types.ID, str]] = sync_data_names(bpy.context.selected_objects,
+                                                                    self.update_multi_user_data,
+                                                                    self.update_material_names)
+        common.info(self, "Renamed " + str(len(resolved)) + " data block(s).")
                         
         return {'FINISHED'}
 
+class ABBU_OT_RenameFromMappingFile(Operator, ImportHelper, CatNaming):
+    """Renames objects from a CSV or JSON file of old and new names.\nAn undo mapping file is written next to the loaded file"""
+    bl_idname = "wm.abbu_rename_from_mapping_file"
+    bl_label = "Rename From Mapping File"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filename_ext = ".csv"
+    filter_glob: StringProperty(default="*.csv;*.json", options={'HIDDEN'}, maxlen=255)
+
+    selected_only : BoolProperty(
+        name = "Selected Only",
+        description = "Only renames selected objects. If unchecked, all objects in the file are renamed",
+        default = False
+    )
+
+    rename_obj_data : BoolProperty(
+        name = "Rename object data",
+        default = True
+    )
+
+    update_multi_user_data : BoolProperty(
+        name = "Update multi-user data names",
+        default = False
+    )
+
+    write_undo_file : BoolProperty(
+        name = "Write undo mapping",
+        description = "Writes a mapping from the new names back to the old names next to the loaded file",
+        default = True
+    )
+
+    def execute(self, context):
+        try:
+            mapping : dict[str, str] = rename_mapping.load_mapping(self.filepath)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            common.error(self, "Unable to read the mapping file: " + str(e))
+            return {'CANCELLED'}
+
+        objects = bpy.context.selected_objects if self.selected_only else bpy.data.objects
+        assignments : list[tuple[bpy.types.Object, str]] = [(o, mapping[o.name]) for o in objects if o.name in mapping]
+        old_names : dict[bpy.types.Object, str] = {o : o.name for o, _ in assignments}
+        unmatched : list[str] = sorted(mapping.keys() - old_names.values())
+
+        resolved : list[tuple[bpy.types.Object, str]] = bulk_rename(assignments)
+
+        # Object data
+        if self.rename_obj_data:
+            sync_data_names([o for o, _ in assignments], self.update_multi_user_data)
+
+        if self.write_undo_file and len(resolved) > 0:
+            undo_file_path : str = rename_mapping.get_undo_file_path(self.filepath)
+            try:
+                rename_mapping.save_mapping(undo_file_path, {name : old_names[o] for o, name in resolved})
+            except OSError as e:
+                common.warning(self, "Unable to write the undo mapping file: " + str(e))
+            else:
+                print(common.info(None, "Undo mapping written to " + undo_file_path))
+
+        renamed_msg : str = "Renamed " + str(len(resolved)) + " object(s)."
+        if len(unmatched) > 0:
+            print(common.warning(None, "Unmatched names: " + ", ".join(unmatched)))
+            common.warning(self, renamed_msg + " " + str(len(unmatched)) + " name(s) did not match an object, see the console.")
+        else:
+            common.info(self, renamed_msg)
+
+        return {'FINISHED'}
+
+def get_naming_lint_settings() -> naming_lint.LintSettings:
+    """Returns the naming lint settings from the addon preferences.\n
+    Raises `ValueError` if the type prefixes cannot be parsed."""
+    prefs = persistent.get_preferences()
+    return naming_lint.LintSettings(naming_lint.parse_type_prefixes(prefs.naming_lint_type_prefixes),
+                                    prefs.naming_lint_bake_suffixes,
+                                    prefs.naming_lint_path_names,
+                                    prefs.naming_lint_data_names)
+
+class ABBU_OT_ToggleNamingLint(Operator):
+    """Starts or stops the naming lint.\nAll objects are checked once, after that only changed objects are checked again"""
+    bl_idname = "wm.abbu_toggle_naming_lint"
+    bl_label = "Toggle Naming Lint"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        if naming_lint.is_running():
+            naming_lint.stop()
+            common.info(self, "Naming lint stopped.")
+            return {'FINISHED'}
+
+        try:
+            settings : naming_lint.LintSettings = get_naming_lint_settings()
+        except ValueError as e:
+            common.error(self, str(e))
+            return {'CANCELLED'}
+        naming_lint.start(settings)
+        common.info(self, str(naming_lint.get_violation_count()) + " object(s) break a naming rule.")
+        return {'FINISHED'}
+
+class ABBU_OT_SelectNamingLintOffenders(Operator):
+    """Selects the objects that break a naming rule"""
+    bl_idname = "object.abbu_select_naming_lint_offenders"
+    bl_label = "Select Offenders"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cl, context):
+        return naming_lint.is_running() and context.view_layer is not None
+
+    def execute(self, context):
+        view_layer_objects : set[bpy.types.Object] = set(context.view_layer.objects)
+        offenders : list[bpy.types.Object] = [o for o in naming_lint.get_offenders() if o in view_layer_objects]
+        with common.SelectionTransaction() as selection:
+            selection.deselect_all()
+            selection.select(offenders)
+            if len(offenders) > 0:
+                selection.set_active(offenders[0])
+        common.info(self, "Selected " + str(len(offenders)) + " object(s).")
+        return {'FINISHED'}
+
+class ABBU_OT_FixNamingLint(Operator):
+    """Renames the objects that break a naming rule, and their data, to follow the rules"""
+    bl_idname = "object.abbu_fix_naming_lint"
+    bl_label = "Auto-Fix Names"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    selected_only : BoolProperty(
+        name = "Selected Only",
+        default = False
+    )
+
+    @classmethod
+    def poll(cl, context):
+        return naming_lint.is_running()
+
+    def execute(self, context):
+        offenders : list[bpy.types.Object] = naming_lint.get_offenders()
+        if self.selected_only:
+            selected_objects : set[bpy.types.Object] = set(context.selected_objects)
+            offenders = [o for o in offenders if o in selected_objects]
+        resolved : list[tuple[bpy.types.ID, str]] = bulk_rename(naming_lint.get_fixes(offenders))
+        naming_lint.validate_objects(offenders)
+        common.info(self, "Renamed " + str(len(resolved)) + " block(s). "
+                    + str(naming_lint.get_violation_count()) + " object(s) still break a naming rule.")
+        return {'FINISHED'}
+
 OPERATORS : tuple[Operator] = (ABBU_OT_AppendBoolOpToBoolObjNames,
                                ABBU_OT_CustomExpressionObjRename,
                                ABBU_OT_ObjectNamesFromParent,
-                               ABBU_OT_UpdateDataName)
+                               ABBU_OT_RenameFromMappingFile,
+                               ABBU_OT_UpdateDataName,
+                               ABBU_OT_ToggleNamingLint,
+                               ABBU_OT_SelectNamingLintOffenders,
+                               ABBU_OT_FixNamingLint)
@@ -0,0 +1,139 @@
+# Artemy Belzer's Blender Utilities - Additional Blender utilities.
+# Copyright (C) 2023-2024 Artemy Belzer
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import bpy
+from bpy.props import BoolProperty
+from bpy.types import Operator
+
+from .categories import CatObject
+from ..lib import common, mesh_merge, transform_apply
+
+
+def flatten_hierarchy(root : bpy.types.Object,
+                      objects : list[bpy.types.Object],
+                      apply_modifiers : bool = True) -> bpy.types.Object:
+    """Creates a mesh object from `objects` with the transform, parent and collections of `root`."""
+    mesh : bpy.types.Mesh = mesh_merge.build_merged_mesh(common.get_name_from_path(root), root, objects, apply_modifiers)
+    merged_object : bpy.types.Object = bpy.data.objects.new(root.name, mesh)
+    for collection in root.users_collection:
+        collection.objects.link(merged_object)
+    merged_object.parent = root.parent
+    merged_object.matrix_parent_inverse = root.matrix_parent_inverse.copy()
+    merged_object.matrix_basis = root.matrix_basis.copy()
+    return merged_object
+
+def reparent_excluded_children(merged_object : bpy.types.Object,
+                               root : bpy.types.Object,
+                               objects : list[bpy.types.Object],
+                               children_map : dict[bpy.types.Object, list[bpy.types.Object]]) -> None:
+    """Parents the children of `objects` that were not merged to `merged_object`, keeping their world transforms.\n
+    `merged_object` has the world transform of `root`, which is used as its matrix is not evaluated yet."""
+    merged : set[bpy.types.Object] = set(objects)
+    root_inverse = root.matrix_world.inverted_safe()
+    for o in objects:
+        for ch_obj in children_map.get(o, ()):
+            if ch_obj in merged:
+                continue
+            ch_obj.matrix_parent_inverse = root_inverse @ ch_obj.matrix_world @ ch_obj.matrix_basis.inverted_safe()
+            ch_obj.parent = merged_object
+            ch_obj.parent_type = 'OBJECT'
+
+class ABBU_OT_FlattenHierarchy(Operator, CatObject):
+    """Merges each selected object and its children into one new mesh object without joining them"""
+    bl_idname = "object.abbu_flatten_hierarchy"
+    bl_label = "Flatten Hierarchy"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    apply_modifiers : BoolProperty(
+        name = "Apply Modifiers",
+        default = True
+    )
+
+    include_wire_objects : BoolProperty(
+        name = "Include Wired",
+        description = "Includes child objects that have the 'Wired' display type",
+        default = False
+    )
+
+    replace_hierarchy : BoolProperty(
+        name = "Replace Hierarchy",
+        description = "Deletes the merged objects. If unchecked, the merged objects are hidden",
+        default = False
+    )
+
+    def execute(self, context):
+        merged_objects : list[bpy.types.Object] = []
+        children_map : dict[bpy.types.Object, list[bpy.types.Object]] = common.get_children_map()
+        for root in common.get_root_objects(context.selected_objects):
+            objects : list[bpy.types.Object] = [root] + common.get_child_objects(root, self.include_wire_objects, True, children_map)
+            root_name : str = root.name
+            merged_object : bpy.types.Object = flatten_hierarchy(root, objects, self.apply_modifiers)
+            if self.replace_hierarchy:
+                reparent_excluded_children(merged_object, root, objects, children_map)  # E.g. wired helpers
+                for o in objects:
+                    bpy.data.objects.remove(o)
+                merged_object.name = root_name
+            else:
+                for o in objects:
+                    o.hide_set(True)
+            merged_objects.append(merged_object)
+
+        with common.SelectionTransaction() as selection:
+            selection.deselect_all()
+            selection.select(merged_objects)
+            if merged_objects:
+                selection.set_active(merged_objects[0])
+        common.info(self, "Flattened " + str(len(merged_objects)) + " hierarchy(s).")
+        return {'FINISHED'}
+
+class ABBU_OT_ApplyTransforms(Operator, CatObject):
+    """Applies the transforms of the selected objects to their mesh data in bulk, keeping the world transforms of their children"""
+    bl_idname = "object.abbu_apply_transforms"
+    bl_label = "Apply Transforms"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    location : BoolProperty(
+        name = "Location",
+        default = False
+    )
+
+    rotation : BoolProperty(
+        name = "Rotation",
+        default = True
+    )
+
+    scale : BoolProperty(
+        name = "Scale",
+        default = True
+    )
+
+    def execute(self, context):
+        result : transform_apply.ApplyTransformResult = transform_apply.apply_transforms(context.selected_objects,
+                                                                                          self.location,
+                                                                                          self.rotation,
+                                                                                          self.scale)
+        if result.singular:
+            common.warning(self, "Skipped objects with a transform that can't be inverted, e.g. a zero scale that is not applied: "
+                           + ", ".join(o.name for o in result.singular))
+        if result.skipped:
+            common.warning(self, "Skipped objects that are not meshes or empties: " + ", ".join(o.name for o in result.skipped))
+        if not result.skipped and not result.singular:
+            common.info(self, "Applied transforms of " + str(result.applied_count) + " object(s), "
+                        + str(result.copied_mesh_count) + " shared mesh(es) were made single user.")
+        return {'FINISHED'}
+
+OPERATORS : tuple[Operator] = (ABBU_OT_ApplyTransforms,
+                               ABBU_OT_FlattenHierarchy)
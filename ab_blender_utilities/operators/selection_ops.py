@@ -15,14 +15,19 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import bpy
-from bpy.props import BoolProperty
-from bpy.types import Operator
+from bpy.props import BoolProperty, CollectionProperty, EnumProperty, IntProperty, PointerProperty, StringProperty
+from bpy.types import Operator, PropertyGroup
 
 from .categories import (PollType, CatSel, CatSelSaving)
-from ..lib import common
+from ..lib import common, selection_sets
 
 
-_saved_obj_sel = []
+class ABBU_PT_Selection_Set_Object(PropertyGroup):
+    object : PointerProperty(type = bpy.types.Object)
+
+class ABBU_PT_Selection_Set(PropertyGroup):
+    name : StringProperty()
+    objects : CollectionProperty(type = ABBU_PT_Selection_Set_Object)
 
 class ABBU_OT_SelectChildObjects(Operator, CatSel):
     """Selects all child objects from the current object selection.\nThis operator can select objects recursively"""
@@ -44,52 +49,113 @@ class ABBU_OT_SelectChildObjects(Operator, CatSel):
         common.select_child_objects(self.select_wireframe, self.recursive)  
         return {'FINISHED'}
 
-class ABBU_OT_DeleteSavedObjectSelection(Operator, CatSelSaving):
-    """Deletes saved object selections created by the \"Save Object Selection\" operator"""
+def _has_selection_sets(context) -> bool:
+    return context.scene is not None and len(selection_sets.get_sets(context.scene)) > 0
+
+class _SelectionSetDialog():
+    """Shows a dialog to pick a selection set, starting with the active set"""
+    def invoke(self, context, event):
+        sets = selection_sets.get_sets(context.scene)
+        if self.set_name not in sets:
+            index : int = getattr(context.scene, selection_sets.active_index_attribute)
+            self.set_name = sets[index].name if 0 <= index < len(sets) else sets[0].name
+        return context.window_manager.invoke_props_dialog(self)
+
+class ABBU_OT_DeleteSavedObjectSelection(_SelectionSetDialog, Operator, CatSelSaving):
+    """Deletes a selection set created by the \"Save Object Selection\" operator"""
     bl_idname = "wm.abbu_delete_saved_object_selection"
     bl_label = "Delete Saved Selection"
     bl_options = {'REGISTER', 'UNDO'}
 
     category_poll = PollType.CUSTOM
 
+    set_name : StringProperty(
+        name = "Selection Set"
+    )
+
     @classmethod
     def poll(cl, context):
-        return len(_saved_obj_sel) > 0
+        return _has_selection_sets(context)
 
     def execute(self, context):
-        _saved_obj_sel.clear()
+        if not selection_sets.remove_set(self.set_name, context.scene):
+            common.warning(self, "Selection set not found: " + self.set_name)
+            return {'CANCELLED'}
         return {'FINISHED'}
 
-class ABBU_OT_RestoreSavedObjectSelection(Operator, CatSelSaving):
-    """Restores the saved object selections"""
+    def draw(self, context):
+        self.layout.prop_search(self, "set_name", context.scene, selection_sets.sets_attribute)
+
+class ABBU_OT_RestoreSavedObjectSelection(_SelectionSetDialog, Operator, CatSelSaving):
+    """Restores a saved selection set.\nThe set can replace, extend, intersect or be subtracted from the current selection"""
     bl_idname = "wm.abbu_restore_saved_object_selection"
     bl_label = "Restore Object Selection"
     bl_options = {'REGISTER', 'UNDO'}
 
     category_poll = PollType.CUSTOM
 
+    set_name : StringProperty(
+        name = "Selection Set"
+    )
+
+    mode : EnumProperty(
+        name = "Mode",
+        items = selection_sets.e_selection_mode,
+        default = 'SET'
+    )
+
     @classmethod
     def poll(cl, context):
-        return len(_saved_obj_sel) > 0
+        return _has_selection_sets(context) and context.view_layer is not None
 
     def execute(self, context):
-        for o in _saved_obj_sel:
-            if o.name in bpy.data.objects:
-                o.select_set(True)
+        selection_set = selection_sets.find_set(self.set_name, context.scene)
+        if selection_set is None:
+            common.warning(self, "Selection set not found: " + self.set_name)
+            return {'CANCELLED'}
+
+        view_layer_objects : set[bpy.types.Object] = set(context.view_layer.objects)
+        with common.SelectionTransaction() as selection:
+            selection.selection = selection_sets.get_selection(selection.selection,
+                                                               selection_sets.get_set_objects(selection_set) & view_layer_objects,
+                                                               self.mode)
+            if selection.active not in selection.selection:
+                selection.set_active(min(selection.selection, key = lambda o : o.name, default = None))
+        common.info(self, str(len(selection.selection)) + " object(s) selected.")
         return {'FINISHED'}
 
+    def draw(self, context):
+        layout = self.layout
+        layout.prop_search(self, "set_name", context.scene, selection_sets.sets_attribute)
+        layout.prop(self, "mode", expand = True)
+
 class ABBU_OT_SaveObjectSelection(Operator, CatSelSaving):
-    """Saves the currently selected objects. These selections can be restored using the \"Restore Object Selection\" operator"""
+    """Saves the currently selected objects as a named selection set in the scene. These selections can be restored using the \"Restore Object Selection\" operator"""
     bl_idname = "wm.abbu_save_object_selection"
     bl_label = "Save Object Selection"
     bl_options = {'REGISTER', 'UNDO'}
 
+    set_name : StringProperty(
+        name = "Name",
+        default = "Selection",
+        description = "Name of the selection set. An existing set with this name is replaced"
+    )
+
     def execute(self, context):
-        global _saved_obj_sel
-        _saved_obj_sel = bpy.context.selected_objects
+        selection_sets.save_set(self.set_name, context.selected_objects, context.scene)
+        common.info(self, "Saved " + str(len(context.selected_objects)) + " object(s) as \"" + self.set_name + "\".")
         return {'FINISHED'}
 
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
 OPERATORS : tuple[Operator] = (ABBU_OT_SelectChildObjects,
                                ABBU_OT_DeleteSavedObjectSelection,
                                ABBU_OT_SaveObjectSelection,
                                ABBU_OT_RestoreSavedObjectSelection)
+
+PROPERTIES : tuple[PropertyGroup] = (ABBU_PT_Selection_Set_Object,
+                                     ABBU_PT_Selection_Set)
+
+SCENE_PROPERTIES : dict[str, CollectionProperty | IntProperty] = {selection_sets.sets_attribute : CollectionProperty(type = ABBU_PT_Selection_Set),
+                                                                  selection_sets.active_index_attribute : IntProperty()}
@@ -19,6 +19,7 @@ from bpy.props import BoolProperty, CollectionProperty, EnumProperty, StringProp
 from bpy.types import MeshUVLoopLayer, Operator, PropertyGroup
 
 from .categories import CatUV
+from ..lib.common import SelectionTransaction
 from ..lib.uv import get_uv_list_from_selected, get_uv_names_from_objects
 
 
@@ -139,14 +140,15 @@ class ABBU_OT_SetActiveUV(Operator, CatUV):
     )
 
     def execute(self, context):
-        for o in bpy.context.selected_objects:
-            if o.type == 'MESH':
-                if self.uv in o.data.uv_layers:
-                    uv : MeshUVLoopLayer = o.data.uv_layers[self.uv]
-                    o.data.uv_layers.active = uv
-                else:
-                    if self.deselect_invalid:
-                        o.select_set(False)
+        with SelectionTransaction() as selection:
+            for o in bpy.context.selected_objects:
+                if o.type == 'MESH':
+                    if self.uv in o.data.uv_layers:
+                        uv : MeshUVLoopLayer = o.data.uv_layers[self.uv]
+                        o.data.uv_layers.active = uv
+                    else:
+                        if self.deselect_invalid:
+                            selection.deselect((o,))
 
         return {'FINISHED'}
     